@@ -0,0 +1,76 @@
+"""
+Min-cost assignment (Hungarian algorithm) for robot dispatch.
+
+Shortest-augmenting-path form of the Hungarian method with dual potentials,
+O(rows^2 * cols), with the inner column loop vectorized in NumPy. Handles
+rectangular matrices, so 50 vehicles can be matched against 500 candidate
+bays in a few milliseconds.
+"""
+
+import numpy as np
+
+# Cost for pairs that must not be matched (kept finite so potentials stay finite)
+FORBIDDEN = 1e12
+
+
+def min_cost_assignment(cost):
+    """
+    Matches every row to a distinct column at minimum total cost.
+    Returns (row_indices, col_indices) like scipy.optimize.linear_sum_assignment.
+    If there are more rows than columns, only len(columns) rows get matched.
+    """
+    cost = np.asarray(cost, dtype=np.float64)
+    if cost.ndim != 2:
+        raise ValueError("cost must be a 2-D matrix")
+    n, m = cost.shape
+    if n == 0 or m == 0:
+        return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+    if n > m:
+        cols, rows = min_cost_assignment(cost.T)
+        order = np.argsort(rows)
+        return rows[order], cols[order]
+
+    # 1-based arrays with a dummy column 0, as in the textbook formulation
+    u = np.zeros(n + 1)
+    v = np.zeros(m + 1)
+    match = np.zeros(m + 1, dtype=np.intp)  # match[j] = row (1-based) holding column j, 0 = free
+    way = np.zeros(m + 1, dtype=np.intp)
+
+    for i in range(1, n + 1):
+        match[0] = i
+        j0 = 0
+        minv = np.full(m + 1, np.inf)
+        used = np.zeros(m + 1, dtype=bool)
+        while True:
+            used[j0] = True
+            i0 = match[j0]
+            free = ~used
+            free[0] = False
+            reduced = cost[i0 - 1] - u[i0] - v[1:]
+            better = free[1:] & (reduced < minv[1:])
+            minv[1:][better] = reduced[better]
+            way[1:][better] = j0
+
+            candidates = np.where(free[1:], minv[1:], np.inf)
+            j1 = int(np.argmin(candidates)) + 1
+            delta = candidates[j1 - 1]
+
+            used_cols = np.flatnonzero(used)
+            u[match[used_cols]] += delta
+            v[used_cols] -= delta
+            minv[free] -= delta
+
+            j0 = j1
+            if match[j0] == 0:
+                break
+
+        # Flip the augmenting path
+        while j0:
+            j1 = way[j0]
+            match[j0] = match[j1]
+            j0 = j1
+
+    cols = np.flatnonzero(match[1:])
+    rows = match[cols + 1] - 1
+    order = np.argsort(rows)
+    return rows[order], cols[order]
@@ -5,8 +5,9 @@ import bcrypt
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 import os
-from backend.database import get_db, User
+from backend.database import get_async_db, User
 
 # Configuration
 SECRET_KEY = os.getenv("SECRET_KEY", "SECRET123")
@@ -52,10 +53,8 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
-def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
-    """Dependency that extracts and validates JWT token"""
-    from backend.database import SessionLocal, User
-    
+def user_id_from_token(credentials: Optional[HTTPAuthorizationCredentials]) -> int:
+    """Validates the bearer JWT and returns the user ID it was issued for"""
     if credentials is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -72,18 +71,38 @@ def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(securit
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
         
         # Convert to int (token stores as string)
-        user_id = int(user_id_str)
+        return int(user_id_str)
         
     except jwt.ExpiredSignatureError:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token expired")
     except (JWTError, ValueError) as e:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=f"Invalid token: {e}")
+
+def _load_user(db: Session, user_id: int):
+    user = db.query(User).filter(User.user_id == user_id).first()
+    if user is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+    return user
+
+def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
+    """Dependency that extracts and validates JWT token"""
+    from backend.database import SessionLocal
+    
+    user_id = user_id_from_token(credentials)
     
     db = SessionLocal()
     try:
-        user = db.query(User).filter(User.user_id == user_id).first()
-        if user is None:
-            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
-        return user
+        return _load_user(db, user_id)
     finally:
         db.close()
+
+async def get_session_user(credentials: HTTPAuthorizationCredentials = Depends(security),
+                           db: AsyncSession = Depends(get_async_db)):
+    """
+    Async get_current_user: loads the user in the request's own async DB
+    session (the same one the route gets from Depends(get_async_db)).
+    """
+    user = await db.get(User, user_id_from_token(credentials))
+    if user is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+    return user
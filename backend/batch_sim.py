@@ -0,0 +1,291 @@
+"""
+Vectorized multi-lot simulation kernel.
+
+BatchSimulator advances thousands of independent lots one clock cycle at a
+time with NumPy: slot occupancy, robot FSM states and waiting queues live in
+[lots, ...] arrays instead of one ParkingLot object per scenario.
+
+Each tick follows ParkingLot._tick exactly (traffic generation, robot FSM,
+then priority-ordered assignment with the BOUND or WORK_STEALING dispatcher),
+and every lot draws from its own SplitMix64 stream. A ParkingLot built with
+rng=SplitMix64(seed) therefore goes through the same states tick for tick;
+scalar_lot() builds that twin for checking.
+
+Scope: traffic-generated arrivals only (NORMAL / VIP), one-tick robot moves
+(no travel_speed) and a bounded queue (queue_capacity).
+"""
+
+import time
+
+import numpy as np
+
+from backend.controller import ParkingLot, PriorityEncoder
+from backend.layout import SlotLayout
+from backend.rng import SplitMix64, splitmix64_draw, splitmix64_seed
+
+# Traffic modes and robot states as small-int codes
+MODES = ("MANUAL", "PEAK", "EVENT")
+MANUAL, PEAK, EVENT = range(3)
+ROBOT_STATES = ("IDLE", "MOVING_TO_SLOT", "PARKING", "RETURNING")
+IDLE, MOVING, PARKING, RETURNING = range(4)
+
+# Vehicle types the traffic generator produces
+VEHICLE_TYPES = ("NORMAL", "VIP")
+NORMAL, VIP = range(2)
+BASE_PRIORITY = np.array([PriorityEncoder.PRIORITIES[t] for t in VEHICLE_TYPES], dtype=np.float64)
+
+
+class BatchSimulator:
+    """
+    DDCO Concept: SIMD / Vector Processor
+    One instruction stream (the tick), many data lanes (the lots).
+    """
+    def __init__(self, n_lots, layout=None, num_robots=3, traffic_modes="PEAK", seeds=None,
+                 queue_capacity=32, dispatch_mode="BOUND"):
+        if dispatch_mode not in ("BOUND", "WORK_STEALING"):
+            raise ValueError(f"BatchSimulator does not support dispatch mode: {dispatch_mode}")
+        if queue_capacity is None or queue_capacity < 1:
+            raise ValueError("BatchSimulator needs a bounded queue (queue_capacity >= 1)")
+
+        L, R, Q = int(n_lots), int(num_robots), int(queue_capacity)
+        self.n_lots, self.num_robots, self.queue_capacity = L, R, Q
+        self.layout = layout if layout is not None else SlotLayout.generate(12)
+        self.dispatch_mode = dispatch_mode
+        self.stealing = dispatch_mode == "WORK_STEALING"
+
+        if isinstance(traffic_modes, str):
+            traffic_modes = [traffic_modes] * L
+        self.mode = np.array([MODES.index(m) for m in traffic_modes], dtype=np.int8)
+        self.seeds = list(range(L)) if seeds is None else [int(s) for s in seeds]
+        if len(self.mode) != L or len(self.seeds) != L:
+            raise ValueError("traffic_modes and seeds need one entry per lot")
+        self.rng_state = splitmix64_seed(self.seeds)
+
+        # Slots of each vehicle type's own kind, in ID order (first free = lowest ID)
+        slot_types = [s["type"] for s in self.layout.slots]
+        self.slot_ids = np.array([s["id"] for s in self.layout.slots], dtype=np.int64)
+        self._type_cols = [np.array([i for i, t in enumerate(slot_types) if t == vt], dtype=np.intp)
+                           for vt in VEHICLE_TYPES]
+        self._col_kind = np.full(len(slot_types), -1, dtype=np.intp)  # slot column -> vehicle type
+        for v_type, cols in enumerate(self._type_cols):
+            self._col_kind[cols] = v_type
+        # Overflow rules of ParkingLot._find_best_slot, per traffic mode
+        self._normal_to_vip = np.isin(self.mode, (PEAK, MANUAL))
+        self._vip_to_normal = np.isin(self.mode, (EVENT, MANUAL))
+
+        self.free = np.ones((L, len(slot_types)), dtype=bool)
+        # Free slots of each vehicle type's own kind, kept in step with self.free
+        self.free_count = np.tile(np.array([len(c) for c in self._type_cols], dtype=np.int64), (L, 1))
+
+        self.q_valid = np.zeros((L, Q), dtype=bool)
+        self.q_prio = np.zeros((L, Q), dtype=np.float64)
+        self.q_id = np.zeros((L, Q), dtype=np.int64)
+        self.q_type = np.zeros((L, Q), dtype=np.intp)
+        self.q_robot = np.zeros((L, Q), dtype=np.intp)  # BOUND robot: (id - 1) % robots
+        self.q_len = np.zeros(L, dtype=np.int64)
+        self.q_count = np.zeros((L, len(VEHICLE_TYPES)), dtype=np.int64)  # waiting vehicles per type
+
+        self.vehicle_counter = np.zeros(L, dtype=np.int64)
+        self.type_counts = np.zeros((L, len(VEHICLE_TYPES)), dtype=np.int64)
+        self.auto_gen = np.zeros(L, dtype=np.int64)
+        self.parked = np.zeros(L, dtype=np.int64)
+        self.rejected = np.zeros(L, dtype=np.int64)
+
+        self.robot_state = np.zeros((L, R), dtype=np.int8)
+        self.robot_vtype = np.full((L, R), -1, dtype=np.int8)
+        self.robot_slot = np.full((L, R), -1, dtype=np.intp)
+        self.robot_parked = np.zeros((L, R), dtype=np.int64)
+        self.robot_busy = np.zeros((L, R), dtype=np.int64)
+        self.ticks = 0
+
+    # --- One clock cycle ---
+
+    def step(self):
+        self._generate_traffic()
+        self._advance_robots()
+        self._assign_waiting()
+        self.robot_busy += self.robot_state != IDLE
+        self.ticks += 1
+
+    def _generate_traffic(self):
+        idx = np.flatnonzero(self.mode != MANUAL)
+        if not idx.size:
+            return
+        mode = self.mode[idx]
+        chance = splitmix64_draw(self.rng_state, idx)
+        spawn = np.where(mode == PEAK, chance < 0.2, chance < 0.15)
+
+        v_type = np.full(idx.size, NORMAL, dtype=np.intp)
+        event = np.flatnonzero(spawn & (mode == EVENT))
+        if event.size:
+            vip = splitmix64_draw(self.rng_state, idx[event]) < 0.7  # 70% VIP on event days
+            v_type[event[vip]] = VIP
+
+        lots = idx[spawn]
+        v_type = v_type[spawn]
+        if not lots.size:
+            return
+        self.auto_gen[lots] += 1
+        splitmix64_draw(self.rng_state, lots)  # Duration draw keeps the stream in step with ParkingLot
+
+        # Queue at capacity: arrival rejected (no ID, no type count)
+        full = self.q_len[lots] >= self.queue_capacity
+        self.rejected[lots[full]] += 1
+        lots, v_type = lots[~full], v_type[~full]
+        if not lots.size:
+            return
+
+        self.vehicle_counter[lots] += 1
+        self.type_counts[lots, v_type] += 1
+        pos = np.argmin(self.q_valid[lots], axis=1)  # first empty queue cell
+        self.q_valid[lots, pos] = True
+        self.q_id[lots, pos] = self.vehicle_counter[lots]
+        self.q_robot[lots, pos] = (self.vehicle_counter[lots] - 1) % self.num_robots
+        self.q_type[lots, pos] = v_type
+        self.q_prio[lots, pos] = BASE_PRIORITY[v_type] + self.type_counts[lots, v_type] * 0.01
+        self.q_len[lots] += 1
+        self.q_count[lots, v_type] += 1
+
+    def _advance_robots(self):
+        state = self.robot_state
+        moving = state == MOVING
+        parking = state == PARKING
+        returning = state == RETURNING
+        # Slots were locked at dispatch; parking only turns the lock into occupancy
+        self.parked += parking.sum(axis=1)
+        self.robot_parked += parking
+        state[moving] = PARKING
+        state[parking] = RETURNING
+        state[returning] = IDLE
+        self.robot_vtype[parking] = -1
+        self.robot_slot[parking] = -1
+
+    def _first_free(self, lots, v_type):
+        """Lowest free slot (column) of the type's own kind per lot, -1 if none"""
+        cols = self._type_cols[v_type]
+        if not cols.size:
+            return np.full(lots.size, -1, dtype=np.intp)
+        free = self.free[lots[:, None], cols]
+        first = np.argmax(free, axis=1)
+        return np.where(free[np.arange(lots.size), first], cols[first], -1)
+
+    def _assign_waiting(self):
+        """
+        Each round hands the highest-priority vehicle that can be served right
+        now to a robot. A vehicle passed over by ParkingLot's priority scan never
+        becomes servable later in the same tick (robots only get busier, slots
+        only fewer), so repeating this until nothing is servable reproduces the
+        scan exactly - in at most num_robots rounds.
+        """
+        for _ in range(self.num_robots):
+            # Cheap per-lot filter first: an idle robot and a waiting vehicle of a
+            # type that still has a slot (own kind or allowed overflow)
+            idle = self.robot_state == IDLE
+            has_normal, has_vip = (self.free_count > 0).T
+            can_normal = has_normal | (self._normal_to_vip & has_vip)
+            can_vip = has_vip | (self._vip_to_normal & has_normal)
+            active = idle.any(axis=1) & ((can_normal & (self.q_count[:, NORMAL] > 0)) |
+                                         (can_vip & (self.q_count[:, VIP] > 0)))
+            lots = np.flatnonzero(active)
+            if not lots.size:
+                return
+
+            own_normal = self._first_free(lots, NORMAL)
+            own_vip = self._first_free(lots, VIP)
+            slot_for = np.empty((lots.size, 2), dtype=np.intp)
+            slot_for[:, NORMAL] = np.where(own_normal >= 0, own_normal,
+                                           np.where(self._normal_to_vip[lots], own_vip, -1))
+            slot_for[:, VIP] = np.where(own_vip >= 0, own_vip,
+                                        np.where(self._vip_to_normal[lots], own_normal, -1))
+
+            rows = np.arange(lots.size)[:, None]
+            q_id = self.q_id[lots]
+            bound = self.q_robot[lots]
+            slot = slot_for[rows, self.q_type[lots]]
+            lot_idle = idle[lots]
+            eligible = self.q_valid[lots] & (slot >= 0)
+            if not self.stealing:
+                eligible &= lot_idle[rows, bound]
+
+            has = eligible.any(axis=1)
+            if not has.any():
+                return
+            lots, eligible = lots[has], eligible[has]
+            q_id, bound, slot, lot_idle = q_id[has], bound[has], slot[has], lot_idle[has]
+
+            # Highest priority (lowest value) first, ties by arrival ID
+            prio = np.where(eligible, self.q_prio[lots], np.inf)
+            best = prio.min(axis=1)
+            tied = eligible & (prio == best[:, None])
+            pick = np.argmin(np.where(tied, q_id, np.iinfo(np.int64).max), axis=1)
+
+            rows = np.arange(lots.size)
+            robot = bound[rows, pick]
+            if self.stealing:
+                busy = ~lot_idle[rows, robot]
+                robot[busy] = np.argmax(lot_idle[busy], axis=1)  # first idle robot
+            slot_col = slot[rows, pick]
+            v_type = self.q_type[lots, pick]
+
+            self.robot_state[lots, robot] = MOVING
+            self.robot_vtype[lots, robot] = v_type
+            self.robot_slot[lots, robot] = slot_col
+            self.free[lots, slot_col] = False
+            kind = self._col_kind[slot_col]
+            own = kind >= 0
+            self.free_count[lots[own], kind[own]] -= 1
+            self.q_valid[lots, pick] = False
+            self.q_len[lots] -= 1
+            self.q_count[lots, v_type] -= 1
+
+    # --- Running and results ---
+
+    def run(self, ticks):
+        """Advances every lot by the given number of ticks; returns aggregate results"""
+        ticks = int(ticks)
+        start_parked = self.parked.copy()
+        start_gen = self.auto_gen.copy()
+        start_rejected = self.rejected.copy()
+        start_busy = self.robot_busy.sum(axis=1)
+        queue_total = np.zeros(self.n_lots, dtype=np.int64)
+
+        started = time.perf_counter()
+        for _ in range(ticks):
+            self.step()
+            queue_total += self.q_len
+        elapsed = time.perf_counter() - started
+
+        busy = self.robot_busy.sum(axis=1) - start_busy
+        return {
+            "lots": self.n_lots,
+            "ticks": ticks,
+            "arrivals": self.auto_gen - start_gen,
+            "parked": self.parked - start_parked,
+            "rejected": self.rejected - start_rejected,
+            "mean_queue_length": queue_total / ticks if ticks else np.zeros(self.n_lots),
+            "final_queue_length": self.q_len.copy(),
+            "robot_utilisation": busy / (ticks * self.num_robots) if ticks else np.zeros(self.n_lots),
+            "elapsed_seconds": round(elapsed, 3),
+            "lot_ticks_per_second": round(self.n_lots * ticks / elapsed) if elapsed > 0 else None,
+        }
+
+    def lot_status(self, i):
+        """One lot's state in the shape of ParkingLot.simulation_step() (without logs)"""
+        robots = []
+        for r in range(self.num_robots):
+            v_type = int(self.robot_vtype[i, r])
+            robots.append({"id": r + 1, "state": ROBOT_STATES[self.robot_state[i, r]],
+                           "vehicle": VEHICLE_TYPES[v_type] if v_type >= 0 else None})
+        return {"robots": robots, "queue_len": int(self.q_len[i]), "total_gen": int(self.auto_gen[i])}
+
+    def occupied_slots(self, i):
+        """Slot IDs taken (parked or locked by a robot) in lot i"""
+        return self.slot_ids[~self.free[i]].tolist()
+
+    def scalar_lot(self, i):
+        """The ParkingLot twin of lot i: same layout, settings and random stream"""
+        lot = ParkingLot(layout=self.layout, num_robots=self.num_robots, rng=SplitMix64(self.seeds[i]))
+        lot.traffic_mode = MODES[self.mode[i]]
+        lot.queue_capacity = self.queue_capacity
+        lot.dispatch_mode = self.dispatch_mode
+        return lot
@@ -0,0 +1,114 @@
+"""
+Server-Sent Events fan-out of slot changes.
+
+ParkingLot calls SlotBroadcaster.publish (from whatever thread mutated it)
+with a snapshot of each slot it writes. The broadcaster hands the snapshot to
+its asyncio loop, coalesces everything published within one flush interval
+into a single "slots" event, encodes it once and puts the same frame on every
+subscriber's queue. One loop therefore serves thousands of open dashboards
+instead of each of them polling /api/status.
+"""
+
+import asyncio
+
+from backend.snapshot import dumps
+
+
+def sse_frame(event, data):
+    """One SSE message: 'event: <name>' plus a JSON data line"""
+    return f"event: {event}\ndata: {dumps(data).decode()}\n\n"
+
+
+class _Subscriber:
+    __slots__ = ("queue",)
+
+    def __init__(self, maxsize):
+        self.queue = asyncio.Queue(maxsize=maxsize)
+
+
+class SlotBroadcaster:
+    """
+    DDCO Concept: Bus Broadcast (Snooping)
+    Every write to the slot register file is put on a shared bus; each
+    subscriber snoops the bus instead of re-reading memory on a timer.
+    """
+    def __init__(self, queue_size=64, flush_interval=0.05):
+        self.queue_size = queue_size        # Frames buffered per subscriber before it is dropped
+        self.flush_interval = flush_interval  # Seconds of changes coalesced into one event
+        self._loop = None
+        self._subscribers = set()
+        self._pending = {}
+        self._version = 0  # Lot version covered by the pending changes
+        self._flush_scheduled = False
+
+        self.events_sent = 0
+        self.slot_updates = 0
+        self.dropped = 0
+
+    def attach(self, loop):
+        """Binds the broadcaster to the server's event loop (call from the lifespan)"""
+        self._loop = loop
+
+    def publish(self, slot_id, slot, version):
+        """ParkingLot listener: thread-safe, a no-op until attach() is called"""
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        loop.call_soon_threadsafe(self._stage, slot_id, slot, version)
+
+    def _stage(self, slot_id, slot, version):
+        self._pending[slot_id] = slot  # Later writes to the same slot overwrite earlier ones
+        self._version = max(self._version, version)
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            self._loop.call_later(self.flush_interval, self._flush)
+
+    def _flush(self):
+        self._flush_scheduled = False
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, {}
+        self.slot_updates += len(pending)
+        if not self._subscribers:
+            return
+
+        frame = sse_frame("slots", {"version": self._version, "slots": pending})
+        self.events_sent += 1
+        for sub in list(self._subscribers):
+            try:
+                sub.queue.put_nowait(frame)
+            except asyncio.QueueFull:
+                self._drop(sub)
+
+    def _drop(self, sub):
+        """Too far behind: end its stream; the browser reconnects and gets a fresh snapshot"""
+        self._end(sub)
+        self.dropped += 1
+
+    def _end(self, sub):
+        self._subscribers.discard(sub)
+        while not sub.queue.empty():
+            sub.queue.get_nowait()
+        sub.queue.put_nowait(None)  # None ends the stream
+
+    def subscribe(self):
+        sub = _Subscriber(self.queue_size)
+        self._subscribers.add(sub)
+        return sub
+
+    def unsubscribe(self, sub):
+        self._subscribers.discard(sub)
+
+    def close(self):
+        """Ends every open stream (server shutdown)"""
+        for sub in list(self._subscribers):
+            self._end(sub)
+        self._loop = None
+
+    def metrics(self):
+        return {
+            "subscribers": len(self._subscribers),
+            "events_sent": self.events_sent,
+            "slot_updates": self.slot_updates,
+            "dropped_subscribers": self.dropped,
+        }
@@ -1,11 +1,27 @@
+import heapq
+import math
 import random
+import threading
+import time
+from array import array
 from datetime import datetime, timedelta
 
+import numpy as np
+
+from backend.assignment import FORBIDDEN, min_cost_assignment
+from backend.event_log import EventLog
+from backend.layout import SlotLayout, SLOT_TYPE_ATTRS
+from backend.slot_store import NO_ROBOT, SlotTable
+from backend.trace import TraceRecorder, TraceReplayer
+
 class BillingALU:
     """
     DDCO Concept: Arithmetic Logic Unit (ALU)
     Performs mathematical operations for billing based on rates and time.
     """
+    def __init__(self, rng=None):
+        self.rng = rng if rng is not None else random  # Simulated hours draw from this RNG
+
     RATES = {
         "VIP": 20,      # High rate ($20/hr)
         "EV": 15,       # Electricity cost ($15/hr)
@@ -25,7 +41,7 @@ class BillingALU:
     def calculate_fee(self, vehicle_type, entry_time):
         # Legacy method for exit-based billing (if needed)
         if not entry_time: return 0.0
-        simulated_hours = random.uniform(1.0, 5.0) 
+        simulated_hours = self.rng.uniform(1.0, 5.0)
         rate = self.RATES.get(vehicle_type, 10)
         return round(simulated_hours * rate, 2)
 
@@ -66,53 +82,19 @@ class PredictionEngine:
     DDCO Concept: Pipelining / Co-processor
     Runs 'concurrently' to forecast slot availability based on 'Memory' (logs).
     """
-    def predict(self, slots_data, queue_length=0):
-        # Analyze occupied slots to find when they free up
-        upcoming_availability = []
+    UPCOMING_K = 4  # How many soonest-freeing slots the dashboard shows
+
+    def predict(self, slots, expiry, queue_length=0):
+        # Occupied slots free up in end-time order, which the expiry heap keeps
         now = datetime.now()
-        
-        free_count = 0
-        total_count = 0
-        
-        for slot_id, s in slots_data.items():
-            total_count += 1
-            
-            # Handle both dict access styles
-            vehicle = s.get('vehicle') if isinstance(s, dict) else getattr(s, 'vehicle', None)
-            end_time = s.get('end_time') if isinstance(s, dict) else getattr(s, 'end_time', None)
-            slot_id_val = s.get('id', slot_id) if isinstance(s, dict) else getattr(s, 'id', slot_id)
-            
-            if vehicle is None:
-                free_count += 1
-            elif end_time:
-                # Calculate remaining time
-                try:
-                    remaining_seconds = (end_time - now).total_seconds()
-                    
-                    if remaining_seconds > 0:
-                        hours = int(remaining_seconds // 3600)
-                        mins = int((remaining_seconds % 3600) // 60)
-                        
-                        upcoming_availability.append({
-                            "slot": slot_id_val,
-                            "free_at": end_time.strftime("%H:%M"),
-                            "hours_left": hours,
-                            "mins_left": mins,
-                            "total_seconds": remaining_seconds
-                        })
-                except Exception as e:
-                    print(f"Prediction time calc error: {e}")
-                    continue
-        
-        # Sort by soonest available
-        upcoming_availability.sort(key=lambda x: x['total_seconds'])
+        free_count, total_count, upcoming_availability = self._scan_expiry(slots, expiry, now)
 
         # Enhanced Probability Logic
         # 1. Effective free slots considers the queue
         effective_free = free_count - queue_length
         
         # 2. Time-based factor (Simulated "Peak Hours")
-        current_hour = datetime.now().hour
+        current_hour = now.hour
         is_peak = (8 <= current_hour <= 10) or (17 <= current_hour <= 19)
         
         # Calculate base probability
@@ -140,66 +122,490 @@ class PredictionEngine:
             "total_slots": total_count,
             "queue_impact": queue_length,
             "is_peak": is_peak,
-            "upcoming": upcoming_availability[:4]  # Top 4 soonest freeing slots
+            "upcoming": upcoming_availability  # Top 4 soonest freeing slots
+        }
+
+    def _scan_expiry(self, table, expiry, now):
+        """Reads the soonest-freeing slots straight off the lot's expiry heap"""
+        now_ts = now.timestamp()
+        total_count = len(table)
+        free_count = table.free_count()
+        return free_count, total_count, [
+            self._format_upcoming(slot_id, end_ts, end_ts - now_ts)
+            for end_ts, slot_id in expiry.smallest(self.UPCOMING_K, now_ts)
+        ]
+
+    @staticmethod
+    def _format_upcoming(slot_id, end_ts, remaining_seconds):
+        free_at = datetime.fromtimestamp(end_ts)
+        return {
+            "slot": slot_id,
+            "free_at": f"{free_at.hour:02d}:{free_at.minute:02d}",
+            "hours_left": int(remaining_seconds // 3600),
+            "mins_left": int((remaining_seconds % 3600) // 60),
+            "total_seconds": remaining_seconds
         }
 
 class Vehicle:
     """
     DDCO Concept: Register (Stores Vehicle State)
     """
+    __slots__ = ("id", "type", "duration", "state", "assigned_slot", "dynamic_priority", "arrived_at", "gate")
+
     def __init__(self, v_id, v_type, duration):
         self.id = v_id
         self.type = v_type
         self.duration = duration
         self.state = "WAITING" # WAITING, MOVING, PARKED
         self.assigned_slot = None
+        self.dynamic_priority = None # Set when the vehicle joins the queue
+        self.arrived_at = None # Simulated arrival time (tick; seconds in the event simulator)
+        self.gate = 0 # Layout gate where the vehicle is handed to a robot
 
 class Robot:
     """
     DDCO Concept: Finite State Machine (FSM) Agent
     """
-    def __init__(self, r_id):
+    __slots__ = ("id", "state", "current_vehicle", "target_slot", "parked_count", "busy_ticks",
+                 "x", "y", "home", "ticks_left", "distance")
+
+    def __init__(self, r_id, home=(0.0, 0.0)):
         self.id = r_id
         self.state = "IDLE" # IDLE, MOVING_TO_SLOT, PARKING, RETURNING
         self.current_vehicle = None
         self.target_slot = None
+        self.parked_count = 0 # Vehicles this robot has parked
+        self.busy_ticks = 0 # Clock cycles spent away from IDLE
+        self.home = home # Base position (a gate)
+        self.x, self.y = home # Current grid position
+        self.ticks_left = 0 # Clock cycles until it reaches target_slot
+        self.distance = 0.0 # Total bays travelled
+
+class WaitingQueue:
+    """
+    DDCO Concept: Priority Queue (Bus Arbitration Buffer)
+    Waiting vehicles ordered by (dynamic_priority, id), lowest first. Keeps one
+    binary heap per vehicle type; removals (robot assignment, undo) are lazy and
+    stale heap entries are dropped when they surface or when too many pile up.
+    """
+    __slots__ = ("_heaps", "_waiting", "_stale")
+
+    def __init__(self):
+        self._heaps = {}    # vehicle type -> heap of (dynamic_priority, id, vehicle)
+        self._waiting = {}  # vehicle id -> vehicle, in arrival order
+        self._stale = 0     # heap entries whose vehicle is no longer waiting
+
+    def push(self, vehicle):
+        heapq.heappush(self._heaps.setdefault(vehicle.type, []), (vehicle.dynamic_priority, vehicle.id, vehicle))
+        self._waiting[vehicle.id] = vehicle
+
+    def discard(self, vehicle):
+        """Removes a vehicle from the queue (lazily, O(1))"""
+        if self._waiting.get(vehicle.id) is vehicle:
+            del self._waiting[vehicle.id]
+            self._stale += 1
+            if self._stale > len(self._waiting) + 64:
+                self._compact()
+
+    def pop_newest(self):
+        """Removes and returns the most recently added vehicle, or None"""
+        if not self._waiting:
+            return None
+        vehicle = self._waiting[next(reversed(self._waiting))]
+        self.discard(vehicle)
+        return vehicle
+
+    def peek(self):
+        """Returns the highest-priority waiting vehicle, or None"""
+        heads = [heap[0] for heap in self._heaps.values() if self._prune(heap)]
+        return min(heads)[2] if heads else None
+
+    def scan(self, skip_types=()):
+        """
+        Yields waiting vehicles in priority order without removing them.
+        Types added to skip_types during the scan are not visited any further;
+        vehicles discarded during the scan leave the queue when it ends.
+        """
+        heads = []
+        for v_type, heap in self._heaps.items():
+            if v_type not in skip_types and self._prune(heap):
+                heads.append((heap[0], v_type))
+        heapq.heapify(heads)
+
+        popped = []
+        try:
+            while heads:
+                entry, v_type = heapq.heappop(heads)
+                heap = self._heaps[v_type]
+                heapq.heappop(heap)
+                popped.append(entry)
+                yield entry[2]
+                if v_type not in skip_types and self._prune(heap):
+                    heapq.heappush(heads, (heap[0], v_type))
+        finally:
+            # Put back everything that is still waiting
+            for entry in popped:
+                if self._waiting.get(entry[1]) is entry[2]:
+                    heapq.heappush(self._heaps[entry[2].type], entry)
+                else:
+                    self._stale -= 1
+
+    def clear(self):
+        self._heaps.clear()
+        self._waiting.clear()
+        self._stale = 0
+
+    def _prune(self, heap):
+        """Drops stale entries from the top of a heap; True if it is non-empty"""
+        while heap and self._waiting.get(heap[0][1]) is not heap[0][2]:
+            heapq.heappop(heap)
+            self._stale -= 1
+        return bool(heap)
+
+    def _compact(self):
+        for v_type, heap in self._heaps.items():
+            self._heaps[v_type] = [e for e in heap if self._waiting.get(e[1]) is e[2]]
+            heapq.heapify(self._heaps[v_type])
+        self._stale = 0
+
+    def __len__(self):
+        return len(self._waiting)
+
+    def __bool__(self):
+        return bool(self._waiting)
+
+    def __contains__(self, vehicle):
+        return self._waiting.get(vehicle.id) is vehicle
+
+    def __iter__(self):
+        """Waiting vehicles in priority order (O(n log n), for inspection)"""
+        return iter(sorted(self._waiting.values(), key=lambda v: (v.dynamic_priority, v.id)))
+
+class FreeSlotIndex:
+    """
+    DDCO Concept: Free-List with Priority Encoder
+    One free bitmap (a byte per slot) per slot type over that type's sorted
+    slot IDs. The MUX finds the lowest free slot of a type with a C-level
+    byte search from a per-type hint (every slot below the hint is taken),
+    so allocation never walks the register file slot by slot. Typed arrays
+    only, about 14 B per slot, no Python object per slot.
+    """
+    def __init__(self, type_index):
+        """type_index: slot type -> sorted slot IDs of that type; every slot starts free"""
+        self._codes = {t: code for code, t in enumerate(type_index)}
+        self._ids = [array("q", ids) for ids in type_index.values()]
+        self._free = [bytearray(b"\x01") * len(ids) for ids in self._ids]
+        self._hint = [0] * len(self._ids)
+        self._count = sum(len(ids) for ids in self._ids)
+
+        # slot ID -> (type code, position in that type's arrays): arithmetic lookup
+        # when IDs are contiguous, a dict only for sparse layouts
+        self._base = min((ids[0] for ids in self._ids if ids), default=0)
+        span = max((ids[-1] for ids in self._ids if ids), default=-1) - self._base + 1
+        self._where = None
+        if span != self._count:
+            self._where = {slot_id: (code, i) for code, ids in enumerate(self._ids) for i, slot_id in enumerate(ids)}
+        else:
+            self._type_of = bytearray(span)
+            self._pos = array("i", bytes(4 * span))
+            for code, ids in enumerate(self._ids):
+                for i, slot_id in enumerate(ids):
+                    self._type_of[slot_id - self._base] = code
+                    self._pos[slot_id - self._base] = i
+
+    @classmethod
+    def from_layout(cls, layout):
+        """Builds an all-free index straight from the layout's type index"""
+        return cls(layout.type_index)
+
+    def _locate(self, slot_id):
+        if self._where is not None:
+            return self._where[slot_id]
+        row = slot_id - self._base
+        if row < 0 or row >= len(self._pos):
+            raise KeyError(slot_id)
+        return self._type_of[row], self._pos[row]
+
+    def add(self, slot_id):
+        """Marks a slot as free."""
+        code, i = self._locate(slot_id)
+        if not self._free[code][i]:
+            self._free[code][i] = 1
+            self._count += 1
+            if i < self._hint[code]:
+                self._hint[code] = i
+
+    def discard(self, slot_id):
+        """Marks a slot as taken (occupied, reserved or locked by a robot)."""
+        code, i = self._locate(slot_id)
+        if self._free[code][i]:
+            self._free[code][i] = 0
+            self._count -= 1
+
+    def first(self, slot_type):
+        """Returns the lowest free slot ID of the given type, or None."""
+        code = self._codes.get(slot_type)
+        if code is None:
+            return None
+        i = self._free[code].find(1, self._hint[code])
+        if i < 0:
+            self._hint[code] = len(self._free[code])
+            return None
+        self._hint[code] = i
+        return self._ids[code][i]
+
+    def first_any(self):
+        """Returns the lowest free slot ID of any type, or None."""
+        heads = [self.first(t) for t in self._codes]
+        heads = [h for h in heads if h is not None]
+        return min(heads) if heads else None
+
+    def __len__(self):
+        return self._count
+
+    def __contains__(self, slot_id):
+        try:
+            code, i = self._locate(slot_id)
+        except KeyError:
+            return False
+        return bool(self._free[code][i])
+
+class ExpiryHeap:
+    """
+    DDCO Concept: Timer Queue (Interrupt Controller)
+    Indexed binary min-heap of end times (epoch seconds) keyed by slot ID.
+    A position map makes insert, update (extend) and remove (exit) O(log n),
+    so "which slots free up next" never needs a full scan. Once an end time
+    has passed, its entry moves off the heap into an overdue map (slots stay
+    occupied until someone releases them), so the upcoming walk costs O(k log k)
+    however many stays have run over. The scheduler thread reads and updates
+    it alongside request threads, so every public method holds the heap's lock.
+    """
+    def __init__(self):
+        self._keys = []   # end_ts per heap node
+        self._ids = []    # slot_id per heap node
+        self._pos = {}    # slot_id -> heap node index
+        self._overdue = {}  # slot_id -> end_ts, for entries whose end time has passed
+        self._lock = threading.RLock()
+
+    def set(self, slot_id, end_ts):
+        """Inserts a slot or moves it to a new end time"""
+        with self._lock:
+            self._overdue.pop(slot_id, None)
+            i = self._pos.get(slot_id)
+            if i is None:
+                self._keys.append(end_ts)
+                self._ids.append(slot_id)
+                i = self._pos[slot_id] = len(self._ids) - 1
+                self._sift_up(i)
+            else:
+                old = self._keys[i]
+                self._keys[i] = end_ts
+                if end_ts < old:
+                    self._sift_up(i)
+                else:
+                    self._sift_down(i)
+
+    def remove(self, slot_id):
+        with self._lock:
+            if self._overdue.pop(slot_id, None) is None:
+                self._remove_node(slot_id)
+
+    def remove_many(self, slot_ids):
+        """Removes several slots: one O(n) re-heapify instead of a sift per slot when many go at once"""
+        with self._lock:
+            gone = set()
+            for slot_id in slot_ids:
+                if self._overdue.pop(slot_id, None) is None and slot_id in self._pos:
+                    gone.add(slot_id)
+            if len(gone) < 32:
+                for slot_id in gone:
+                    self._remove_node(slot_id)
+                return
+            nodes = [(key, slot_id) for key, slot_id in zip(self._keys, self._ids) if slot_id not in gone]
+            heapq.heapify(nodes)
+            self._keys = [key for key, _ in nodes]
+            self._ids = [slot_id for _, slot_id in nodes]
+            self._pos = {slot_id: i for i, slot_id in enumerate(self._ids)}
+
+    def smallest(self, k, now):
+        """
+        The k earliest (end_ts, slot_id) with end_ts > now, in order.
+        Best-first walk of the heap tree: O(k log k), as entries at or before
+        now have moved to the overdue map first.
+        """
+        with self._lock:
+            self._advance(now)
+            keys, ids = self._keys, self._ids
+            out = []
+            frontier = [(keys[0], 0)] if keys else []
+            while frontier and len(out) < k:
+                key, i = heapq.heappop(frontier)
+                out.append((key, ids[i]))
+                for child in (2 * i + 1, 2 * i + 2):
+                    if child < len(keys):
+                        heapq.heappush(frontier, (keys[child], child))
+        return out
+
+    def expired(self, now, after=float("-inf")):
+        """All (end_ts, slot_id) with after < end_ts <= now, earliest first"""
+        with self._lock:
+            self._advance(now)
+            return sorted((end_ts, slot_id) for slot_id, end_ts in self._overdue.items() if after < end_ts <= now)
+
+    def _advance(self, now):
+        """Moves every heap entry with end_ts <= now to the overdue map"""
+        keys, ids = self._keys, self._ids
+        while keys and keys[0] <= now:
+            self._overdue[ids[0]] = keys[0]
+            self._remove_node(ids[0])
+
+    def _remove_node(self, slot_id):
+        i = self._pos.pop(slot_id, None)
+        if i is None:
+            return
+        last_key, last_id = self._keys.pop(), self._ids.pop()
+        if i < len(self._ids):
+            self._keys[i], self._ids[i] = last_key, last_id
+            self._pos[last_id] = i
+            self._sift_down(i)
+            self._sift_up(self._pos[last_id])
+
+    def _swap(self, i, j):
+        keys, ids = self._keys, self._ids
+        keys[i], keys[j] = keys[j], keys[i]
+        ids[i], ids[j] = ids[j], ids[i]
+        self._pos[ids[i]] = i
+        self._pos[ids[j]] = j
+
+    def _sift_up(self, i):
+        keys = self._keys
+        while i > 0:
+            parent = (i - 1) // 2
+            if keys[i] >= keys[parent]:
+                break
+            self._swap(i, parent)
+            i = parent
+
+    def _sift_down(self, i):
+        keys = self._keys
+        n = len(keys)
+        while True:
+            smallest = i
+            for child in (2 * i + 1, 2 * i + 2):
+                if child < n and keys[child] < keys[smallest]:
+                    smallest = child
+            if smallest == i:
+                return
+            self._swap(i, smallest)
+            i = smallest
+
+    def __len__(self):
+        return len(self._ids) + len(self._overdue)
+
+    def __contains__(self, slot_id):
+        return slot_id in self._pos or slot_id in self._overdue
+
+def _clock(rec):
+    return datetime.fromtimestamp(rec["time"])
+
+def _format_history(rec, v_type, action):
+    """history_log record -> the entry dict the log used to store"""
+    entry = {
+        "time": _clock(rec).isoformat(timespec="seconds"),
+        "timestamp": _clock(rec).strftime("%H:%M:%S"),
+        "type": v_type,
+        "action": action,
+        "slot": int(rec["slot"]),
+    }
+    if action == "ENTRY":
+        entry["duration"] = float(rec["duration"])
+        entry["cost"] = float(rec["value"])
+    return entry
+
+def _format_sim(rec, v_type, action):
+    """sim_log record -> the console line the log used to store"""
+    stamp = f"[{_clock(rec).strftime('%H:%M:%S')}]"
+    if action == "QUEUE_ADD":
+        message = (f"{stamp} QUEUE ADD: {v_type} V#{rec['vehicle']} | Priority: {rec['value']:.2f} | "
+                   f"Duration: {rec['duration']:g}h")
+    elif action == "UNDO":
+        message = f"{stamp} ↩️ UNDO: Removed Vehicle {rec['vehicle']} ({v_type}) from queue."
+    else:
+        message = f"{stamp} 🔄 SIMULATION RESET - All counters cleared"
+    return {"time": _clock(rec).isoformat(timespec="seconds"), "action": action, "message": message}
 
 class ParkingLot:
-    def __init__(self, total_slots=12):
-        self.total_slots = total_slots
+    # Robot dispatch policies:
+    #   BOUND         - vehicle N may only be served by robot (N-1) % robots
+    #   WORK_STEALING - the highest-priority waiting vehicle goes to any idle robot
+    #   OPTIMAL       - min-cost matching of idle robots, waiting vehicles and bays by travel distance
+    DISPATCH_MODES = ("BOUND", "WORK_STEALING", "OPTIMAL")
+
+    # Added to a bay's cost per step down the vehicle's slot-type preference list,
+    # so the matcher only overflows into another type when it has to
+    TYPE_PENALTY = 1e6
+
+    HISTORY_ACTIONS = ("ENTRY", "EXIT")
+    SIM_LOG_ACTIONS = ("QUEUE_ADD", "UNDO", "RESET")
+
+    def __init__(self, total_slots=12, layout=None, num_robots=3, seed=None, travel_speed=None, rng=None,
+                 history_capacity=10_000, sim_log_capacity=1_000):
+        # Lot layout (slot IDs, types, attributes) - generated from the default
+        # type mix when no explicit layout is given
+        self.layout = layout if layout is not None else SlotLayout.generate(total_slots)
+        self.total_slots = len(self.layout)
         
         # DDCO Concept: Memory / Register File
-        # Added 'robot_assigned' to track robot interaction
-        # Added 'is_auto' to track if parked by robot
-        self.slots = {
-            1: {"id": 1, "type": "VIP", "vehicle": None, "attr": "Near Entrance", "entry_time": None, "end_time": None, "robot_assigned": None, "is_auto": False},
-            2: {"id": 2, "type": "VIP", "vehicle": None, "attr": "Near Entrance", "entry_time": None, "end_time": None, "robot_assigned": None, "is_auto": False},
-            3: {"id": 3, "type": "EV", "vehicle": None, "attr": "Charging Station", "entry_time": None, "end_time": None, "robot_assigned": None, "is_auto": False},
-            4: {"id": 4, "type": "EV", "vehicle": None, "attr": "Charging Station", "entry_time": None, "end_time": None, "robot_assigned": None, "is_auto": False},
-            5: {"id": 5, "type": "SENIOR", "vehicle": None, "attr": "Wide Space", "entry_time": None, "end_time": None, "robot_assigned": None, "is_auto": False},
-            6: {"id": 6, "type": "SENIOR", "vehicle": None, "attr": "Wide Space", "entry_time": None, "end_time": None, "robot_assigned": None, "is_auto": False},
-            7: {"id": 7, "type": "NORMAL", "vehicle": None, "attr": "Standard", "entry_time": None, "end_time": None, "robot_assigned": None, "is_auto": False},
-            8: {"id": 8, "type": "NORMAL", "vehicle": None, "attr": "Standard", "entry_time": None, "end_time": None, "robot_assigned": None, "is_auto": False},
-            9: {"id": 9, "type": "NORMAL", "vehicle": None, "attr": "Standard", "entry_time": None, "end_time": None, "robot_assigned": None, "is_auto": False},
-            10: {"id": 10, "type": "NORMAL", "vehicle": None, "attr": "Standard", "entry_time": None, "end_time": None, "robot_assigned": None, "is_auto": False},
-            11: {"id": 11, "type": "NORMAL", "vehicle": None, "attr": "Standard", "entry_time": None, "end_time": None, "robot_assigned": None, "is_auto": False},
-            12: {"id": 12, "type": "EMERGENCY", "vehicle": None, "attr": "Exit Ramp", "entry_time": None, "end_time": None, "robot_assigned": None, "is_auto": False}
-        }
+        # Column-major slot store; self.slots[id] still reads like the old slot dict
+        # ('robot_assigned' tracks robot interaction, 'is_auto' robot-parked bays)
+        self.slots = SlotTable(self.layout)
         
-        self.history_log = [] # Sequential Memory
-        self.sim_log = [] # Dedicated Simulation Log
+        # Per-type free-list so allocation never scans the whole register file
+        self.free_slots = FreeSlotIndex.from_layout(self.layout)
+        # End-time heap so "next to free up" / "already expired" skip the scan
+        self.expiry = ExpiryHeap()
+        # Slot-change subscribers (e.g. the SSE broadcaster); empty for headless runs
+        self._listeners = []
+        # Bumped by every slot write; each slot row remembers the version that last wrote it
+        self.version = 0
+        # Guards the slot table, free-slot index and expiry heap: request threads,
+        # the event loop and the scheduler thread all read and write the live lot
+        self._lock = threading.RLock()
+
+        # Per-lot random source: the same seed gives the same simulation run
+        # (pass rng=SplitMix64(seed) to match BatchSimulator lot for lot)
+        self.seed = seed
+        self.rng = rng if rng is not None else random.Random(seed)
+
+        # Sequential Memory - bounded ring buffers of compact records, formatted on read
+        self.history_log = EventLog(self.HISTORY_ACTIONS, _format_history, capacity=history_capacity)
+        self.sim_log = EventLog(self.SIM_LOG_ACTIONS, _format_sim, capacity=sim_log_capacity) # Dedicated Simulation Log
         self.encoder = PriorityEncoder()
         self.predictor = PredictionEngine()
-        self.alu = BillingALU() # New ALU Module
+        self.alu = BillingALU(self.rng) # New ALU Module
         self.state = "IDLE" # FSM State
 
         # Simulation Components
-        self.robots = [Robot(1), Robot(2), Robot(3)]
-        self.waiting_queue = [] # FIFO Queue (Shift Register)
+        # Robots start at the gates, round-robin
+        gates = [tuple(map(float, g)) for g in self.layout.gates]
+        self.robots = [Robot(r_id, gates[(r_id - 1) % len(gates)]) for r_id in range(1, num_robots + 1)]
+        # Bays per clock cycle. None: any bay is reached in one cycle and robots
+        # return to base; otherwise trips take distance / speed cycles and robots
+        # wait at the bay they last parked in.
+        self.travel_speed = travel_speed
+        self.waiting_queue = WaitingQueue() # Priority Queue (Shift Register)
+        self.dispatch_mode = "BOUND"
         self.vehicle_counter = 0
         self.traffic_mode = "MANUAL" # MANUAL, PEAK, EVENT
         self.auto_gen_count = 0 # Track total auto-generated vehicles
         self.sim_vehicle_counter = 0  # NEW: Separate counter for simulation vehicles
+        self.queue_capacity = None # Max waiting vehicles (None = unbounded)
+        self.parked_count = 0 # Vehicles parked by robots
+        self.rejected_count = 0 # Arrivals turned away because the queue was full
+        self.sim_tick = 0 # Clock cycles run so far (arrivals are stamped with it)
+        self.trace_recorder = None # Records the arrival stream (TraceRecorder)
+        self.trace_replayer = None # Replays a recorded arrival stream (TraceReplayer)
         
         # Counters for dynamic priority assignment
         self.type_counters = {
@@ -217,11 +623,13 @@ class ParkingLot:
         Call this when starting a new simulation session.
         """
         # Clear the waiting queue
-        self.waiting_queue = []
+        self.waiting_queue.clear()
         
         # Reset simulation-specific counters
         self.sim_vehicle_counter = 0
         self.auto_gen_count = 0
+        self.parked_count = 0
+        self.rejected_count = 0
         
         # Reset type counters for priority calculation
         self.type_counters = {
@@ -238,48 +646,132 @@ class ParkingLot:
             robot.state = "IDLE"
             robot.current_vehicle = None
             robot.target_slot = None
+            robot.parked_count = 0
+            robot.busy_ticks = 0
+            robot.x, robot.y = robot.home
+            robot.ticks_left = 0
+            robot.distance = 0.0
         
         # Clear simulation log
-        self.sim_log = []
+        self.sim_log.clear()
         
         # Log the reset
-        log_entry = f"[{datetime.now().strftime('%H:%M:%S')}] 🔄 SIMULATION RESET - All counters cleared"
-        self.sim_log.append(log_entry)
+        self.sim_log.record("RESET")
         
         return "Simulation reset successfully. Vehicle counter starts from 1."
 
+    def start_trace_recording(self, path):
+        """Writes every arrival from the next tick on to a JSON-lines trace file"""
+        self.stop_trace_recording()
+        self.trace_recorder = TraceRecorder(path, start_tick=self.sim_tick)
+        return self.trace_recorder
+
+    def stop_trace_recording(self):
+        """Closes the trace file; returns the number of arrivals recorded"""
+        recorder, self.trace_recorder = self.trace_recorder, None
+        if recorder is None:
+            return 0
+        recorder.close()
+        return recorder.count
+
+    def replay_trace(self, path):
+        """
+        Replays a recorded arrival stream from the next tick on. Random traffic
+        generation stays switched off until stop_trace_replay() is called.
+        """
+        self.trace_replayer = TraceReplayer.from_file(path, start_tick=self.sim_tick)
+        return len(self.trace_replayer)
+
+    def stop_trace_replay(self):
+        self.trace_replayer = None
+
     def set_traffic_mode(self, mode):
         self.traffic_mode = mode
         return f"Traffic Pattern set to: {mode}"
 
+    def set_dispatch_mode(self, mode):
+        if mode not in self.DISPATCH_MODES:
+            raise ValueError(f"Unknown dispatch mode: {mode}")
+        self.dispatch_mode = mode
+        return f"Robot dispatch set to: {mode}"
+
+    def robot_stats(self, ticks=None):
+        """Per-robot throughput and utilisation (over the given number of ticks, default all)"""
+        ticks = self.sim_tick if ticks is None else ticks
+        return [{"id": r.id, "state": r.state, "parked": r.parked_count, "busy_ticks": r.busy_ticks,
+                 "utilisation": round(r.busy_ticks / ticks, 4) if ticks else 0.0,
+                 "distance": round(r.distance, 1)}
+                for r in self.robots]
+
     def get_ai_prediction(self):
-        return self.predictor.predict(self.slots, len(self.waiting_queue))
+        with self._lock:
+            return self.predictor.predict(self.slots, self.expiry, len(self.waiting_queue))
+
+    def expired_slots(self, now=None, after=None):
+        """IDs of occupied slots whose end_time is at or before now (and after `after`, if given), earliest first"""
+        with self._lock:
+            now = now or datetime.now()
+            after = after.timestamp() if after else float("-inf")
+            return [slot_id for _, slot_id in self.expiry.expired(now.timestamp(), after)]
+
+    def _sync_slot(self, slot_id):
+        """
+        Keeps the free-slot index, the expiry heap and the state version in
+        step with a slot after it was written. A slot is free only when it has
+        no vehicle and no robot heading to it.
+        """
+        self.version += 1
+        self.slots.slot_version[self.slots.row(slot_id)] = self.version
+
+        if self.slots.is_free(slot_id):
+            self.free_slots.add(slot_id)
+        else:
+            self.free_slots.discard(slot_id)
+
+        end_ts = float(self.slots.end_ts[self.slots.row(slot_id)])
+        if end_ts != end_ts:  # NaN: no end time
+            self.expiry.remove(slot_id)
+        else:
+            self.expiry.set(slot_id, end_ts)
+
+        if self._listeners:
+            snapshot = dict(self.slots[slot_id])
+            for listener in self._listeners:
+                listener(slot_id, snapshot, self.version)
+
+    def add_listener(self, listener):
+        """listener(slot_id, slot_dict, version) is called after every slot write (entry, exit, reserve, extend, robots)"""
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener):
+        if listener in self._listeners:
+            self._listeners.remove(listener)
 
     def _find_best_slot(self, vehicle_type, priority):
         # DDCO Concept: Multiplexer (MUX) Logic
         # Selects best output line based on selection inputs (Priority & Type)
         
-        # Filter out slots that are occupied OR have a robot assigned
-        available_slots = [s for s in self.slots.values() if s['vehicle'] is None and s['robot_assigned'] is None]
+        # Only free slots (no vehicle AND no robot assigned) live in the index
+        free = self.free_slots
         
-        if not available_slots:
+        if not free:
             return None
 
         # 1. Emergency Override (Interrupt Handler)
         if vehicle_type == "AMBULANCE":
             # Priority 1: Emergency Slot (ID 12)
-            for s in available_slots:
-                if s['type'] == "EMERGENCY": return s['id']
+            slot_id = free.first("EMERGENCY")
+            if slot_id is not None: return slot_id
             # Priority 2: Any available slot
-            return available_slots[0]['id']
+            return free.first_any()
 
         # 2. Strict Type Matching (Comparator Logic)
         # Users requested strict confinement: NORMAL -> NORMAL, VIP -> VIP, EV -> EV
-        matching_slots = [s for s in available_slots if s['type'] == vehicle_type]
+        slot_id = free.first(vehicle_type)
         
-        if matching_slots:
+        if slot_id is not None:
             # Return the first matching slot found
-            return matching_slots[0]['id']
+            return slot_id
 
         # 3. Adaptive Logic for Peak/Event Modes (Overflow Handling)
         
@@ -287,16 +779,12 @@ class ParkingLot:
         # "make this mode available for all vechicle car not only auto cAR"
         # We allow this in PEAK mode AND MANUAL mode (for manual entries)
         if vehicle_type == "NORMAL" and (self.traffic_mode == "PEAK" or self.traffic_mode == "MANUAL"):
-            vip_slots = [s for s in available_slots if s['type'] == "VIP"]
-            if vip_slots:
-                return vip_slots[0]['id']
+            return free.first("VIP")
 
         # VIP CARS: Allow overflow to NORMAL slots
         # Applies in EVENT mode AND MANUAL mode (for manual entries)
         if vehicle_type == "VIP" and (self.traffic_mode == "EVENT" or self.traffic_mode == "MANUAL"):
-            normal_slots = [s for s in available_slots if s['type'] == "NORMAL"]
-            if normal_slots:
-                return normal_slots[0]['id']
+            return free.first("NORMAL")
 
         # If no matching slot is found, return None (Do not allow overflow to other types)
         return None
@@ -306,59 +794,63 @@ class ParkingLot:
         Adds a vehicle to the waiting queue (Shift Register Input)
         Uses simulation-specific counter for vehicle IDs.
         """
-        # Use simulation-specific counter instead of global counter
-        self.sim_vehicle_counter += 1
-        vehicle_id = self.sim_vehicle_counter  # Start from 1 for each simulation session
+        new_vehicle = self._enqueue(v_type, duration, log=True)
+        if new_vehicle is None:
+            return f"⛔ Queue FULL ({self.queue_capacity} waiting). Vehicle ({v_type}) rejected."
         
-        # Increment type-specific counter for dynamic priority
-        if v_type in self.type_counters:
-            self.type_counters[v_type] += 1
-        else:
-            self.type_counters[v_type] = 1
-            
-        new_vehicle = Vehicle(vehicle_id, v_type, duration)
+        return f"Vehicle #{new_vehicle.id} ({v_type}) [Prio: {new_vehicle.dynamic_priority:.2f}] added."
+
+    def _enqueue(self, v_type, duration, log=False):
+        """
+        Creates a vehicle and pushes it onto the waiting queue.
+        Returns None if the queue is at capacity. With log=True the QUEUE_ADD
+        entry is written before any queue state changes, so a failed write
+        leaves the lot as it was.
+        """
+        if self.trace_recorder is not None:
+            self.trace_recorder.record(self.sim_tick, v_type, duration)
+
+        if self.queue_capacity is not None and len(self.waiting_queue) >= self.queue_capacity:
+            self.rejected_count += 1
+            return None
+        
+        # Use simulation-specific counter instead of global counter
+        vehicle_id = self.sim_vehicle_counter + 1  # Start from 1 for each simulation session
         
         # DDCO Concept: Bus Arbitration / Priority Sorting
         # Base Priority from Encoder (Lower is better)
         base_priority = self.encoder.get_priority(v_type)
         
         # Dynamic Priority: Base + (Arrival Order * 0.01)
-        arrival_order = self.type_counters.get(v_type, 0)
+        arrival_order = self.type_counters.get(v_type, 0) + 1
         final_priority = base_priority + (arrival_order * 0.01)
-        
+
+        if log:
+            # Robot Logging - Updated to show simulation vehicle ID clearly
+            self.sim_log.record("QUEUE_ADD", v_type, vehicle=vehicle_id, value=final_priority, duration=float(duration))
+
+        self.sim_vehicle_counter = vehicle_id
+        self.type_counters[v_type] = arrival_order  # Type-specific counter for dynamic priority
+            
+        new_vehicle = Vehicle(vehicle_id, v_type, duration)
+        new_vehicle.arrived_at = self.sim_tick
+        new_vehicle.gate = (vehicle_id - 1) % len(self.layout.gates)
         new_vehicle.dynamic_priority = final_priority
         
-        inserted = False
-        for i, v in enumerate(self.waiting_queue):
-            # Compare dynamic priorities
-            # If new vehicle has lower value (higher priority), insert before current v
-            if final_priority < getattr(v, 'dynamic_priority', 999):
-                self.waiting_queue.insert(i, new_vehicle)
-                inserted = True
-                break
-        
-        if not inserted:
-            self.waiting_queue.append(new_vehicle)
-            
-        # Robot Logging - Updated to show simulation vehicle ID clearly
-        log_entry = f"[{datetime.now().strftime('%H:%M:%S')}] QUEUE ADD: {v_type} V#{vehicle_id} | Priority: {final_priority:.2f} | Duration: {duration}h"
-        self.sim_log.append(log_entry)
-
-        return f"Vehicle #{vehicle_id} ({v_type}) [Prio: {final_priority:.2f}] added."
+        # Heap insert: lower value (higher priority) first, ties in arrival order
+        self.waiting_queue.push(new_vehicle)
+        return new_vehicle
 
     def remove_last_vehicle(self):
         """
         Removes the most recently added vehicle from the waiting queue (Undo operation)
         """
-        if not self.waiting_queue:
+        # Newest vehicle (highest ID) leaves the queue
+        last_vehicle = self.waiting_queue.pop_newest()
+        if last_vehicle is None:
             return "Queue is empty. Nothing to undo."
         
-        # Find vehicle with highest ID (newest)
-        last_vehicle = max(self.waiting_queue, key=lambda v: v.id)
-        self.waiting_queue.remove(last_vehicle)
-        
-        log_entry = f"[{datetime.now().strftime('%H:%M:%S')}] ↩️ UNDO: Removed Vehicle {last_vehicle.id} ({last_vehicle.type}) from queue."
-        self.sim_log.append(log_entry)
+        self.sim_log.record("UNDO", last_vehicle.type, vehicle=last_vehicle.id)
         
         return f"↩️ Undo: Vehicle {last_vehicle.id} removed from queue."
 
@@ -367,11 +859,108 @@ class ParkingLot:
         DDCO Concept: System Clock Cycle
         Executes one step of the FSM for all robots.
         """
-        logs = []
-        
+        with self._lock:
+            logs = []
+            self._tick(logs)
+
+            return {
+                "logs": logs,
+                "robots": [{"id": r.id, "state": r.state, "vehicle": r.current_vehicle.type if r.current_vehicle else None} for r in self.robots],
+                "queue_len": len(self.waiting_queue),
+                "total_gen": self.auto_gen_count
+            }
+
+    def run_simulation(self, ticks):
+        """
+        Headless Mode: runs many clock cycles in one call with log building
+        disabled and returns only aggregate results.
+        """
+        ticks = int(ticks)
+        start_parked = self.parked_count
+        start_rejected = self.rejected_count
+        start_gen = self.auto_gen_count
+        queue = self.waiting_queue
+        robots = self.robots
+        start_robots = [(r.parked_count, r.busy_ticks, r.distance) for r in robots]
+        tick = self._tick
+        queue_total = 0
+        queue_peak = len(queue)
+        waits = [] # Ticks each dispatched vehicle spent queued
+
+        started = time.perf_counter()
+        with self._lock:
+            for _ in range(ticks):
+                now = self.sim_tick
+                for _, vehicle, _ in tick():
+                    waits.append(now - vehicle.arrived_at)
+                queue_len = len(queue)
+                queue_total += queue_len
+                if queue_len > queue_peak:
+                    queue_peak = queue_len
+        elapsed = time.perf_counter() - started
+
+        parked = self.parked_count - start_parked
+        per_robot = [{"id": r.id, "parked": r.parked_count - p0,
+                      "utilisation": round((r.busy_ticks - b0) / ticks, 4) if ticks else 0.0,
+                      "distance": round(r.distance - d0, 1)}
+                     for r, (p0, b0, d0) in zip(robots, start_robots)]
+        busy_robot_ticks = sum(r.busy_ticks - b0 for r, (_, b0, _) in zip(robots, start_robots))
+        distance = sum(r.distance - d0 for r, (_, _, d0) in zip(robots, start_robots))
+        return {
+            "ticks": ticks,
+            "arrivals": self.auto_gen_count - start_gen,
+            "parked": parked,
+            "throughput_per_tick": round(parked / ticks, 6) if ticks else 0.0,
+            "mean_queue_length": round(queue_total / ticks, 3) if ticks else 0.0,
+            "final_queue_length": len(queue),
+            "peak_queue_length": queue_peak,
+            "mean_wait_ticks": round(sum(waits) / len(waits), 3) if waits else 0.0,
+            "p95_wait_ticks": sorted(waits)[max(1, math.ceil(0.95 * len(waits))) - 1] if waits else 0, # Nearest rank
+            "robot_utilisation": round(busy_robot_ticks / (ticks * len(robots)), 4) if ticks and robots else 0.0,
+            "per_robot": per_robot,
+            "robot_distance": round(distance, 1),
+            "dispatch_mode": self.dispatch_mode,
+            "rejected": self.rejected_count - start_rejected,
+            "elapsed_seconds": round(elapsed, 3),
+            "ticks_per_second": round(ticks / elapsed) if elapsed > 0 else None
+        }
+
+    # Rough per-vehicle footprint in the waiting queue (object, heap tuple, index entry)
+    QUEUED_VEHICLE_BYTES = 320
+
+    def approx_nbytes(self):
+        """Estimated memory held by this lot's state (slot columns, queue, logs)"""
+        log_bytes = self.sim_log.nbytes() + self.history_log.nbytes()
+        return self.slots.nbytes() + len(self.waiting_queue) * self.QUEUED_VEHICLE_BYTES + log_bytes
+
+    def spawn_simulation(self, traffic_mode=None, seed=None):
+        """Fresh, empty lot with this lot's layout - for headless runs that must not touch live state"""
+        lot = ParkingLot(layout=self.layout, num_robots=len(self.robots), seed=seed, travel_speed=self.travel_speed,
+                         history_capacity=self.history_log.capacity, sim_log_capacity=self.sim_log.capacity)
+        lot.traffic_mode = traffic_mode or self.traffic_mode
+        lot.dispatch_mode = self.dispatch_mode
+        return lot
+
+    def _tick(self, logs=None):
+        """
+        One clock cycle. Log lines are only built when a logs list is given,
+        so headless runs skip all string formatting. Returns the
+        (robot, vehicle, slot_id) assignments made this tick.
+        """
         # 1. Traffic Generation (Arrival Pattern Customization)
-        if self.traffic_mode != "MANUAL":
-            chance = random.random()
+        if self.trace_replayer is not None:
+            # Recorded arrivals replace the random pattern
+            for v_type, dur in self.trace_replayer.arrivals_at(self.sim_tick):
+                self.auto_gen_count += 1
+                if logs is None:
+                    self._enqueue(v_type, dur)
+                else:
+                    msg = self.add_vehicle_to_queue(v_type, dur)
+                    logs.append(f"⚡ Replay #{self.auto_gen_count}: {msg}")
+
+        elif self.traffic_mode != "MANUAL":
+            rng = self.rng
+            chance = rng.random()
             spawn = False
             v_type = "NORMAL"
             
@@ -383,19 +972,26 @@ class ParkingLot:
                 # Reduced frequency (15% per tick)
                 if chance < 0.15: 
                     spawn = True
-                    if random.random() < 0.7: v_type = "VIP" # 70% VIP on event days
+                    if rng.random() < 0.7: v_type = "VIP" # 70% VIP on event days
 
             if spawn:
                 self.auto_gen_count += 1
-                dur = round(random.uniform(1.0, 4.0), 1)
-                msg = self.add_vehicle_to_queue(v_type, dur)
-                logs.append(f"⚡ Auto-Gen #{self.auto_gen_count}: {msg}")
+                dur = round(rng.uniform(1.0, 4.0), 1)
+                if logs is None:
+                    self._enqueue(v_type, dur)
+                else:
+                    msg = self.add_vehicle_to_queue(v_type, dur)
+                    logs.append(f"⚡ Auto-Gen #{self.auto_gen_count}: {msg}")
 
         # 2. FSM State Updates (Process existing tasks first)
         for robot in self.robots:
             if robot.state == "MOVING_TO_SLOT":
+                robot.ticks_left -= 1
+                if robot.ticks_left > 0:
+                    continue # Still on the way
                 robot.state = "PARKING"
-                logs.append(f"🤖 Robot {robot.id} arriving at Slot {robot.target_slot}...")
+                if logs is not None:
+                    logs.append(f"🤖 Robot {robot.id} arriving at Slot {robot.target_slot}...")
 
             elif robot.state == "PARKING":
                 # FSM Transition: PARKING -> RETURNING
@@ -407,32 +1003,72 @@ class ParkingLot:
                     # Calculate Cost using ALU
                     cost = self.alu.calculate_upfront_cost(vehicle.type, vehicle.duration)
 
-                    self.slots[slot_id]['vehicle'] = vehicle.type
-                    self.slots[slot_id]['is_auto'] = True # Mark as Automated
-                    self.slots[slot_id]['entry_time'] = datetime.now()
-                    self.slots[slot_id]['end_time'] = datetime.now() + timedelta(hours=float(vehicle.duration))
-                    self.slots[slot_id]['robot_assigned'] = None # Unlock
+                    now = datetime.now()
+                    self.slots.occupy(slot_id, vehicle.type, now, now + timedelta(hours=float(vehicle.duration)),
+                                      is_auto=True) # Mark as Automated
+                    self.slots.set_robot(slot_id, None) # Unlock
+                    self._sync_slot(slot_id)
+                    self.parked_count += 1
+                    robot.parked_count += 1
                     
-                    logs.append(f"✅ Robot {robot.id} parked Vehicle {vehicle.id} in Slot {slot_id}. 💳 Paid: ${cost}")
+                    if logs is not None:
+                        logs.append(f"✅ Robot {robot.id} parked Vehicle {vehicle.id} in Slot {slot_id}. 💳 Paid: ${cost}")
                 
-                robot.state = "RETURNING"
                 robot.current_vehicle = None
                 robot.target_slot = None
+                if self.travel_speed is None:
+                    robot.state = "RETURNING"
+                else:
+                    # Travel model: the robot waits at this bay for its next job
+                    robot.x, robot.y = self._slot_xy(slot_id)
+                    robot.state = "IDLE"
 
             elif robot.state == "RETURNING":
                 # FSM Transition: RETURNING -> IDLE
                 robot.state = "IDLE"
-                logs.append(f"🤖 Robot {robot.id} returned to base.")
+                robot.x, robot.y = robot.home
+                if logs is not None:
+                    logs.append(f"🤖 Robot {robot.id} returned to base.")
+
+        # 3. Assign Idle Robots to Waiting Vehicles
+        assigned = self._assign_waiting(logs)
+        for robot in self.robots:
+            if robot.state != "IDLE":
+                robot.busy_ticks += 1
+        self.sim_tick += 1
+        return assigned
+
+    def _assign_waiting(self, logs=None):
+        """
+        Assign Idle Robots to Waiting Vehicles
+        BOUND (Serial Number Dependency): Vehicle ID % Num_Robots determines the assigned robot.
+        WORK_STEALING: any idle robot takes the vehicle (its own robot first, if idle).
+        OPTIMAL: see _assign_optimal.
+        Locks the chosen slots and returns [(robot, vehicle, slot_id)].
+        """
+        if self.dispatch_mode == "OPTIMAL":
+            return self._assign_optimal(logs)
 
-        # 3. Assign Idle Robots to Waiting Vehicles (MODIFIED: Serial Number Dependency)
-        # Logic: Vehicle ID % Num_Robots determines the assigned robot.
+        assigned = []
+        stealing = self.dispatch_mode == "WORK_STEALING"
         
-        vehicles_to_remove = []
+        # Vehicles are visited in priority order. A type with no slot left stays
+        # blocked for the rest of the tick (slots are only taken here), so its
+        # vehicles are skipped wholesale, and the scan stops once no robot is idle.
+        idle_robots = sum(1 for r in self.robots if r.state == "IDLE")
+        if not idle_robots or not self.waiting_queue or (logs is None and not self.free_slots):
+            return assigned  # Nothing can be assigned (headless runs skip the "no slot" warning too)
+        blocked_types = set()
+        head = True
         
-        for vehicle in self.waiting_queue:
+        scan = self.waiting_queue.scan(blocked_types)
+        for vehicle in scan:
             # Determine target robot based on Vehicle ID (Serial No)
             target_robot_index = (vehicle.id - 1) % len(self.robots)
             target_robot = self.robots[target_robot_index]
+            if stealing and target_robot.state != "IDLE":
+                # Bound robot is busy - hand the vehicle to the first idle one
+                target_robot = next(r for r in self.robots if r.state == "IDLE")
             
             # Only assign if the SPECIFIC robot is IDLE
             if target_robot.state == "IDLE":
@@ -440,119 +1076,265 @@ class ParkingLot:
                 slot_id = self._find_best_slot(vehicle.type, priority)
                 
                 if slot_id:
-                    # FSM Transition: IDLE -> MOVING_TO_SLOT
-                    target_robot.state = "MOVING_TO_SLOT"
-                    target_robot.current_vehicle = vehicle
-                    target_robot.target_slot = slot_id
-                    
-                    # Lock the slot
-                    self.slots[slot_id]['robot_assigned'] = target_robot.id
-                    logs.append(f"🤖 Robot {target_robot.id} picked up Vehicle {vehicle.id} ({vehicle.type}) -> Slot {slot_id}")
-                    
-                    vehicles_to_remove.append(vehicle)
+                    self._dispatch(target_robot, vehicle, slot_id, logs)
+                    assigned.append((target_robot, vehicle, slot_id))
+                    idle_robots -= 1
+                    if idle_robots == 0:
+                        break
                 else:
+                    blocked_types.add(vehicle.type)
                     # Log warning only once per step
-                    if vehicle == self.waiting_queue[0] and len(logs) == 0:
+                    if head and logs is not None and len(logs) == 0:
                         logs.append(f"⚠️ No slot available for {vehicle.type}. Waiting...")
+            head = False
         
-        # Remove assigned vehicles
-        for v in vehicles_to_remove:
-            if v in self.waiting_queue:
-                self.waiting_queue.remove(v)
+        # Vehicles visited but not assigned go back into the queue
+        scan.close()
+        return assigned
 
-        return {
-            "logs": logs,
-            "robots": [{"id": r.id, "state": r.state, "vehicle": r.current_vehicle.type if r.current_vehicle else None} for r in self.robots],
-            "queue_len": len(self.waiting_queue),
-            "total_gen": self.auto_gen_count
-        }
+    def _assign_optimal(self, logs=None):
+        """
+        Travel-aware dispatch. Waiting vehicles are still taken in priority
+        order (one per idle robot, as long as their slot types have room);
+        then two min-cost assignments pick where and by whom they are parked:
+          1. vehicles -> bays, cost = distance from the vehicle's gate to the bay
+             (+ TYPE_PENALTY per step down the vehicle's slot-type preferences)
+          2. idle robots -> vehicles, cost = distance from the robot to the gate
+        A trip costs robot->gate + gate->bay, so solving the two parts
+        separately gives the cheapest total for the chosen vehicles.
+        """
+        assigned = []
+        idle = [r for r in self.robots if r.state == "IDLE"]
+        if not idle or not self.waiting_queue or (logs is None and not self.free_slots):
+            return assigned
+
+        table = self.slots
+        free_rows = np.flatnonzero((table.vehicle_code == 0) & (table.robot_id == NO_ROBOT))
+        free_types = table.type_code[free_rows]
+        type_names = table.slot_types.values
+        room = {type_names[code]: int(count) for code, count in
+                zip(*np.unique(free_types, return_counts=True))}
+
+        # 1. Pick vehicles in priority order, reserving room in their best slot type
+        batch = []  # (vehicle, slot type preferences)
+        blocked_types = set()
+        head = True
+        scan = self.waiting_queue.scan(blocked_types)
+        for vehicle in scan:
+            prefs = self._slot_types_for(vehicle.type)
+            slot_type = next((t for t in prefs if room.get(t)), None)
+            if slot_type is None:
+                blocked_types.add(vehicle.type)
+                if head and logs is not None and len(logs) == 0:
+                    logs.append(f"⚠️ No slot available for {vehicle.type}. Waiting...")
+            else:
+                room[slot_type] -= 1
+                batch.append((vehicle, prefs))
+                if len(batch) == len(idle):
+                    break
+            head = False
+        scan.close()
+        if not batch:
+            return assigned
+
+        gates = self.layout.gates
+        coords = self.layout.coords
+
+        # 2. Candidate bays: per (gate, slot type), the nearest free bays are the
+        #    only ones an optimal plan can use - at most one per batch vehicle
+        wanted = {}
+        for vehicle, prefs in batch:
+            for slot_type in prefs:
+                wanted.setdefault((vehicle.gate, slot_type), 0)
+                wanted[(vehicle.gate, slot_type)] += 1
+        candidates = []
+        for (gate, slot_type), count in wanted.items():
+            code = table.slot_types.codes.get(slot_type)
+            rows = free_rows[free_types == code] if code is not None else free_rows[:0]
+            if len(rows) > count:
+                dist = np.abs(coords[rows] - gates[gate]).sum(axis=1)
+                rows = rows[np.argpartition(dist, count - 1)[:count]]
+            candidates.append(rows)
+        cand_rows = np.unique(np.concatenate(candidates))
+        cand_codes = table.type_code[cand_rows]
+        cand_xy = coords[cand_rows]
+
+        cost = np.full((len(batch), len(cand_rows)), FORBIDDEN)
+        for i, (vehicle, prefs) in enumerate(batch):
+            dist = np.abs(cand_xy - gates[vehicle.gate]).sum(axis=1)
+            for rank, slot_type in enumerate(prefs):
+                cols = cand_codes == table.slot_types.codes.get(slot_type, -1)
+                cost[i, cols] = dist[cols] + rank * self.TYPE_PENALTY
+        v_idx, c_idx = min_cost_assignment(cost)
+        bay_of = {int(i): int(table.slot_id[cand_rows[j]]) for i, j in zip(v_idx, c_idx)
+                  if cost[i, j] < FORBIDDEN}
+
+        # 3. Idle robots -> chosen vehicles by distance to the vehicle's gate
+        chosen = [i for i in range(len(batch)) if i in bay_of]
+        if not chosen:
+            return assigned
+        robot_xy = np.array([(r.x, r.y) for r in idle])
+        cost = np.stack([np.abs(robot_xy - gates[batch[i][0].gate]).sum(axis=1) for i in chosen], axis=1)
+        r_idx, b_idx = min_cost_assignment(cost)
+
+        for r, b in sorted(zip(r_idx.tolist(), b_idx.tolist()), key=lambda rb: chosen[rb[1]]):
+            robot = idle[r]
+            vehicle = batch[chosen[b]][0]
+            slot_id = bay_of[chosen[b]]
+            self._dispatch(robot, vehicle, slot_id, logs)
+            assigned.append((robot, vehicle, slot_id))
+        return assigned
+
+    def _slot_types_for(self, vehicle_type):
+        """Slot types a vehicle may use, best first (same rules as _find_best_slot)"""
+        if vehicle_type == "AMBULANCE":
+            return ["EMERGENCY"] + [t for t in SLOT_TYPE_ATTRS if t != "EMERGENCY"]
+        prefs = [vehicle_type]
+        if vehicle_type == "NORMAL" and self.traffic_mode in ("PEAK", "MANUAL"):
+            prefs.append("VIP")
+        elif vehicle_type == "VIP" and self.traffic_mode in ("EVENT", "MANUAL"):
+            prefs.append("NORMAL")
+        return prefs
+
+    def _slot_xy(self, slot_id):
+        x, y = self.layout.coords[self.slots.row(slot_id)]
+        return float(x), float(y)
+
+    def _dispatch(self, robot, vehicle, slot_id, logs=None):
+        """FSM Transition: IDLE -> MOVING_TO_SLOT (via the vehicle's gate), locking the slot"""
+        gate_x, gate_y = self.layout.gates[vehicle.gate]
+        slot_x, slot_y = self._slot_xy(slot_id)
+        trip = abs(robot.x - gate_x) + abs(robot.y - gate_y) + abs(gate_x - slot_x) + abs(gate_y - slot_y)
+        robot.distance += trip
+
+        robot.state = "MOVING_TO_SLOT"
+        robot.current_vehicle = vehicle
+        robot.target_slot = slot_id
+        robot.ticks_left = 1 if self.travel_speed is None else max(1, math.ceil(trip / self.travel_speed))
+
+        # Lock the slot
+        self.slots.set_robot(slot_id, robot.id)
+        self._sync_slot(slot_id)
+        if logs is not None:
+            logs.append(f"🤖 Robot {robot.id} picked up Vehicle {vehicle.id} ({vehicle.type}) -> Slot {slot_id}")
+
+        self.waiting_queue.discard(vehicle)
 
     def reserve_slot(self, vehicle_type, duration):
         """
         DDCO Concept: Cache Line Locking with Upfront Billing
         """
-        priority = self.encoder.get_priority(vehicle_type)
-        slot_id = self._find_best_slot(vehicle_type, priority)
+        with self._lock:
+            priority = self.encoder.get_priority(vehicle_type)
+            slot_id = self._find_best_slot(vehicle_type, priority)
         
-        if slot_id is None:
-            return "❌ Cannot Reserve: No suitable slot available."
+            if slot_id is None:
+                return "❌ Cannot Reserve: No suitable slot available."
             
-        # Calculate Upfront Cost
-        cost = self.alu.calculate_upfront_cost(vehicle_type, duration)
+            # Calculate Upfront Cost
+            cost = self.alu.calculate_upfront_cost(vehicle_type, duration)
         
-        self.slots[slot_id]['vehicle'] = "RESERVED"
-        self.slots[slot_id]['is_auto'] = False
-        self.slots[slot_id]['entry_time'] = datetime.now()
-        self.slots[slot_id]['end_time'] = datetime.now() + timedelta(hours=float(duration))
+            now = datetime.now()
+            self.slots.occupy(slot_id, "RESERVED", now, now + timedelta(hours=float(duration)))
+            self._sync_slot(slot_id)
         
-        return f"🔒 Slot {slot_id} LOCKED for {duration} hrs. 💳 Upfront Payment: ${cost} Received."
+            return f"🔒 Slot {slot_id} LOCKED for {duration} hrs. 💳 Upfront Payment: ${cost} Received."
 
     def extend_slot(self, slot_id, extra_hours):
         """
         Extends the end_time of a specific slot.
         """
-        if slot_id in self.slots and self.slots[slot_id]['end_time']:
-            self.slots[slot_id]['end_time'] += timedelta(hours=float(extra_hours))
-            return True
-        return False
+        with self._lock:
+            if slot_id in self.slots and self.slots.end_time(slot_id):
+                self.slots.extend(slot_id, float(extra_hours) * 3600)
+                self._sync_slot(slot_id)
+                return True
+            return False
 
     def process_vehicle(self, vehicle_type, duration):
-        priority = self.encoder.get_priority(vehicle_type)
-        self.state = "ALLOCATE"
+        with self._lock:
+            priority = self.encoder.get_priority(vehicle_type)
+            self.state = "ALLOCATE"
         
-        slot_id = self._find_best_slot(vehicle_type, priority)
+            slot_id = self._find_best_slot(vehicle_type, priority)
 
-        if slot_id is None:
-            self.state = "FULL"
-            return f"⛔ Parking FULL! No suitable slot for {vehicle_type}."
+            if slot_id is None:
+                self.state = "FULL"
+                return f"⛔ Parking FULL! No suitable slot for {vehicle_type}."
 
-        # Calculate Upfront Cost
-        cost = self.alu.calculate_upfront_cost(vehicle_type, duration)
+            # Calculate Upfront Cost
+            cost = self.alu.calculate_upfront_cost(vehicle_type, duration)
 
-        self.state = "GATE_OPEN"
+            self.state = "GATE_OPEN"
         
-        # Write to Register (Memory)
-        self.slots[slot_id]['vehicle'] = vehicle_type
-        self.slots[slot_id]['is_auto'] = False # Manual Entry
-        self.slots[slot_id]['entry_time'] = datetime.now()
-        self.slots[slot_id]['end_time'] = datetime.now() + timedelta(hours=float(duration))
+            # Write to Register (Memory)
+            now = datetime.now()
+            self.slots.occupy(slot_id, vehicle_type, now, now + timedelta(hours=float(duration)),
+                              is_auto=False) # Manual Entry
+            self._sync_slot(slot_id)
         
-        self.history_log.append({
-            "timestamp": datetime.now().strftime("%H:%M:%S"),
-            "type": vehicle_type,
-            "action": "ENTRY",
-            "slot": slot_id,
-            "duration": duration,
-            "cost": cost
-        })
+            self.history_log.record("ENTRY", vehicle_type, slot=slot_id, value=cost, duration=float(duration))
 
-        self.state = "IDLE"
+            self.state = "IDLE"
         
-        return f"✅ Slot {slot_id} Assigned. 💳 Bill Paid: ${cost} (for {duration} hrs)."
+            return f"✅ Slot {slot_id} Assigned. 💳 Bill Paid: ${cost} (for {duration} hrs)."
 
     def exit_vehicle(self, slot_id):
-        if slot_id not in self.slots:
-            return "Invalid Slot"
+        with self._lock:
+            if slot_id not in self.slots:
+                return "Invalid Slot"
         
-        if self.slots[slot_id]['vehicle'] is None:
-            return "Slot already empty"
+            v_type = self.slots.vehicle(slot_id)
 
-        v_type = self.slots[slot_id]['vehicle']
+            if v_type is None:
+                return "Slot already empty"
         
-        # Clear Register
-        self.slots[slot_id]['vehicle'] = None
-        self.slots[slot_id]['is_auto'] = False
-        self.slots[slot_id]['entry_time'] = None
-        self.slots[slot_id]['end_time'] = None
+            # Clear Register
+            self.slots.clear(slot_id)
+            self._sync_slot(slot_id)
         
-        self.history_log.append({
-            "timestamp": datetime.now().strftime("%H:%M:%S"),
-            "type": v_type,
-            "action": "EXIT",
-            "slot": slot_id
-        })
+            self.history_log.record("EXIT", v_type, slot=slot_id)
         
-        return f"👋 Vehicle exited Slot {slot_id}. Slot is now FREE."
+            return f"👋 Vehicle exited Slot {slot_id}. Slot is now FREE."
+
+    def release_slots(self, slot_ids):
+        """
+        Batch exit_vehicle (mass expiry): frees each occupied slot in slot_ids,
+        skipping unknown or already empty ones, and returns the IDs it freed.
+        """
+        with self._lock:
+            released = []
+            for slot_id in slot_ids:
+                if slot_id not in self.slots:
+                    continue
+                v_type = self.slots.vehicle(slot_id)
+                if v_type is None:
+                    continue
+                self.slots.clear(slot_id)
+                released.append((slot_id, v_type))
+
+            # Drop them from the expiry heap in one pass; _sync_slot then finds nothing to remove
+            self.expiry.remove_many([slot_id for slot_id, _ in released])
+            for slot_id, v_type in released:
+                self._sync_slot(slot_id)
+                self.history_log.record("EXIT", v_type, slot=slot_id)
+            return [slot_id for slot_id, _ in released]
 
     def get_status(self):
         return self.slots
+
+    def snapshot(self):
+        """(version, {slot_id: slot dict}) of the whole lot, read in one step"""
+        with self._lock:
+            return self.version, self.slots.to_dict()
+
+    def status_since(self, version):
+        """
+        Slots written after the given version. A version from the future
+        (e.g. a client that outlived a server restart) gets every slot, with full=True.
+        """
+        with self._lock:
+            current = self.version
+            if version > current:
+                return {"version": current, "full": True, "slots": self.slots.to_dict()}
+            return {"version": current, "full": False, "slots": self.slots.changed_since(version)}
@@ -1,15 +1,81 @@
-from sqlalchemy import create_engine, Column, Integer, String, Float, DateTime, Boolean, ForeignKey
+from sqlalchemy import create_engine, event, make_url, Index, Column, Integer, String, Float, DateTime, Boolean, ForeignKey
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, relationship
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from datetime import datetime
+from dotenv import load_dotenv
+import os
 
-# SQLite Database URL
-DATABASE_URL = "sqlite:///./smart_parking.db"
+from backend.migrations import run_migrations
+
+load_dotenv()
+
+# Database URL (SQLite by default)
+DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./smart_parking.db")
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL", DATABASE_URL.replace("sqlite://", "sqlite+aiosqlite://", 1))
+
+# Connection pools. The sync engine (threadpool routes, scheduler) keeps SQLAlchemy's
+# default 5 + 10 overflow. aiosqlite runs each connection on its own thread, so the async
+# engine defaults to a fixed pool rather than overflow connections opened and closed per burst.
+POOL_OPTIONS = {
+    "pool_size": int(os.getenv("DB_POOL_SIZE", "5")),
+    "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "10")),
+    "pool_timeout": float(os.getenv("DB_POOL_TIMEOUT", "30")),
+}
+ASYNC_POOL_OPTIONS = {
+    "pool_size": int(os.getenv("DB_ASYNC_POOL_SIZE", "10")),
+    "max_overflow": int(os.getenv("DB_ASYNC_MAX_OVERFLOW", "0")),
+    "pool_timeout": float(os.getenv("DB_POOL_TIMEOUT", "30")),
+}
+
+def pool_options(url, options):
+    """
+    The pool sizing for a file or server database. In-memory SQLite gets a
+    single-connection pool (SingletonThreadPool / StaticPool) that takes no sizing.
+    """
+    url = make_url(url)
+    if url.get_backend_name() == "sqlite" and (url.database in (None, "", ":memory:")
+                                               or url.query.get("mode") == "memory"):
+        return {}
+    return options
+
+# Storage profile, applied to every new SQLite connection:
+#   WAL lets readers run while a writer commits, and NORMAL syncs at checkpoints
+#   instead of on every commit (a power cut can lose the last commits, never corrupt the file)
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "cache_size": -1024 * int(os.getenv("SQLITE_CACHE_MB", "16")),  # Negative = KiB
+    "mmap_size": 1024 * 1024 * int(os.getenv("SQLITE_MMAP_MB", "128")),
+    "busy_timeout": int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000")),
+}
+
+def apply_sqlite_pragmas(engine, pragmas=SQLITE_PRAGMAS):
+    """Runs the PRAGMAs on each connection the engine's pool opens (sync engines; pass async_engine.sync_engine)"""
+    if engine.dialect.name != "sqlite":
+        return engine
+
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+    return engine
 
 # Create Engine
-engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+_connect_args = {"check_same_thread": False} if DATABASE_URL.startswith("sqlite") else {}
+engine = apply_sqlite_pragmas(create_engine(DATABASE_URL, connect_args=_connect_args,
+                                             **pool_options(DATABASE_URL, POOL_OPTIONS)))
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine for the routes that run on the event loop (same database, aiosqlite driver).
+# expire_on_commit=False: attributes stay readable after commit without an implicit (blocking) reload
+async_engine = create_async_engine(ASYNC_DATABASE_URL, **pool_options(ASYNC_DATABASE_URL, ASYNC_POOL_OPTIONS))
+apply_sqlite_pragmas(async_engine.sync_engine)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 Base = declarative_base()
 
 # --- MODELS ---
@@ -43,6 +109,14 @@ class Booking(Base):
     exit_time = Column(DateTime, nullable=True)
     billing_cost = Column(Float)
     status = Column(String, default="ACTIVE") # ACTIVE, COMPLETED, EXPIRED
+    expiry_warned_at = Column(DateTime, nullable=True) # Set when the "expires in 5 minutes" warning goes out
+    
+    # Also created on existing databases by migration 1 (backend/migrations.py)
+    __table_args__ = (
+        Index("ix_bookings_status_end_time", "status", "estimated_end_time"),
+        Index("ix_bookings_slot_user_status", "slot_id", "user_id", "status"),
+        Index("ix_bookings_user_entry_time", "user_id", "entry_time"),
+    )
     
     user = relationship("User", back_populates="bookings")
     notifications = relationship("Notification", back_populates="booking", cascade="all, delete-orphan")
@@ -58,6 +132,11 @@ class Notification(Base):
     timestamp = Column(DateTime, default=datetime.utcnow)
     is_read = Column(Boolean, default=False)
     
+    __table_args__ = (
+        Index("ix_notifications_user_read_time", "user_id", "is_read", "timestamp"),
+        Index("ix_notifications_user_time", "user_id", "timestamp"),
+    )
+    
     user = relationship("User", back_populates="notifications")
     booking = relationship("Booking", back_populates="notifications")
 
@@ -69,14 +148,20 @@ class ActivityLog(Base):
     action = Column(String)
     timestamp = Column(DateTime, default=datetime.utcnow)
     
+    __table_args__ = (
+        Index("ix_activity_logs_user_time", "user_id", "timestamp"),
+    )
+    
     user = relationship("User", back_populates="activity_logs")
 
 # --- UTILS ---
 
 def init_db():
-    """Creates all tables defined in models"""
+    """Creates all tables defined in models, then upgrades an existing database's schema"""
     Base.metadata.create_all(bind=engine)
-    print("✅ Database tables created/verified")
+    version = run_migrations(engine)
+    print(f"✅ Database tables created/verified (schema v{version})" if version is not None
+          else "✅ Database tables created/verified")
 
 def get_db():
     """Dependency for FastAPI Routes"""
@@ -85,3 +170,8 @@ def get_db():
         yield db
     finally:
         db.close()
+
+async def get_async_db():
+    """Dependency for async FastAPI Routes"""
+    async with AsyncSessionLocal() as db:
+        yield db
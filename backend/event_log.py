@@ -0,0 +1,113 @@
+"""
+Fixed-capacity event logs for ParkingLot.
+
+history_log and sim_log used to be plain lists of preformatted strings and
+dicts, so a long-running server grew them forever. EventLog keeps compact
+fixed-size records (epoch time, action code, vehicle type code, slot, vehicle,
+value, duration) in one NumPy ring buffer and only builds the display
+dict/string when an entry is read. Once the buffer is full the oldest record
+is overwritten, so memory stays flat however long the process runs.
+"""
+
+import math
+import time
+
+import numpy as np
+
+from backend.slot_store import _Interner
+
+RECORD_DTYPE = np.dtype([
+    ("time", "f8"),       # epoch seconds
+    ("action", "u1"),     # index into EventLog.actions
+    ("type", "u1"),       # interned vehicle type (0 = none, 255 = any type past the first 254)
+    ("slot", "i4"),       # -1 = none
+    ("vehicle", "i4"),    # -1 = none
+    ("value", "f8"),      # cost or priority, NaN = none
+    ("duration", "f8"),   # hours, NaN = none
+])
+
+
+class EventLog:
+    """
+    DDCO Concept: Circular Buffer (FIFO with overwrite)
+    The write pointer wraps at capacity; the buffer starts small and doubles
+    up to capacity, so lightly used lots (e.g. per-session simulations) stay cheap.
+    """
+    def __init__(self, actions, formatter, capacity=10_000, initial=64):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.actions = tuple(actions)
+        self._action_codes = {a: i for i, a in enumerate(self.actions)}
+        self.formatter = formatter  # (record, vehicle_type, action) -> display entry
+        self.capacity = capacity
+        self.types = _Interner(limit=255)
+        self._buf = np.zeros(min(initial, capacity), dtype=RECORD_DTYPE)
+        self._next = 0       # write position
+        self._count = 0
+        self.overwritten = 0  # records dropped by wrap-around
+
+    def record(self, action, v_type=None, slot=-1, vehicle=-1, value=math.nan, duration=math.nan, when=None):
+        """Appends one event, overwriting the oldest once the log is full"""
+        code = self._action_codes[action]
+        if self._count == len(self._buf) < self.capacity:
+            grown = np.zeros(min(2 * len(self._buf), self.capacity), dtype=RECORD_DTYPE)
+            grown[:self._count] = self._buf  # not wrapped yet: records sit at 0..count-1
+            self._buf = grown
+            self._next = self._count
+        self._buf[self._next] = (time.time() if when is None else when, code, self.types.code(v_type),
+                                 slot, vehicle, value, duration)
+        self._next = (self._next + 1) % len(self._buf)
+        if self._count < len(self._buf):
+            self._count += 1
+        else:
+            self.overwritten += 1
+
+    def clear(self):
+        self._next = 0
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def nbytes(self):
+        return self._buf.nbytes
+
+    def _records(self):
+        """Stored records, oldest first"""
+        if self._count < len(self._buf):
+            return self._buf[:self._count]
+        return np.concatenate((self._buf[self._next:], self._buf[:self._next]))
+
+    def _format(self, rec):
+        return self.formatter(rec, self.types.values[rec["type"]], self.actions[rec["action"]])
+
+    def __iter__(self):
+        return (self._format(rec) for rec in self._records())
+
+    def query(self, start=None, end=None, actions=None, offset=0, limit=50, newest_first=True):
+        """
+        One page of entries with start <= time < end (epoch seconds) and the
+        given actions. 'total' counts every match, not just this page.
+        """
+        records = self._records()
+        mask = np.ones(len(records), dtype=bool)
+        if start is not None:
+            mask &= records["time"] >= start
+        if end is not None:
+            mask &= records["time"] < end
+        if actions:
+            unknown = set(actions) - set(self.actions)
+            if unknown:
+                raise ValueError(f"Unknown action(s): {', '.join(sorted(unknown))}")
+            mask &= np.isin(records["action"], [self._action_codes[a] for a in actions])
+
+        matches = np.flatnonzero(mask)
+        if newest_first:
+            matches = matches[::-1]
+        page = matches[offset:offset + limit]
+        return {
+            "total": int(len(matches)),
+            "offset": offset,
+            "limit": limit,
+            "items": [self._format(records[i]) for i in page],
+        }
@@ -0,0 +1,201 @@
+"""
+Discrete-event simulator for the robot parking model.
+
+Unlike ParkingLot.simulation_step (a fixed clock where every FSM transition
+takes one tick), time here jumps straight from one event to the next:
+vehicle arrivals, robot arrival at a slot, parking complete, robot back at
+base, departures at end_time and drivers giving up. A simulated week of
+traffic runs in seconds, which makes it the tool for capacity planning.
+
+The lot's own pieces are reused: Vehicle / Robot, the PriorityEncoder-ordered
+waiting queue, _find_best_slot (via ParkingLot._assign_waiting) and BillingALU.
+"""
+
+import heapq
+import math
+import random
+import time
+from datetime import datetime, timedelta
+
+from backend.controller import ParkingLot
+
+# Event kinds (ordered so simultaneous events resolve departures first)
+DEPARTURE = 0
+PARK_DONE = 1
+ROBOT_AT_SLOT = 2
+ROBOT_BACK = 3
+ABANDON = 4
+ARRIVAL = 5
+
+# Default arrival patterns per traffic mode: vehicles per hour and type mix
+ARRIVALS_PER_HOUR = {"MANUAL": 0.0, "PEAK": 12.0, "EVENT": 9.0}
+TYPE_MIX = {
+    "MANUAL": {"NORMAL": 1.0},
+    "PEAK": {"NORMAL": 1.0},
+    "EVENT": {"VIP": 0.7, "NORMAL": 0.3},  # 70% VIP on event days
+}
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list (None if empty)"""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class EventSimulator:
+    """
+    DDCO Concept: Event-Driven Scheduler (Interrupt-Driven I/O)
+    Priority queue of timestamped events; the clock jumps to the next event.
+    All times are simulated seconds from the start of the run.
+    """
+    def __init__(self, lot=None, traffic_mode="PEAK", arrivals_per_hour=None, type_mix=None,
+                 duration_hours=(1.0, 4.0), travel_seconds=45.0, park_seconds=30.0,
+                 patience_seconds=1800.0, seed=None):
+        self.lot = lot if lot is not None else ParkingLot()
+        self.lot.traffic_mode = traffic_mode
+        self.arrivals_per_hour = ARRIVALS_PER_HOUR[traffic_mode] if arrivals_per_hour is None else arrivals_per_hour
+        self.type_mix = type_mix or TYPE_MIX[traffic_mode]
+        self.duration_hours = duration_hours
+        # travel_seconds: a number, or a callable(slot_id) -> seconds from base to that slot
+        self.travel_seconds = travel_seconds
+        self.park_seconds = park_seconds
+        self.patience_seconds = patience_seconds  # Drivers leave the queue after this wait
+        self.rng = random.Random(seed)
+
+        self._types = list(self.type_mix)
+        self._type_weights = list(self.type_mix.values())
+        self._events = []
+        self._seq = 0
+        self.now = 0.0
+        self.start_time = datetime.now()
+        self._busy_since = {}  # robot id -> time it was dispatched
+
+    # --- Event queue ---
+
+    def _schedule(self, at, kind, payload=None):
+        self._seq += 1
+        heapq.heappush(self._events, (at, kind, self._seq, payload))
+
+    def _travel(self, slot_id):
+        travel = self.travel_seconds
+        return travel(slot_id) if callable(travel) else travel
+
+    def _next_arrival(self):
+        if self.arrivals_per_hour > 0:
+            self._schedule(self.now + self.rng.expovariate(self.arrivals_per_hour / 3600.0), ARRIVAL)
+
+    # --- Main loop ---
+
+    def run(self, hours):
+        """Simulates the given number of hours and returns aggregate results"""
+        lot = self.lot
+        horizon = self.now + hours * 3600.0
+        robots = lot.robots
+        robot_busy = {r.id: 0.0 for r in robots}
+        busy_since = self._busy_since
+        span = hours * 3600.0
+        waits = []
+        arrivals = parked = abandoned = departures = events = 0
+        revenue = 0.0
+        queue_area = 0.0  # time-integral of queue length
+        occupied_area = 0.0  # time-integral of occupied slots
+        occupied = lot.total_slots - lot.slots.free_count()
+        start_rejected = lot.rejected_count
+        last = self.now
+
+        if not self._events:
+            self._next_arrival()  # First run: prime the arrival stream
+        started = time.perf_counter()
+
+        while self._events and self._events[0][0] <= horizon:
+            at, kind, _, payload = heapq.heappop(self._events)
+            queue_area += len(lot.waiting_queue) * (at - last)
+            occupied_area += occupied * (at - last)
+            last = self.now = at
+            events += 1
+
+            if kind == ARRIVAL:
+                arrivals += 1
+                v_type = self.rng.choices(self._types, self._type_weights)[0]
+                duration = round(self.rng.uniform(*self.duration_hours), 1)
+                vehicle = lot._enqueue(v_type, duration)
+                if vehicle is not None:
+                    vehicle.arrived_at = at
+                    if self.patience_seconds is not None:
+                        self._schedule(at + self.patience_seconds, ABANDON, vehicle)
+                self._next_arrival()
+
+            elif kind == ABANDON:
+                if payload in lot.waiting_queue:
+                    lot.waiting_queue.discard(payload)
+                    abandoned += 1
+
+            elif kind == ROBOT_AT_SLOT:
+                payload.state = "PARKING"
+                self._schedule(at + self.park_seconds, PARK_DONE, payload)
+
+            elif kind == PARK_DONE:
+                robot = payload
+                vehicle, slot_id = robot.current_vehicle, robot.target_slot
+                entry = self.start_time + timedelta(seconds=at)
+                lot.slots.occupy(slot_id, vehicle.type, entry, entry + timedelta(hours=vehicle.duration), is_auto=True)
+                lot.slots.set_robot(slot_id, None)
+                lot._sync_slot(slot_id)
+                lot.parked_count += 1
+                robot.parked_count += 1
+                parked += 1
+                occupied += 1
+                revenue += lot.alu.calculate_upfront_cost(vehicle.type, vehicle.duration)
+                self._schedule(at + vehicle.duration * 3600.0, DEPARTURE, slot_id)
+
+                robot.state = "RETURNING"
+                robot.current_vehicle = None
+                self._schedule(at + self._travel(slot_id), ROBOT_BACK, robot)
+                robot.target_slot = None
+
+            elif kind == ROBOT_BACK:
+                payload.state = "IDLE"
+                robot_busy[payload.id] += at - busy_since.pop(payload.id)
+
+            elif kind == DEPARTURE:
+                lot.slots.clear(payload)
+                lot._sync_slot(payload)
+                departures += 1
+                occupied -= 1
+
+            # Any event may have freed a robot, a slot or added a vehicle
+            for robot, vehicle, slot_id in lot._assign_waiting():
+                waits.append(at - vehicle.arrived_at)
+                vehicle.assigned_slot = slot_id
+                busy_since[robot.id] = at
+                self._schedule(at + self._travel(slot_id), ROBOT_AT_SLOT, robot)
+
+        elapsed = time.perf_counter() - started
+        queue_area += len(lot.waiting_queue) * (horizon - last)
+        occupied_area += occupied * (horizon - last)
+        for robot_id, since in busy_since.items():  # still out at the horizon
+            robot_busy[robot_id] += horizon - since
+            busy_since[robot_id] = horizon
+        self.now = horizon
+
+        waits.sort()
+        return {
+            "hours": hours,
+            "arrivals": arrivals,
+            "parked": parked,
+            "departures": departures,
+            "rejected": lot.rejected_count - start_rejected,
+            "abandoned": abandoned,
+            "still_waiting": len(lot.waiting_queue),
+            "revenue": round(revenue, 2),
+            "wait_p50_s": percentile(waits, 50),
+            "wait_p90_s": percentile(waits, 90),
+            "wait_p99_s": percentile(waits, 99),
+            "mean_queue_length": round(queue_area / span, 3) if span else 0.0,
+            "mean_occupancy": round(occupied_area / (span * lot.total_slots), 4) if span else 0.0,
+            "robot_utilisation": round(sum(robot_busy.values()) / (span * len(robots)), 4) if span and robots else 0.0,
+            "events": events,
+            "elapsed_seconds": round(elapsed, 3),
+        }
@@ -0,0 +1,146 @@
+"""
+Parking lot layout: slot IDs, types and attributes.
+
+A layout is either generated from a type-mix spec or loaded from a JSON file,
+then turned into the ParkingLot register file. Type indexes are built once at
+load time so the allocator never has to derive them again.
+
+Every bay sits on a grid (x, y in bay widths) and vehicles are handed over
+to the robots at one or more gates, so robot travel can be measured.
+
+Layout file formats (JSON):
+    {"slots": [{"id": 1, "type": "VIP", "attr": "Near Entrance", "x": 0, "y": 0}, ...],
+     "gates": [{"x": 0, "y": -1}]}
+    {"total_slots": 5000, "type_mix": {"VIP": 2, "EV": 2, "NORMAL": 5, ...}, "bays_per_row": 50}
+
+Slots without coordinates are placed row by row; "gates" defaults to one gate
+in front of the first bay.
+"""
+
+import json
+import math
+import numbers
+
+import numpy as np
+
+# Slot types understood by the allocator, with their default attribute label
+SLOT_TYPE_ATTRS = {
+    "VIP": "Near Entrance",
+    "EV": "Charging Station",
+    "SENIOR": "Wide Space",
+    "NORMAL": "Standard",
+    "EMERGENCY": "Exit Ramp",
+}
+
+# Default mix (relative weights, in bay order) - reproduces the classic 12-slot lot
+DEFAULT_TYPE_MIX = {
+    "VIP": 2,
+    "EV": 2,
+    "SENIOR": 2,
+    "NORMAL": 5,
+    "EMERGENCY": 1,
+}
+
+
+class SlotLayout:
+    """
+    DDCO Concept: Memory Map
+    Describes which address (slot ID) holds which kind of register (slot type).
+    """
+    def __init__(self, slots, gates=None, bays_per_row=None):
+        if not slots:
+            raise ValueError("Layout must contain at least one slot")
+
+        self.slots = []
+        self.type_index = {}  # slot type -> sorted list of slot IDs
+        seen = set()
+
+        for s in slots:
+            slot_id = s.get("id")
+            slot_type = s.get("type")
+            if not isinstance(slot_id, int) or isinstance(slot_id, bool) or slot_id < 1:
+                raise ValueError(f"Invalid slot ID in layout: {slot_id!r}")
+            if slot_id in seen:
+                raise ValueError(f"Duplicate slot ID in layout: {slot_id}")
+            if slot_type not in SLOT_TYPE_ATTRS:
+                raise ValueError(f"Unknown slot type in layout: {slot_type!r}")
+            seen.add(slot_id)
+
+            attr = s.get("attr") or SLOT_TYPE_ATTRS[slot_type]
+            self.slots.append({"id": slot_id, "type": slot_type, "attr": attr, "x": s.get("x"), "y": s.get("y")})
+            self.type_index.setdefault(slot_type, []).append(slot_id)
+
+        self.slots.sort(key=lambda s: s["id"])
+        for ids in self.type_index.values():
+            ids.sort()
+
+        self.min_id = self.slots[0]["id"]
+        self.max_id = self.slots[-1]["id"]
+        self._ids = frozenset(seen)
+
+        # Grid positions: bays without explicit coordinates fill rows in ID order
+        self.bays_per_row = int(bays_per_row or math.ceil(math.sqrt(len(self.slots))))
+        for i, s in enumerate(self.slots):
+            if s["x"] is None or s["y"] is None:
+                s["x"], s["y"] = i % self.bays_per_row, i // self.bays_per_row
+        # Row-aligned with SlotTable: coords[row] = (x, y) of the row's slot
+        self.coords = np.array([(s["x"], s["y"]) for s in self.slots], dtype=np.float64)
+
+        gates = gates or [{"x": 0, "y": -1}]
+        try:
+            self.gates = np.array([(g["x"], g["y"]) for g in gates], dtype=np.float64)
+        except (KeyError, TypeError):
+            raise ValueError("Each gate needs numeric 'x' and 'y'") from None
+
+    @classmethod
+    def generate(cls, total_slots=12, type_mix=None, bays_per_row=None, gates=None):
+        """
+        Builds a layout of total_slots bays split by type_mix weights.
+        Types are laid out in contiguous blocks in mix order, starting at ID 1.
+        """
+        type_mix = type_mix or DEFAULT_TYPE_MIX
+        total_slots = int(total_slots)
+        if total_slots < 1:
+            raise ValueError("total_slots must be >= 1")
+
+        for slot_type, weight in type_mix.items():
+            if isinstance(weight, bool) or not isinstance(weight, numbers.Real) or not weight >= 0:
+                raise ValueError(f"type_mix weight for {slot_type!r} must be a number >= 0, got {weight!r}")
+        weight_sum = sum(type_mix.values())
+        if not weight_sum > 0:
+            raise ValueError("type_mix weights must add up to more than 0")
+
+        # Largest-remainder apportionment so the counts add up exactly
+        shares = {t: total_slots * w / weight_sum for t, w in type_mix.items()}
+        counts = {t: int(share) for t, share in shares.items()}
+        leftover = total_slots - sum(counts.values())
+        by_remainder = sorted(type_mix, key=lambda t: shares[t] - counts[t], reverse=True)
+        for t in by_remainder[:leftover]:
+            counts[t] += 1
+
+        slots = []
+        next_id = 1
+        for slot_type in type_mix:
+            for _ in range(counts[slot_type]):
+                slots.append({"id": next_id, "type": slot_type})
+                next_id += 1
+        return cls(slots, gates, bays_per_row)
+
+    @classmethod
+    def from_dict(cls, data):
+        if "slots" in data:
+            return cls(data["slots"], data.get("gates"), data.get("bays_per_row"))
+        if "total_slots" in data:
+            return cls.generate(data["total_slots"], data.get("type_mix"), data.get("bays_per_row"), data.get("gates"))
+        raise ValueError("Layout needs either 'slots' or 'total_slots'")
+
+    @classmethod
+    def from_file(cls, path):
+        with open(path, "r", encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
+
+    def has_slot(self, slot_id):
+        return slot_id in self._ids
+
+    def __len__(self):
+        return len(self.slots)
@@ -0,0 +1,81 @@
+"""
+Versioned schema migrations, applied at startup by init_db().
+
+create_all() only creates tables that are missing, so a deployed
+smart_parking.db never picks up an index (or column) added to the models
+later. Each migration here is numbered; SQLite records the last one a
+database has run in PRAGMA user_version, and run_migrations() applies the
+newer ones in order. Steps are idempotent (IF NOT EXISTS, add_column), so a
+fresh database, whose tables create_all() has just built from the current
+models, simply fast-forwards to the latest version.
+
+To change the schema: update the model, then append a migration with the
+next number that brings an existing database to the same shape.
+"""
+
+from sqlalchemy import text
+
+
+def add_column(table, column, ddl_type):
+    """Migration step: ALTER TABLE ... ADD COLUMN, unless the table already has it"""
+    def step(conn):
+        columns = {row[1] for row in conn.exec_driver_sql(f"PRAGMA table_info({table})")}
+        if column not in columns:
+            conn.exec_driver_sql(f"ALTER TABLE {table} ADD COLUMN {column} {ddl_type}")
+    return step
+
+
+MIGRATIONS = [
+    (1, "Composite indexes for the scheduler, exit, notification and activity queries", [
+        # Scheduler: ACTIVE bookings ending before a time
+        "CREATE INDEX IF NOT EXISTS ix_bookings_status_end_time ON bookings (status, estimated_end_time)",
+        # /api/exit: the user's ACTIVE booking on a slot
+        "CREATE INDEX IF NOT EXISTS ix_bookings_slot_user_status ON bookings (slot_id, user_id, status)",
+        # /user/bookings, dashboard: a user's bookings, newest first
+        "CREATE INDEX IF NOT EXISTS ix_bookings_user_entry_time ON bookings (user_id, entry_time)",
+        # /user/notifications/unread: a user's unread notifications by time
+        "CREATE INDEX IF NOT EXISTS ix_notifications_user_read_time ON notifications (user_id, is_read, timestamp)",
+        # /user/notifications: a user's latest notifications
+        "CREATE INDEX IF NOT EXISTS ix_notifications_user_time ON notifications (user_id, timestamp)",
+        # /user/activity: a user's latest activity
+        "CREATE INDEX IF NOT EXISTS ix_activity_logs_user_time ON activity_logs (user_id, timestamp)",
+    ]),
+    (2, "Track expiry warnings on the booking (bookings.expiry_warned_at)", [
+        add_column("bookings", "expiry_warned_at", "DATETIME"),
+        # Bookings already warned through a notification must not be warned again
+        """UPDATE bookings SET expiry_warned_at = (
+               SELECT MIN(n.timestamp) FROM notifications n
+               WHERE n.booking_id = bookings.booking_id AND n.type = 'WARNING' AND n.message LIKE '%expires in%')
+           WHERE status = 'ACTIVE' AND expiry_warned_at IS NULL""",
+    ]),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def schema_version(conn):
+    return conn.exec_driver_sql("PRAGMA user_version").scalar()
+
+
+def run_migrations(engine):
+    """Brings the database up to LATEST_VERSION; returns the version it is at"""
+    if engine.dialect.name != "sqlite":
+        print(f"⚠️ Schema migrations track versions with PRAGMA user_version (SQLite only); "
+              f"skipped for {engine.dialect.name}")
+        return None
+
+    with engine.connect() as conn:
+        current = schema_version(conn)
+        for version, description, steps in MIGRATIONS:
+            if version <= current:
+                continue
+            for step in steps:
+                if callable(step):
+                    step(conn)
+                else:
+                    conn.execute(text(step))
+            conn.exec_driver_sql(f"PRAGMA user_version = {version}")
+            conn.commit()
+            print(f"🔧 Schema migration {version}: {description}")
+            current = version
+    return current
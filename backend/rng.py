@@ -0,0 +1,68 @@
+"""
+Counter-based random numbers shared by the scalar and batched simulators.
+
+SplitMix64 keeps its whole state in one 64-bit counter, so thousands of
+independent streams fit in a single NumPy uint64 array and advance together.
+The scalar class below produces bit-identical values for the same seed, which
+is what lets BatchSimulator reproduce ParkingLot runs exactly.
+"""
+
+import os
+import random
+
+import numpy as np
+
+MASK64 = (1 << 64) - 1
+GAMMA = 0x9E3779B97F4A7C15
+MIX1 = 0xBF58476D1CE4E5B9
+MIX2 = 0x94D049BB133111EB
+TO_UNIT = 1.0 / (1 << 53)  # 53 random bits -> float in [0, 1)
+
+
+class SplitMix64(random.Random):
+    """
+    Drop-in random.Random whose random() is SplitMix64. Everything built on
+    random() (uniform, choices, expovariate ...) works unchanged.
+    """
+    def seed(self, a=None, version=2):
+        if a is None:
+            a = int.from_bytes(os.urandom(8), "little")
+        self._state = int(a) & MASK64
+
+    def random(self):
+        self._state = (self._state + GAMMA) & MASK64
+        z = self._state
+        z = ((z ^ (z >> 30)) * MIX1) & MASK64
+        z = ((z ^ (z >> 27)) * MIX2) & MASK64
+        z ^= z >> 31
+        return (z >> 11) * TO_UNIT
+
+    def getstate(self):
+        return self._state
+
+    def setstate(self, state):
+        self._state = state
+
+
+_GAMMA = np.uint64(GAMMA)
+_MIX1 = np.uint64(MIX1)
+_MIX2 = np.uint64(MIX2)
+_S11, _S27, _S30, _S31 = (np.uint64(s) for s in (11, 27, 30, 31))
+
+
+def splitmix64_seed(seeds):
+    """State array for many streams (one per seed)"""
+    return np.array([int(s) & MASK64 for s in seeds], dtype=np.uint64)
+
+
+def splitmix64_draw(states, idx):
+    """
+    Advances the streams at positions idx by one step and returns their
+    floats in [0, 1) - the same values SplitMix64.random() would give.
+    """
+    z = states[idx] + _GAMMA
+    states[idx] = z
+    z = (z ^ (z >> _S30)) * _MIX1
+    z = (z ^ (z >> _S27)) * _MIX2
+    z ^= z >> _S31
+    return (z >> _S11).astype(np.float64) * TO_UNIT
@@ -1,38 +1,58 @@
+import os
 from apscheduler.schedulers.background import BackgroundScheduler
 from datetime import datetime, timedelta
+from sqlalchemy import select, insert, update
 from backend.database import SessionLocal, Booking, Notification, ActivityLog
 
 scheduler = BackgroundScheduler()
 _parking = None
 
+# The lot's expiry heap tells us which slots have run over since the last run,
+# so most runs touch only those bookings, or skip the database entirely. A
+# periodic full sweep still catches bookings the in-memory lot does not hold
+# (e.g. made before a restart) and any the heap check missed.
+FULL_SWEEP_INTERVAL = timedelta(seconds=int(os.getenv("EXPIRY_FULL_SWEEP_SECONDS", "300")))
+# Heap checks look this far behind the previous check, so a slot that ran over
+# while the previous run was in progress is not lost until the next full sweep
+RECHECK_WINDOW = timedelta(minutes=1)
+_last_full_sweep = None
+_last_heap_check = None
+
+# IDs per UPDATE ... IN (...) (well under SQLite's bound-parameter limit)
+IN_CHUNK = 500
+
 def _check_expiring_soon():
     """Send warning notifications for bookings expiring in 5 minutes"""
     session = SessionLocal()
     now = datetime.utcnow()
     try:
-        soon_expiring = session.query(Booking).filter(
+        # One indexed range query (status, estimated_end_time); bookings already
+        # warned carry expiry_warned_at, so each is picked up exactly once
+        due = session.execute(select(Booking.booking_id, Booking.user_id, Booking.slot_id).where(
             Booking.status == "ACTIVE",
+            Booking.expiry_warned_at.is_(None),
             Booking.estimated_end_time <= now + timedelta(minutes=5),
             Booking.estimated_end_time > now
-        ).all()
+        )).all()
+        if not due:
+            return
+        
+        session.execute(insert(Notification.__table__), [{
+            "user_id": booking.user_id,
+            "booking_id": booking.booking_id,
+            "message": f"⚠️ Your parking slot {booking.slot_id} expires in 5 minutes!",
+            "type": "WARNING",
+            "timestamp": now
+        } for booking in due])
         
-        for booking in soon_expiring:
-            existing = session.query(Notification).filter(
-                Notification.booking_id == booking.booking_id,
-                Notification.type == "WARNING",
-                Notification.message.like("%expires in%")
-            ).first()
-            
-            if not existing:
-                session.add(Notification(
-                    user_id=booking.user_id,
-                    booking_id=booking.booking_id,
-                    message=f"⚠️ Your parking slot {booking.slot_id} expires in 5 minutes!",
-                    type="WARNING"
-                ))
-                print(f"⏰ Warning sent for Slot {booking.slot_id}")
+        booking_ids = [booking.booking_id for booking in due]
+        for start in range(0, len(booking_ids), IN_CHUNK):
+            session.execute(update(Booking.__table__).where(
+                Booking.booking_id.in_(booking_ids[start:start + IN_CHUNK])
+            ).values(expiry_warned_at=now))
         
         session.commit()
+        print(f"⏰ Warning sent for {len(due)} booking(s)")
     except Exception as e:
         session.rollback()
         print(f"❌ Expiring soon check error: {e}")
@@ -41,44 +61,84 @@ def _check_expiring_soon():
 
 def _expire_bookings():
     """Auto-expire bookings and free slots"""
-    global _parking
-    session = SessionLocal()
+    global _parking, _last_full_sweep, _last_heap_check
     now = datetime.utcnow()
+    lot_now = datetime.now()  # The lot keeps end times in local time
+    
+    full_sweep = _parking is None or _last_full_sweep is None or now - _last_full_sweep >= FULL_SWEEP_INTERVAL
+    due_slots = None
+    if not full_sweep:
+        # Only slots that ran over since the previous check: slots that stay
+        # occupied long after (form-route stays with no booking) are not re-queried
+        after = _last_heap_check - RECHECK_WINDOW if _last_heap_check else None
+        due_slots = _parking.expired_slots(lot_now, after=after)
+        if not due_slots:
+            _last_heap_check = lot_now
+            return  # Nothing in the lot has run past its end time
+    
+    session = SessionLocal()
     try:
-        expired = session.query(Booking).filter(
-            Booking.status == "ACTIVE",
-            Booking.estimated_end_time <= now
-        ).all()
-        
-        for booking in expired:
-            booking.status = "EXPIRED"
-            booking.exit_time = now
-            
-            session.add(Notification(
-                user_id=booking.user_id,
-                booking_id=booking.booking_id,
-                message=f"⏰ Your parking time for Slot {booking.slot_id} has expired.",
-                type="ALERT"
-            ))
-            
-            session.add(ActivityLog(
-                user_id=booking.user_id,
-                action=f"Booking expired for Slot {booking.slot_id}",
-                timestamp=now
-            ))
-            
-            if _parking:
-                _parking.exit_vehicle(booking.slot_id)
-            
-            print(f"🚫 Expired: Slot {booking.slot_id} for User {booking.user_id}")
+        expired = _claim_expired(session, now, due_slots)
+        if expired:
+            session.execute(insert(Notification.__table__), [{
+                "user_id": booking.user_id,
+                "booking_id": booking.booking_id,
+                "message": f"⏰ Your parking time for Slot {booking.slot_id} has expired.",
+                "type": "ALERT",
+                "timestamp": now
+            } for booking in expired])
+            session.execute(insert(ActivityLog.__table__), [{
+                "user_id": booking.user_id,
+                "action": f"Booking expired for Slot {booking.slot_id}",
+                "timestamp": now
+            } for booking in expired])
         
         session.commit()
+        if expired:
+            if _parking:
+                _parking.release_slots([booking.slot_id for booking in expired])
+            print(f"🚫 Expired {len(expired)} booking(s)")
+        if full_sweep:
+            _last_full_sweep = now
+        _last_heap_check = lot_now
     except Exception as e:
         session.rollback()
         print(f"❌ Expiry job error: {e}")
     finally:
         session.close()
 
+def _claim_expired(session, now, due_slots=None):
+    """
+    Marks every ACTIVE booking past its end time (on due_slots, if given) as
+    EXPIRED in bulk and returns their (booking_id, user_id, slot_id) rows.
+    Uses UPDATE ... RETURNING where the database supports it, otherwise a
+    SELECT followed by chunked UPDATEs by ID.
+    """
+    # Core statements: no ORM objects or per-row bookkeeping
+    bookings = Booking.__table__
+    columns = (bookings.c.booking_id, bookings.c.user_id, bookings.c.slot_id)
+    conditions = [bookings.c.status == "ACTIVE", bookings.c.estimated_end_time <= now]
+    if due_slots is None:
+        batches = [conditions]
+    else:
+        batches = [conditions + [bookings.c.slot_id.in_(due_slots[start:start + IN_CHUNK])]
+                   for start in range(0, len(due_slots), IN_CHUNK)]
+    
+    expired = []
+    for where in batches:
+        if session.get_bind().dialect.update_returning:
+            expired += session.execute(
+                update(bookings).where(*where).values(status="EXPIRED", exit_time=now).returning(*columns)
+            ).all()
+        else:
+            rows = session.execute(select(*columns).where(*where)).all()
+            for start in range(0, len(rows), IN_CHUNK):
+                session.execute(update(bookings).where(
+                    bookings.c.booking_id.in_([row.booking_id for row in rows[start:start + IN_CHUNK]])
+                ).values(status="EXPIRED", exit_time=now))
+            expired += rows
+    return expired
+
 def start_scheduler(parking):
     global _parking
     _parking = parking
@@ -0,0 +1,131 @@
+"""
+Per-session simulation instances.
+
+Every browser session gets its own ParkingLot for the robot simulation, so
+one user's queue, robots and counters never leak into another's (or into the
+live lot). Instances are kept in an LRU-ordered pool bounded by count and by
+estimated memory, and sessions idle for too long are dropped.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+
+class _PoolEntry:
+    __slots__ = ("lot", "lock", "created", "last_used", "nbytes")
+
+    def __init__(self, lot, now):
+        self.lot = lot
+        self.lock = threading.Lock()  # One request at a time per session
+        self.created = now
+        self.last_used = now
+        self.nbytes = lot.approx_nbytes()
+
+
+class SimulationPool:
+    """
+    DDCO Concept: Cache with LRU Replacement
+    Session ID -> simulation lot. Hits move the line to the MRU end; the LRU
+    end is evicted when the pool is over its instance or memory budget.
+    """
+    def __init__(self, factory, max_instances=200, max_bytes=64 * 1024 * 1024, idle_timeout=1800.0,
+                 clock=time.monotonic):
+        self.factory = factory  # () -> fresh ParkingLot
+        self.max_instances = max_instances
+        self.max_bytes = max_bytes
+        self.idle_timeout = idle_timeout
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evicted_lru = 0
+        self.evicted_idle = 0
+
+    @contextmanager
+    def session(self, session_id):
+        """Yields the session's lot (created on first use) for the duration of one request"""
+        entry = self._checkout(session_id)
+        with entry.lock:
+            try:
+                yield entry.lot
+            finally:
+                self._measure(session_id, entry)
+
+    def _checkout(self, session_id):
+        now = self._clock()
+        with self._lock:
+            self._expire_idle(now)
+            entry = self._entries.get(session_id)
+            if entry is None:
+                self.misses += 1
+                entry = _PoolEntry(self.factory(), now)
+                self._entries[session_id] = entry
+                self._bytes += entry.nbytes
+                self._evict(keep=session_id)
+            else:
+                self.hits += 1
+                self._entries.move_to_end(session_id)
+            entry.last_used = now
+            return entry
+
+    def _measure(self, session_id, entry):
+        nbytes = entry.lot.approx_nbytes()
+        with self._lock:
+            if self._entries.get(session_id) is entry:
+                self._bytes += nbytes - entry.nbytes
+                entry.nbytes = nbytes
+                self._evict(keep=session_id)
+
+    def _evict(self, keep=None):
+        """Drops least recently used sessions until the pool fits its budget (caller holds the lock)"""
+        while len(self._entries) > 1 and (len(self._entries) > self.max_instances or self._bytes > self.max_bytes):
+            session_id = next(iter(self._entries))
+            if session_id == keep:
+                break
+            self._bytes -= self._entries.pop(session_id).nbytes
+            self.evicted_lru += 1
+
+    def _expire_idle(self, now):
+        if self.idle_timeout is None:
+            return
+        # LRU order is also last-use order, so idle sessions sit at the front
+        while self._entries:
+            session_id, entry = next(iter(self._entries.items()))
+            if now - entry.last_used < self.idle_timeout:
+                break
+            del self._entries[session_id]
+            self._bytes -= entry.nbytes
+            self.evicted_idle += 1
+
+    def discard(self, session_id):
+        with self._lock:
+            entry = self._entries.pop(session_id, None)
+            if entry is not None:
+                self._bytes -= entry.nbytes
+            return entry is not None
+
+    def __contains__(self, session_id):
+        return session_id in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    def metrics(self):
+        with self._lock:
+            self._expire_idle(self._clock())
+            return {
+                "instances": len(self._entries),
+                "max_instances": self.max_instances,
+                "memory_bytes": self._bytes,
+                "max_memory_bytes": self.max_bytes,
+                "idle_timeout_seconds": self.idle_timeout,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evicted_lru": self.evicted_lru,
+                "evicted_idle": self.evicted_idle,
+            }
@@ -0,0 +1,92 @@
+"""
+Request coalescing for read endpoints.
+
+When hundreds of dashboards refresh at once, each would run the same
+computation (prediction, status delta, page render) on the same lot state.
+SingleFlight lets the first caller for a key compute while concurrent callers
+with that key wait for its result, and keeps the result for a short window
+so callers arriving just after it finished reuse it too.
+"""
+
+import threading
+import time
+
+
+class _Call:
+    __slots__ = ("done", "result", "error", "finished_at")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.finished_at = None
+
+
+class SingleFlight:
+    """
+    DDCO Concept: Miss Status Holding Register (MSHR)
+    Outstanding misses to the same line are merged into one memory request;
+    later requests for that line wait on the MSHR instead of issuing their own.
+    """
+    def __init__(self, ttl=1.0, clock=time.monotonic):
+        self.ttl = ttl  # Seconds a finished result is reused for
+        self._clock = clock
+        self._calls = {}
+        self._lock = threading.Lock()
+
+        self.hits = 0     # Served from a finished result still inside the window
+        self.shared = 0   # Waited on a computation already in flight
+        self.misses = 0   # Ran the computation
+
+    def do(self, key, fn):
+        """fn() once per key at a time; its result (or exception) goes to every concurrent caller"""
+        with self._lock:
+            now = self._clock()
+            call = self._calls.get(key)
+            if call is not None and call.finished_at is None:
+                self.shared += 1
+                leader = False
+            elif call is not None and now - call.finished_at < self.ttl:
+                self.hits += 1
+                return call.result
+            else:
+                self.misses += 1
+                self._expire(now)
+                call = self._calls[key] = _Call()
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as exc:
+            call.error = exc
+            with self._lock:
+                self._calls.pop(key, None)  # Failures are shared, never reused
+            raise
+        finally:
+            call.finished_at = self._clock()
+            call.done.set()
+        return call.result
+
+    def _expire(self, now):
+        """Drops finished results outside the window (caller holds the lock)"""
+        stale = [key for key, call in self._calls.items()
+                 if call.finished_at is not None and now - call.finished_at >= self.ttl]
+        for key in stale:
+            del self._calls[key]
+
+    def metrics(self):
+        with self._lock:
+            in_flight = sum(1 for call in self._calls.values() if call.finished_at is None)
+        return {
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "shared": self.shared,
+            "misses": self.misses,
+            "in_flight": in_flight,
+        }
@@ -0,0 +1,245 @@
+"""
+Columnar slot store for ParkingLot.
+
+Each slot field lives in its own typed NumPy column (small-int codes for
+strings, epoch seconds for timestamps) instead of one Python dict per bay.
+SlotTable / SlotView expose the old dict-of-dicts shape on top of the columns,
+so get_status(), the predictor and the Jinja templates keep working, while
+whole-lot scans can run vectorized over the columns.
+"""
+
+import math
+from collections.abc import Mapping
+from datetime import datetime
+
+import numpy as np
+
+NO_ROBOT = -1  # robot_id column value when no robot is assigned
+
+# Keys exposed by every slot view (same order as the old slot dicts)
+SLOT_FIELDS = ("id", "type", "vehicle", "attr", "entry_time", "end_time", "robot_assigned", "is_auto")
+
+
+class _Interner:
+    """
+    Maps strings to small-int codes and back. Code 0 is reserved for None.
+    With a limit, codes below it go to values as they first appear and every
+    later new value shares one overflow code (= limit), so the codes fit a
+    fixed-width column however many distinct strings arrive.
+    """
+    def __init__(self, limit=None, overflow="OTHER"):
+        self.values = [None]
+        self.codes = {None: 0}
+        self.limit = limit
+        self.overflow = overflow
+
+    def code(self, value):
+        code = self.codes.get(value)
+        if code is None:
+            if self.limit is not None and len(self.values) >= self.limit and value != self.overflow:
+                return self.code(self.overflow)
+            code = len(self.values)
+            self.values.append(value)
+            self.codes[value] = code
+        return code
+
+
+def _to_ts(value):
+    return math.nan if value is None else value.timestamp()
+
+def _to_dt(ts):
+    return None if ts != ts else datetime.fromtimestamp(ts)  # NaN check
+
+
+class SlotTable(Mapping):
+    """
+    DDCO Concept: Register File (Column-Major)
+    Parallel typed arrays, one row per slot. Reads through the Mapping API
+    return SlotView rows; mutations go through the typed setters below.
+    """
+    def __init__(self, layout):
+        n = len(layout)
+        self.slot_types = _Interner()
+        self.attrs = _Interner()
+        self.vehicles = _Interner()
+
+        self.slot_id = np.fromiter((s["id"] for s in layout.slots), dtype=np.int32, count=n)
+        self.type_code = np.fromiter((self.slot_types.code(s["type"]) for s in layout.slots), dtype=np.int8, count=n)
+        self.attr_code = np.fromiter((self.attrs.code(s["attr"]) for s in layout.slots), dtype=np.int16, count=n)
+        self.vehicle_code = np.zeros(n, dtype=np.int16)      # 0 = empty
+        self.entry_ts = np.full(n, np.nan, dtype=np.float64)  # epoch seconds, NaN = None
+        self.end_ts = np.full(n, np.nan, dtype=np.float64)
+        self.robot_id = np.full(n, NO_ROBOT, dtype=np.int16)
+        self.is_auto = np.zeros(n, dtype=np.bool_)
+        self.slot_version = np.zeros(n, dtype=np.int64)      # Lot version of the last write (see ParkingLot.version)
+
+        # Contiguous IDs (the generated layouts) map to rows arithmetically
+        self._base = layout.min_id
+        self._rows = None
+        if layout.max_id - layout.min_id + 1 != n:
+            self._rows = {int(slot_id): row for row, slot_id in enumerate(self.slot_id)}
+
+    # --- Addressing ---
+
+    def row(self, slot_id):
+        """Row index for a slot ID (raises KeyError for unknown slots)"""
+        if self._rows is not None:
+            return self._rows[slot_id]
+        if not isinstance(slot_id, int):
+            raise KeyError(slot_id)
+        row = slot_id - self._base
+        if row < 0 or row >= len(self.slot_id):
+            raise KeyError(slot_id)
+        return row
+
+    # --- Mapping API (slot_id -> SlotView) ---
+
+    def __getitem__(self, slot_id):
+        return SlotView(self, self.row(slot_id))
+
+    def __iter__(self):
+        return iter(self.slot_id.tolist())
+
+    def __len__(self):
+        return len(self.slot_id)
+
+    def __contains__(self, slot_id):
+        try:
+            self.row(slot_id)
+        except KeyError:
+            return False
+        return True
+
+    # --- Typed field access ---
+
+    def vehicle(self, slot_id):
+        return self.vehicles.values[self.vehicle_code[self.row(slot_id)]]
+
+    def end_time(self, slot_id):
+        return _to_dt(float(self.end_ts[self.row(slot_id)]))
+
+    def is_free(self, slot_id):
+        row = self.row(slot_id)
+        return self.vehicle_code[row] == 0 and self.robot_id[row] == NO_ROBOT
+
+    def occupy(self, slot_id, vehicle, entry_time, end_time, is_auto=False):
+        """Writes a vehicle (or "RESERVED") into a slot"""
+        row = self.row(slot_id)
+        self.vehicle_code[row] = self.vehicles.code(vehicle)
+        self.entry_ts[row] = _to_ts(entry_time)
+        self.end_ts[row] = _to_ts(end_time)
+        self.is_auto[row] = is_auto
+
+    def clear(self, slot_id):
+        """Empties a slot (the robot lock is left untouched)"""
+        row = self.row(slot_id)
+        self.vehicle_code[row] = 0
+        self.entry_ts[row] = np.nan
+        self.end_ts[row] = np.nan
+        self.is_auto[row] = False
+
+    def set_robot(self, slot_id, robot_id):
+        self.robot_id[self.row(slot_id)] = NO_ROBOT if robot_id is None else robot_id
+
+    def extend(self, slot_id, seconds):
+        self.end_ts[self.row(slot_id)] += seconds
+
+    # --- Row materialisation ---
+
+    def get_field(self, row, key):
+        if key == "id":
+            return int(self.slot_id[row])
+        if key == "type":
+            return self.slot_types.values[self.type_code[row]]
+        if key == "vehicle":
+            return self.vehicles.values[self.vehicle_code[row]]
+        if key == "attr":
+            return self.attrs.values[self.attr_code[row]]
+        if key == "entry_time":
+            return _to_dt(float(self.entry_ts[row]))
+        if key == "end_time":
+            return _to_dt(float(self.end_ts[row]))
+        if key == "robot_assigned":
+            robot = int(self.robot_id[row])
+            return None if robot == NO_ROBOT else robot
+        if key == "is_auto":
+            return bool(self.is_auto[row])
+        raise KeyError(key)
+
+    def to_dict(self, rows=None):
+        """Plain dict-of-dicts snapshot (for JSON encoding), optionally of selected rows only"""
+        def col(column):
+            return (column if rows is None else column[rows]).tolist()
+        ids = col(self.slot_id)
+        types = [self.slot_types.values[c] for c in col(self.type_code)]
+        vehicles = [self.vehicles.values[c] for c in col(self.vehicle_code)]
+        attrs = [self.attrs.values[c] for c in col(self.attr_code)]
+        entries = [_to_dt(ts) for ts in col(self.entry_ts)]
+        ends = [_to_dt(ts) for ts in col(self.end_ts)]
+        robots = [None if r == NO_ROBOT else r for r in col(self.robot_id)]
+        autos = col(self.is_auto)
+        return {
+            ids[i]: {"id": ids[i], "type": types[i], "vehicle": vehicles[i], "attr": attrs[i],
+                     "entry_time": entries[i], "end_time": ends[i],
+                     "robot_assigned": robots[i], "is_auto": autos[i]}
+            for i in range(len(ids))
+        }
+
+    # --- Vectorized scans ---
+
+    def changed_since(self, version):
+        """Snapshot of the slots written after the given lot version"""
+        return self.to_dict(np.flatnonzero(self.slot_version > version))
+
+    def free_count(self):
+        """Slots with no vehicle parked or reserved"""
+        return int(np.count_nonzero(self.vehicle_code == 0))
+
+    def nbytes(self):
+        """Bytes held by the column arrays"""
+        return sum(col.nbytes for col in (self.slot_id, self.type_code, self.attr_code, self.vehicle_code,
+                                          self.entry_ts, self.end_ts, self.robot_id, self.is_auto,
+                                          self.slot_version))
+
+
+class SlotView(Mapping):
+    """
+    One slot row seen as the legacy slot dict. Supports both s['vehicle']
+    and s.vehicle so dict-style code and Jinja templates read it unchanged.
+    Read-only: slot writes go through ParkingLot, which keeps the version,
+    free-slot index, expiry heap and listeners in step with the columns.
+    """
+    __slots__ = ("_table", "_row")
+
+    def __init__(self, table, row):
+        self._table = table
+        self._row = row
+
+    def __getitem__(self, key):
+        return self._table.get_field(self._row, key)
+
+    def __setitem__(self, key, value):
+        raise TypeError("Slot views are read-only; change slots through ParkingLot")
+
+    def __delitem__(self, key):
+        raise TypeError("Slot views are read-only; change slots through ParkingLot")
+
+    def __iter__(self):
+        return iter(SLOT_FIELDS)
+
+    def __len__(self):
+        return len(SLOT_FIELDS)
+
+    def __getattr__(self, key):
+        try:
+            return self._table.get_field(self._row, key)
+        except KeyError:
+            raise AttributeError(key) from None
+
+    def __eq__(self, other):
+        if isinstance(other, Mapping):
+            return dict(self) == dict(other)
+        return NotImplemented
+
+    def __repr__(self):
+        return repr(dict(self))
@@ -0,0 +1,66 @@
+"""
+Shared, pre-serialized snapshots of the live slot table.
+
+/api/status, the SSE snapshot and every page render used to rebuild the
+slot dicts (and re-encode them to JSON) per request. StatusSnapshotCache
+builds both once per ParkingLot.version: concurrent readers of an unchanged
+lot share one dict-of-dicts and one encoded body. orjson is used for the
+encoding when it is installed, json otherwise (same output).
+"""
+
+import json
+import threading
+
+from fastapi.encoders import jsonable_encoder
+
+try:
+    import orjson
+except ImportError:  # Optional speed-up
+    orjson = None
+
+
+def dumps(data):
+    """JSON bytes in the compact form JSONResponse produces (datetimes as ISO strings)"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(jsonable_encoder(data), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class StatusSnapshot:
+    __slots__ = ("version", "slots", "body")
+
+    def __init__(self, version, slots, body):
+        self.version = version  # ParkingLot.version the snapshot was taken at
+        self.slots = slots      # {slot_id: slot dict}, datetimes intact (templates format them)
+        self.body = body        # The same, encoded as JSON bytes
+
+
+class StatusSnapshotCache:
+    """
+    DDCO Concept: Write-Invalidate Cache
+    The lot's version is the tag: a read with a matching tag is a hit, any
+    slot write bumps the version and the next read rebuilds the line.
+    """
+    def __init__(self, lot):
+        self.lot = lot
+        self._snapshot = None
+        self._lock = threading.Lock()
+        self.builds = 0
+        self.hits = 0
+
+    def get(self):
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot.version == self.lot.version:
+            self.hits += 1
+            return snapshot
+        with self._lock:
+            # Another reader may have rebuilt it while we waited for the lock
+            snapshot = self._snapshot
+            if snapshot is None or snapshot.version != self.lot.version:
+                version, slots = self.lot.snapshot()
+                snapshot = StatusSnapshot(version, slots, dumps(slots))
+                self._snapshot = snapshot
+                self.builds += 1
+            else:
+                self.hits += 1
+            return snapshot
@@ -0,0 +1,136 @@
+"""
+Parallel Monte Carlo parameter sweeps for the parking model.
+
+Every scenario is one independent EventSimulator run: its own ParkingLot
+(layout from a slot type mix), robot count, traffic mode, arrival rate and
+random seed. Scenarios fan out over a ProcessPoolExecutor; because each run
+owns a seeded RNG, results do not depend on worker count or scheduling.
+
+Usage (from the project root):
+    python -m backend.sweep --hours 168 --seeds 8 --out sweep.csv
+"""
+
+import argparse
+import csv
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from backend.controller import ParkingLot
+from backend.event_sim import EventSimulator, ARRIVALS_PER_HOUR
+from backend.layout import SlotLayout, DEFAULT_TYPE_MIX
+
+# Named slot type mixes a sweep can vary over
+TYPE_MIXES = {
+    "default": DEFAULT_TYPE_MIX,
+    "normal_heavy": {"VIP": 1, "EV": 1, "SENIOR": 1, "NORMAL": 8, "EMERGENCY": 1},
+    "vip_heavy": {"VIP": 4, "EV": 2, "SENIOR": 1, "NORMAL": 4, "EMERGENCY": 1},
+    "ev_heavy": {"VIP": 1, "EV": 4, "SENIOR": 1, "NORMAL": 5, "EMERGENCY": 1},
+}
+
+# Columns written for every run, in order
+RESULT_FIELDS = [
+    "traffic_mode", "arrival_scale", "num_robots", "type_mix", "total_slots", "seed", "hours",
+    "arrivals", "parked", "rejected", "abandoned", "rejection_rate", "revenue",
+    "wait_p50_s", "wait_p90_s", "wait_p99_s", "mean_queue_length", "mean_occupancy",
+    "robot_utilisation", "events", "elapsed_seconds",
+]
+
+
+def build_grid(traffic_modes=("PEAK", "EVENT"), arrival_scales=(1.0,), robot_counts=(3,),
+               type_mixes=("default",), total_slots=(12,), seeds=range(4), hours=168):
+    """Cartesian product of the sweep axes as a list of scenario dicts"""
+    return [
+        {"traffic_mode": mode, "arrival_scale": scale, "num_robots": robots, "type_mix": mix,
+         "total_slots": slots, "seed": seed, "hours": hours}
+        for mode, scale, robots, mix, slots, seed in itertools.product(
+            traffic_modes, arrival_scales, robot_counts, type_mixes, total_slots, seeds)
+    ]
+
+
+def run_scenario(scenario):
+    """Runs one scenario to completion and returns its result row (process-safe)"""
+    layout = SlotLayout.generate(scenario["total_slots"], TYPE_MIXES[scenario["type_mix"]])
+    lot = ParkingLot(layout=layout, num_robots=scenario["num_robots"])
+    mode = scenario["traffic_mode"]
+    sim = EventSimulator(lot, traffic_mode=mode,
+                         arrivals_per_hour=ARRIVALS_PER_HOUR[mode] * scenario["arrival_scale"],
+                         seed=scenario["seed"])
+    result = sim.run(scenario["hours"])
+
+    turned_away = result["rejected"] + result["abandoned"]
+    result["rejection_rate"] = round(turned_away / result["arrivals"], 4) if result["arrivals"] else 0.0
+    row = dict(scenario)
+    row.update({k: result[k] for k in RESULT_FIELDS if k in result})
+    return row
+
+
+def run_sweep(scenarios, workers=None, chunksize=None):
+    """Runs all scenarios across worker processes; rows come back in scenario order"""
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        return [run_scenario(s) for s in scenarios]
+    # A few chunks per worker keeps IPC overhead low while still balancing load
+    chunksize = chunksize or max(1, len(scenarios) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(run_scenario, scenarios, chunksize=chunksize))
+
+
+def summarize(rows):
+    """Averages replicate runs (different seeds) of each scenario"""
+    keys = ("traffic_mode", "arrival_scale", "num_robots", "type_mix", "total_slots")
+    metrics = ("rejection_rate", "revenue", "wait_p50_s", "wait_p90_s", "wait_p99_s",
+               "mean_queue_length", "robot_utilisation")
+    groups = {}
+    for row in rows:
+        groups.setdefault(tuple(row[k] for k in keys), []).append(row)
+
+    summary = []
+    for group_key, group in groups.items():
+        entry = dict(zip(keys, group_key))
+        entry["runs"] = len(group)
+        for m in metrics:
+            values = [r[m] for r in group if r[m] is not None]
+            entry[m] = round(sum(values) / len(values), 3) if values else None
+        summary.append(entry)
+    return summary
+
+
+def write_csv(rows, path, fields=None):
+    fields = fields or list(rows[0].keys())
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=fields, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Monte Carlo sweep over traffic modes, robots and slot mixes")
+    parser.add_argument("--hours", type=float, default=168, help="Simulated hours per run (default: one week)")
+    parser.add_argument("--seeds", type=int, default=4, help="Replicate runs per scenario")
+    parser.add_argument("--modes", nargs="+", default=["PEAK", "EVENT"])
+    parser.add_argument("--arrival-scales", nargs="+", type=float, default=[0.5, 1.0, 1.5])
+    parser.add_argument("--robots", nargs="+", type=int, default=[1, 2, 3, 4])
+    parser.add_argument("--mixes", nargs="+", default=list(TYPE_MIXES), choices=list(TYPE_MIXES))
+    parser.add_argument("--slots", nargs="+", type=int, default=[12])
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: all cores)")
+    parser.add_argument("--out", default="sweep_results.csv", help="Per-run results CSV")
+    parser.add_argument("--summary", default="sweep_summary.csv", help="Per-scenario summary CSV")
+    args = parser.parse_args()
+
+    scenarios = build_grid(args.modes, args.arrival_scales, args.robots, args.mixes, args.slots,
+                           range(args.seeds), args.hours)
+    print(f"🎲 Running {len(scenarios)} simulations on {args.workers or os.cpu_count()} workers...")
+    started = time.perf_counter()
+    rows = run_sweep(scenarios, args.workers)
+    print(f"✅ Done in {time.perf_counter() - started:.1f}s")
+
+    write_csv(rows, args.out, RESULT_FIELDS)
+    write_csv(summarize(rows), args.summary)
+    print(f"📄 Results: {args.out}")
+    print(f"📄 Summary: {args.summary}")
+
+
+if __name__ == "__main__":
+    main()
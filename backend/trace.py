@@ -0,0 +1,73 @@
+"""
+Arrival traces for the tick simulator.
+
+A trace is the arrival stream of a simulation run - which vehicle type came
+in, for how long, and on which tick - stored as JSON lines:
+
+    {"tick": 0, "type": "NORMAL", "duration": 2.5}
+    {"tick": 3, "type": "VIP", "duration": 1.0}
+
+Ticks are counted from the moment recording (or replay) starts. Replaying a
+trace feeds exactly the same workload to the lot, so allocator and dispatcher
+changes can be compared run-to-run.
+"""
+
+import json
+
+
+class TraceRecorder:
+    """Appends arrivals to a JSON-lines trace file"""
+    def __init__(self, path, start_tick=0):
+        self.path = path
+        self.start_tick = start_tick
+        self.count = 0
+        self._file = open(path, "w", encoding="utf-8")
+
+    def record(self, tick, v_type, duration):
+        self._file.write(json.dumps({"tick": tick - self.start_tick, "type": v_type, "duration": duration}) + "\n")
+        self.count += 1
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+
+class TraceReplayer:
+    """Serves the recorded arrivals back tick by tick"""
+    def __init__(self, arrivals, start_tick=0):
+        # arrivals: list of (tick, type, duration), in recorded order
+        self._arrivals = sorted(arrivals, key=lambda a: a[0])  # stable: keeps same-tick order
+        self._next = 0
+        self.start_tick = start_tick
+
+    @classmethod
+    def from_file(cls, path, start_tick=0):
+        arrivals = []
+        with open(path, "r", encoding="utf-8") as f:
+            for line_no, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    rec = json.loads(line)
+                    arrivals.append((int(rec["tick"]), rec["type"], rec["duration"]))
+                except (ValueError, KeyError, TypeError) as e:
+                    raise ValueError(f"Bad trace record on line {line_no}: {e}") from None
+        return cls(arrivals, start_tick)
+
+    def arrivals_at(self, tick):
+        """Arrivals due on the given (absolute) tick, as (type, duration) pairs"""
+        due = []
+        rel = tick - self.start_tick
+        arrivals = self._arrivals
+        while self._next < len(arrivals) and arrivals[self._next][0] <= rel:
+            _, v_type, duration = arrivals[self._next]
+            due.append((v_type, duration))
+            self._next += 1
+        return due
+
+    @property
+    def exhausted(self):
+        return self._next >= len(self._arrivals)
+
+    def __len__(self):
+        return len(self._arrivals)
@@ -0,0 +1,137 @@
+"""
+⚡ Async DB Concurrency Benchmark for Smart Parking AI System
+Fires 500 concurrent clients at the user endpoints (bookings, notifications,
+activity) through the FastAPI app in-process and reports p50/p95/p99 latency
+for:
+  - the old handlers: sync SQLAlchemy sessions on the threadpool
+  - the async handlers: AsyncSession (aiosqlite) on the event loop
+While the load runs, a probe polls /api/status (a threadpool route) to show
+how much the DB traffic delays the rest of the app.
+
+Run from the project root:
+    python benchmarks/bench_async_db.py
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}")
+
+import httpx
+import numpy as np
+from fastapi import Depends
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy.orm import Session
+
+import main
+from backend.auth import create_access_token, get_current_user
+from backend.database import SessionLocal, get_db, init_db, User, Booking, Notification, ActivityLog
+
+CLIENTS = 500
+REQUESTS_PER_CLIENT = 4
+USERS = 100
+PATHS = ("bookings", "notifications", "activity")
+
+# --- The pre-async handlers, for comparison ---
+@main.app.get("/bench/legacy/bookings")
+def legacy_bookings(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+    bookings = db.query(Booking).filter(Booking.user_id == current_user.user_id).order_by(Booking.entry_time.desc()).all()
+    now = main.datetime.utcnow()
+    return jsonable_encoder([main.booking_payload(booking, now) for booking in bookings])
+
+@main.app.get("/bench/legacy/notifications")
+def legacy_notifications(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+    notifications = db.query(Notification).filter(
+        Notification.user_id == current_user.user_id
+    ).order_by(Notification.timestamp.desc()).limit(20).all()
+    return jsonable_encoder(notifications)
+
+@main.app.get("/bench/legacy/activity")
+def legacy_activity(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+    logs = db.query(ActivityLog).filter(
+        ActivityLog.user_id == current_user.user_id
+    ).order_by(ActivityLog.timestamp.desc()).limit(50).all()
+    return jsonable_encoder(logs)
+
+def seed():
+    """USERS accounts with a few bookings, notifications and activity rows each"""
+    init_db()
+    db = SessionLocal()
+    now = main.datetime.utcnow()
+    tokens = []
+    for u in range(USERS):
+        user = User(name=f"Bench User {u}", email=f"bench{u}@example.com", phone="9876543210", password_hash="x")
+        db.add(user)
+        db.flush()
+        for b in range(5):
+            db.add(Booking(user_id=user.user_id, slot_id=1 + b, vehicle_type="NORMAL", duration_hours=1,
+                           entry_time=now, estimated_end_time=now + main.timedelta(hours=1),
+                           billing_cost=10.0, status="ACTIVE"))
+            db.add(Notification(user_id=user.user_id, message=f"Booking {b}", type="INFO"))
+            db.add(ActivityLog(user_id=user.user_id, action=f"Booked Slot {1 + b}", timestamp=now))
+        tokens.append(create_access_token({"sub": str(user.user_id)}))
+    db.commit()
+    db.close()
+    return tokens
+
+async def measure(client, prefix, tokens):
+    latencies = []
+    probe = []
+    done = asyncio.Event()
+
+    async def user(i):
+        headers = {"Authorization": f"Bearer {tokens[i % len(tokens)]}"}
+        for r in range(REQUESTS_PER_CLIENT):
+            started = time.perf_counter()
+            response = await client.get(f"{prefix}/{PATHS[(i + r) % len(PATHS)]}", headers=headers)
+            latencies.append(time.perf_counter() - started)
+            assert response.status_code == 200, response.text
+
+    async def status_probe():
+        while not done.is_set():
+            started = time.perf_counter()
+            await client.get("/api/status")
+            probe.append(time.perf_counter() - started)
+            await asyncio.sleep(0.01)
+
+    prober = asyncio.create_task(status_probe())
+    started = time.perf_counter()
+    await asyncio.gather(*(user(i) for i in range(CLIENTS)))
+    elapsed = time.perf_counter() - started
+    done.set()
+    await prober
+    ms = np.array(latencies) * 1e3
+    return {
+        "p50": np.percentile(ms, 50),
+        "p95": np.percentile(ms, 95),
+        "p99": np.percentile(ms, 99),
+        "rps": len(latencies) / elapsed,
+        "probe_p99": np.percentile(np.array(probe) * 1e3, 99),
+    }
+
+async def run():
+    tokens = seed()
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        await measure(client, "/user", tokens[:10])  # Warm both engines' connection pools
+        await measure(client, "/bench/legacy", tokens[:10])
+        legacy = await measure(client, "/bench/legacy", tokens)
+        asynchronous = await measure(client, "/user", tokens)
+    await main.async_engine.dispose()
+
+    print("=" * 72)
+    print(f"⚡ ASYNC DB BENCHMARK - {CLIENTS} concurrent clients x {REQUESTS_PER_CLIENT} requests, {USERS} users")
+    print("=" * 72)
+    print(f"{'handlers':>10} | {'p50 ms':>8} | {'p95 ms':>8} | {'p99 ms':>8} | {'req/s':>7} | {'/api/status p99':>15}")
+    print("-" * 72)
+    for label, r in (("sync", legacy), ("async", asynchronous)):
+        print(f"{label:>10} | {r['p50']:>8.1f} | {r['p95']:>8.1f} | {r['p99']:>8.1f} | {r['rps']:>7,.0f} | "
+              f"{r['probe_p99']:>12.1f} ms")
+    print("=" * 72)
+
+if __name__ == "__main__":
+    asyncio.run(run())
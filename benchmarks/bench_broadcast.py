@@ -0,0 +1,102 @@
+"""
+📡 Slot Broadcast Benchmark for Smart Parking AI System
+Attaches 5,000 in-process subscribers to one SlotBroadcaster, writes to a
+ParkingLot from a worker thread (entries, reservations, exits) and measures
+how long each coalesced event takes to reach every subscriber. The bytes sent
+and server-side encodes are compared with the same dashboards polling the
+old way (/api/predict plus /api/status twice, every 5 seconds).
+
+Run from the project root:
+    python benchmarks/bench_broadcast.py
+"""
+
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.encoders import jsonable_encoder
+
+from backend.broadcast import SlotBroadcaster
+from backend.controller import ParkingLot
+
+SUBSCRIBERS = 5_000
+SLOTS = 200
+WRITES = 500
+WRITES_PER_SECOND = 50
+POLL_SECONDS = 5
+POLL_REQUESTS = 3  # per tab per poll: /api/predict, /api/status (prediction), /api/status (stats)
+
+def writer(lot, done):
+    """Entries, reservations and exits at a steady rate"""
+    for i in range(WRITES):
+        if i % 4 == 3 or lot.slots.free_count() == 0:
+            lot.exit_vehicle(next(s for s in lot.slots if lot.slots.vehicle(s)))
+        elif i % 4 == 2:
+            lot.reserve_slot("NORMAL", 1)
+        else:
+            lot.process_vehicle(("VIP", "EV", "NORMAL")[i % 3], 2)
+        time.sleep(1 / WRITES_PER_SECOND)
+    done.set()
+
+async def consume(sub, stats):
+    while True:
+        frame = await sub.queue.get()
+        if frame is None:
+            return
+        stats["frames"] += 1
+        stats["bytes"] += len(frame)
+        stats["worst_latency"] = max(stats["worst_latency"], time.perf_counter() - stats["flushed_at"])
+
+async def main():
+    lot = ParkingLot(total_slots=SLOTS)
+    broadcaster = SlotBroadcaster()
+    broadcaster.attach(asyncio.get_running_loop())
+
+    lot.add_listener(broadcaster.publish)
+
+    # Note when each event is fanned out so consumers can measure delivery
+    stats = {"frames": 0, "bytes": 0, "worst_latency": 0.0, "flushed_at": 0.0}
+    flush = broadcaster._flush
+    def timed_flush():
+        stats["flushed_at"] = time.perf_counter()
+        flush()
+    broadcaster._flush = timed_flush
+
+    subs = [broadcaster.subscribe() for _ in range(SUBSCRIBERS)]
+    consumers = [asyncio.create_task(consume(sub, stats)) for sub in subs]
+
+    done = threading.Event()
+    started = time.perf_counter()
+    threading.Thread(target=writer, args=(lot, done), daemon=True).start()
+    while not done.is_set():
+        await asyncio.sleep(0.05)
+    await asyncio.sleep(broadcaster.flush_interval * 4)
+    elapsed = time.perf_counter() - started
+    broadcaster.close()
+    await asyncio.gather(*consumers)
+
+    status_bytes = len(json.dumps(jsonable_encoder(lot.get_status().to_dict())))
+    predict_bytes = len(json.dumps(jsonable_encoder(lot.get_ai_prediction())))
+    polls = SUBSCRIBERS * elapsed / POLL_SECONDS
+    polled_bytes = polls * (2 * status_bytes + predict_bytes)
+    metrics = broadcaster.metrics()
+    print("=" * 64)
+    print(f"📡 BROADCAST BENCHMARK - {SUBSCRIBERS:,} subscribers, {WRITES:,} writes over {elapsed:.1f}s")
+    print("=" * 64)
+    print(f"Slot updates coalesced into events: {metrics['slot_updates']:,} -> {metrics['events_sent']:,}")
+    print(f"Frames delivered:                   {stats['frames']:,}")
+    print(f"Worst flush-to-subscriber latency:  {stats['worst_latency'] * 1e3:.1f} ms")
+    print(f"Dropped (slow) subscribers:         {metrics['dropped_subscribers']}")
+    print("-" * 64)
+    print(f"{'':>24} | {'responses built':>15} | {'bytes sent':>10}")
+    print(f"{'SSE deltas':>24} | {metrics['events_sent']:>15,} | {stats['bytes'] / 1024 ** 2:>7.1f} MB")
+    print(f"{f'polling every {POLL_SECONDS}s':>24} | {polls * POLL_REQUESTS:>15,.0f} | {polled_bytes / 1024 ** 2:>7.1f} MB")
+    print("=" * 64)
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,85 @@
+"""
+🧾 Event Log Memory Benchmark for Smart Parking AI System
+Feeds 30 days of entry/exit events (one every 5 seconds) into the ring-buffer
+history_log and reports its memory at each simulated week, next to the legacy
+list-of-dicts log, which is extrapolated from its first day.
+
+Run from the project root:
+    python benchmarks/bench_event_log.py
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.controller import ParkingLot
+
+DAYS = 30
+EVENT_EVERY = 5  # seconds
+EVENTS_PER_DAY = 86_400 // EVENT_EVERY
+TYPES = ("VIP", "EV", "NORMAL", "NORMAL")
+
+def event(i):
+    """The i-th event: alternating entries and exits over the lot's bays"""
+    return ("ENTRY" if i % 2 == 0 else "EXIT"), TYPES[i % len(TYPES)], 1 + (i // 2) % 500
+
+def legacy_day_bytes():
+    """Traced bytes held by one day of the old list-of-dicts history_log"""
+    tracemalloc.start()
+    log = []
+    for i in range(EVENTS_PER_DAY):
+        action, v_type, slot = event(i)
+        entry = {"timestamp": datetime.now().strftime("%H:%M:%S"), "type": v_type, "action": action, "slot": slot}
+        if action == "ENTRY":
+            entry["duration"] = 2
+            entry["cost"] = 20.0
+        log.append(entry)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size
+
+def run():
+    print("=" * 64)
+    print(f"🧾 EVENT LOG BENCHMARK - {DAYS} days, one event every {EVENT_EVERY}s")
+    print("=" * 64)
+
+    lot = ParkingLot()
+    log = lot.history_log
+    legacy_per_day = legacy_day_bytes()
+    start = time.time()
+
+    tracemalloc.start()
+    baseline, _ = tracemalloc.get_traced_memory()
+    print(f"{'day':>4} | {'events':>10} | {'ring buffer':>12} | {'legacy list':>12}")
+    print("-" * 64)
+    started = time.perf_counter()
+    for day in range(1, DAYS + 1):
+        for j in range(EVENTS_PER_DAY):
+            i = (day - 1) * EVENTS_PER_DAY + j
+            action, v_type, slot = event(i)
+            if action == "ENTRY":
+                log.record(action, v_type, slot=slot, value=20.0, duration=2.0, when=start + i * EVENT_EVERY)
+            else:
+                log.record(action, v_type, slot=slot, when=start + i * EVENT_EVERY)
+        if day == 1 or day % 7 == 0 or day == DAYS:
+            current, _ = tracemalloc.get_traced_memory()
+            print(f"{day:>4} | {day * EVENTS_PER_DAY:>10,} | {(current - baseline) / 1024:>9.0f} KB | "
+                  f"{day * legacy_per_day / 1024 ** 2:>9.1f} MB")
+    elapsed = time.perf_counter() - started
+    tracemalloc.stop()
+
+    print("-" * 64)
+    print(f"Kept {len(log):,} newest of {DAYS * EVENTS_PER_DAY:,} events "
+          f"({log.nbytes() / 1024:.0f} KB buffer), {DAYS * EVENTS_PER_DAY / elapsed:,.0f} records/s")
+    started = time.perf_counter()
+    page = log.query(start=start + (DAYS - 1) * 86_400, actions=["EXIT"], limit=50)
+    print(f"Query last day's exits: {page['total']:,} matches, 50-row page in "
+          f"{(time.perf_counter() - started) * 1e3:.2f} ms")
+    print("=" * 64)
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,116 @@
+"""
+🏟️ Mass Expiry Benchmark for Smart Parking AI System
+A stadium event ends: every booking in a fully occupied lot runs past its
+end time at once. Times one run of the scheduler's expiry job for:
+  - the old job: each Booking loaded as an ORM object and changed one by one,
+    one Notification + ActivityLog object per row, exit_vehicle() per slot
+  - the new job: overdue slots off the lot's expiry heap, UPDATE ... RETURNING
+    on those slots, executemany inserts, release_slots()
+
+Run from the project root:
+    python benchmarks/bench_expiry_pipeline.py
+"""
+
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from backend import scheduler
+from backend.controller import ParkingLot
+from backend.database import Base, Booking, Notification, ActivityLog, User, apply_sqlite_pragmas
+from backend.migrations import run_migrations
+
+LOT_SIZES = (1_000, 5_000, 20_000)
+USERS = 500
+PAST_BOOKINGS_PER_SLOT = 3
+
+def legacy_expire_bookings(Session, lot):
+    """The pre-change job body"""
+    now = datetime.utcnow()
+    session = Session()
+    expired = session.query(Booking).filter(
+        Booking.status == "ACTIVE",
+        Booking.estimated_end_time <= now
+    ).all()
+    for booking in expired:
+        booking.status = "EXPIRED"
+        booking.exit_time = now
+        session.add(Notification(
+            user_id=booking.user_id,
+            booking_id=booking.booking_id,
+            message=f"⏰ Your parking time for Slot {booking.slot_id} has expired.",
+            type="ALERT"
+        ))
+        session.add(ActivityLog(
+            user_id=booking.user_id,
+            action=f"Booking expired for Slot {booking.slot_id}",
+            timestamp=now
+        ))
+        lot.exit_vehicle(booking.slot_id)
+    session.commit()
+    session.close()
+
+def setup(path, size):
+    """A full lot whose stays all end at once, with matching ACTIVE bookings and some history"""
+    lot = ParkingLot(total_slots=size)
+    for i in range(size):
+        lot.process_vehicle(("VIP", "EV", "NORMAL")[i % 3], 0.0001)  # 0.36 s stays
+    slots = [slot_id for slot_id in lot.slots if lot.slots.vehicle(slot_id)]
+
+    engine = apply_sqlite_pragmas(create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False}))
+    Base.metadata.create_all(bind=engine)
+    run_migrations(engine)
+    Session = sessionmaker(bind=engine, autoflush=False)
+    db = Session()
+    now = datetime.utcnow()
+    db.execute(insert(User), [{"name": f"Bench User {u}", "email": f"bench{u}@example.com"} for u in range(USERS)])
+    history = [{"user_id": 1 + i % USERS, "slot_id": slots[i % len(slots)], "vehicle_type": "NORMAL",
+                "estimated_end_time": now - timedelta(days=1), "status": "COMPLETED"}
+               for i in range(len(slots) * PAST_BOOKINGS_PER_SLOT)]
+    active = [{"user_id": 1 + i % USERS, "slot_id": slot_id, "vehicle_type": "NORMAL",
+               "estimated_end_time": now, "status": "ACTIVE"} for i, slot_id in enumerate(slots)]
+    db.execute(insert(Booking), history + active)
+    db.commit()
+    db.close()
+    time.sleep(0.5)  # Let the stays run out
+    return engine, Session, lot
+
+def run():
+    workdir = tempfile.mkdtemp()
+    print("=" * 64)
+    print("🏟️ MASS EXPIRY - every booking in a full lot ends at once")
+    print("=" * 64)
+    print(f"{'expired':>8} | {'old job':>10} | {'new job':>10} | {'speedup':>7}")
+    print("-" * 64)
+    for size in LOT_SIZES:
+        timings = {}
+        for label in ("legacy", "new"):
+            engine, Session, lot = setup(os.path.join(workdir, f"{label}-{size}.db"), size)
+            due = lot.expired_slots()
+            started = time.perf_counter()
+            if label == "legacy":
+                legacy_expire_bookings(Session, lot)
+            else:
+                scheduler.SessionLocal = Session  # Point the real job at this database and lot
+                scheduler._parking = lot
+                scheduler._last_full_sweep = datetime.utcnow()  # Take the heap-driven path, not the full sweep
+                scheduler._last_heap_check = None
+                scheduler._expire_bookings()
+            timings[label] = time.perf_counter() - started
+            assert not lot.expired_slots()
+            with Session() as db:
+                assert db.query(Booking).filter(Booking.status == "EXPIRED").count() == len(due)
+            engine.dispose()
+        print(f"{len(due):>8,} | {timings['legacy'] * 1e3:>7.0f} ms | {timings['new'] * 1e3:>7.0f} ms | "
+              f"{timings['legacy'] / timings['new']:>6.1f}x")
+    print("=" * 64)
+
+if __name__ == "__main__":
+    run()
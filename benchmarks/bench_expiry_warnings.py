@@ -0,0 +1,107 @@
+"""
+⏰ Expiry Warning Job Benchmark for Smart Parking AI System
+Times one run of the scheduler's "expires in 5 minutes" job as the number of
+active bookings grows (end times spread over the next 2 hours, 3 past
+notifications per booking), for:
+  - the old job: a Notification LIKE '%expires in%' query per due booking
+  - the new job: one indexed query on expiry_warned_at + a bulk insert
+First run = warnings go out; second run = the next minute, all already warned.
+
+Run from the project root:
+    python benchmarks/bench_expiry_warnings.py
+"""
+
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from backend import scheduler
+from backend.database import Base, Booking, Notification, User, apply_sqlite_pragmas
+from backend.migrations import run_migrations
+
+ACTIVE_BOOKINGS = (1_000, 5_000, 20_000)
+USERS = 500
+WINDOW = timedelta(hours=2)
+
+def legacy_check_expiring_soon(Session):
+    """The pre-change job"""
+    session = Session()
+    now = datetime.utcnow()
+    soon_expiring = session.query(Booking).filter(
+        Booking.status == "ACTIVE",
+        Booking.estimated_end_time <= now + timedelta(minutes=5),
+        Booking.estimated_end_time > now
+    ).all()
+    for booking in soon_expiring:
+        existing = session.query(Notification).filter(
+            Notification.booking_id == booking.booking_id,
+            Notification.type == "WARNING",
+            Notification.message.like("%expires in%")
+        ).first()
+        if not existing:
+            session.add(Notification(
+                user_id=booking.user_id,
+                booking_id=booking.booking_id,
+                message=f"⚠️ Your parking slot {booking.slot_id} expires in 5 minutes!",
+                type="WARNING"
+            ))
+    session.commit()
+    session.close()
+
+def make_session(path, active):
+    engine = apply_sqlite_pragmas(create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False}))
+    Base.metadata.create_all(bind=engine)
+    run_migrations(engine)
+    Session = sessionmaker(bind=engine, autoflush=False)
+    db = Session()
+    now = datetime.utcnow()
+    db.execute(insert(User), [{"name": f"Bench User {u}", "email": f"bench{u}@example.com"} for u in range(USERS)])
+    db.execute(insert(Booking), [{
+        "user_id": 1 + i % USERS, "slot_id": 1 + i, "vehicle_type": "NORMAL", "duration_hours": 2,
+        "entry_time": now, "estimated_end_time": now + WINDOW * (i + 0.5) / active,
+        "billing_cost": 20.0, "status": "ACTIVE",
+    } for i in range(active)])
+    db.execute(insert(Notification), [{
+        "user_id": 1 + i % USERS, "booking_id": 1 + i // 3, "message": "✅ Slot booked successfully!", "type": "SUCCESS",
+    } for i in range(active * 3)])
+    db.commit()
+    db.close()
+    return engine, Session
+
+def timed(fn):
+    started = time.perf_counter()
+    fn()
+    return (time.perf_counter() - started) * 1e3
+
+def run():
+    workdir = tempfile.mkdtemp()
+    print("=" * 72)
+    print(f"⏰ EXPIRY WARNING JOB - end times spread over {WINDOW.seconds // 3600}h, 5-minute warning window")
+    print("=" * 72)
+    print(f"{'active':>7} | {'due':>5} | {'old: warn':>10} | {'old: next':>10} | {'new: warn':>10} | {'new: next':>10}")
+    print("-" * 72)
+    for active in ACTIVE_BOOKINGS:
+        results = []
+        for label in ("legacy", "new"):
+            engine, Session = make_session(os.path.join(workdir, f"{label}-{active}.db"), active)
+            if label == "legacy":
+                job = lambda: legacy_check_expiring_soon(Session)
+            else:
+                scheduler.SessionLocal = Session  # Point the real job at this database
+                job = scheduler._check_expiring_soon
+            results += [timed(job), timed(job)]
+            with Session() as db:
+                due = db.query(Notification).filter(Notification.type == "WARNING").count()
+            engine.dispose()
+        print(f"{active:>7,} | {due:>5,} | " + " | ".join(f"{ms:>7.1f} ms" for ms in results))
+    print("=" * 72)
+
+if __name__ == "__main__":
+    run()
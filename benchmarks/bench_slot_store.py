@@ -0,0 +1,92 @@
+"""
+💾 Slot Store Benchmark for Smart Parking AI System
+Compares the legacy dict-of-dicts register file with the columnar SlotTable:
+memory per slot and the cost of a whole-lot "free slots" scan. "lot B/slot"
+is a whole ParkingLot on the same layout: slot table, free-slot index and
+expiry heap (the layout itself is shared by every lot and not counted).
+
+Run from the project root:
+    python benchmarks/bench_slot_store.py
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.controller import ParkingLot
+from backend.layout import SlotLayout
+from backend.slot_store import SlotTable
+
+def occupy_every_other(slots_write, n_slots):
+    now = datetime.now()
+    for slot_id in range(1, n_slots + 1, 2):
+        slots_write(slot_id, "NORMAL", now, now + timedelta(hours=1 + slot_id % 5))
+
+def measure(build):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    obj = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return obj, after - before
+
+def build_legacy(layout):
+    # The old register file: one dict per slot
+    slots = {
+        s["id"]: {"id": s["id"], "type": s["type"], "vehicle": None, "attr": s["attr"],
+                  "entry_time": None, "end_time": None, "robot_assigned": None, "is_auto": False}
+        for s in layout.slots
+    }
+    def write(slot_id, vehicle, entry, end):
+        s = slots[slot_id]
+        s['vehicle'], s['entry_time'], s['end_time'] = vehicle, entry, end
+    occupy_every_other(write, len(layout))
+    return slots
+
+def build_table(layout):
+    table = SlotTable(layout)
+    occupy_every_other(lambda slot_id, v, entry, end: table.occupy(slot_id, v, entry, end), len(layout))
+    return table
+
+def build_lot(layout):
+    lot = ParkingLot(layout=layout)
+    def write(slot_id, v, entry, end):
+        lot.slots.occupy(slot_id, v, entry, end)
+        lot._sync_slot(slot_id)
+    occupy_every_other(write, len(layout))
+    return lot
+
+def run(sizes=(12, 1_000, 100_000)):
+    print("=" * 91)
+    print("💾 SLOT STORE BENCHMARK - dict-of-dicts vs columnar SlotTable (half occupied)")
+    print("=" * 91)
+    print(f"{'slots':>10} | {'dict B/slot':>11} | {'table B/slot':>12} | {'ratio':>6} | {'lot B/slot':>10} | "
+          f"{'dict scan':>11} | {'table scan':>11}")
+    print("-" * 91)
+
+    for n in sizes:
+        layout = SlotLayout.generate(n)
+        legacy, legacy_bytes = measure(lambda: build_legacy(layout))
+        table, table_bytes = measure(lambda: build_table(layout))
+        _, lot_bytes = measure(lambda: build_lot(layout))
+
+        start = time.perf_counter()
+        legacy_free = sum(1 for s in legacy.values() if s['vehicle'] is None)
+        legacy_scan = time.perf_counter() - start
+
+        start = time.perf_counter()
+        table_free = table.free_count()
+        table_scan = time.perf_counter() - start
+        assert legacy_free == table_free
+
+        print(f"{n:>10,} | {legacy_bytes / n:>11.0f} | {table_bytes / n:>12.1f} | {legacy_bytes / table_bytes:>5.1f}x | "
+              f"{lot_bytes / n:>10.1f} | {legacy_scan * 1e6:>8.1f} µs | {table_scan * 1e6:>8.1f} µs")
+
+    print("=" * 91)
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,128 @@
+"""
+🗄️ SQLite Storage Profile Benchmark for Smart Parking AI System
+Compares SQLite's default settings (rollback journal, synchronous=FULL) with
+the storage profile in backend/database.py (WAL, synchronous=NORMAL, page
+cache, mmap, busy_timeout) on the Booking, Notification and ActivityLog
+tables:
+  - writes: one booking + notification + activity row per commit, as /api/entry does
+  - mixed:  one writer committing while reader threads run the dashboard
+            queries (bookings, notifications, activity of a user)
+
+Run from the project root:
+    python benchmarks/bench_sqlite_profile.py
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from backend.database import (Base, Booking, Notification, ActivityLog, User,
+                              POOL_OPTIONS, SQLITE_PRAGMAS, apply_sqlite_pragmas)
+
+USERS = 50
+WRITES = 1_000
+READERS = 8
+MIXED_SECONDS = 3
+
+def make_session(path, pragmas):
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False}, **POOL_OPTIONS)
+    if pragmas:
+        apply_sqlite_pragmas(engine, pragmas)
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine, autoflush=False)
+    db = Session()
+    db.add_all(User(name=f"Bench User {u}", email=f"bench{u}@example.com", phone="9876543210",
+                    password_hash="x") for u in range(USERS))
+    db.commit()
+    db.close()
+    return engine, Session
+
+def book(db, i):
+    """The rows /api/entry writes, in one transaction"""
+    user_id = 1 + i % USERS
+    now = datetime.utcnow()
+    booking = Booking(user_id=user_id, slot_id=1 + i % 12, vehicle_type="NORMAL", duration_hours=1,
+                      entry_time=now, estimated_end_time=now + timedelta(hours=1), billing_cost=10.0, status="ACTIVE")
+    db.add(booking)
+    db.flush()
+    db.add(Notification(user_id=user_id, booking_id=booking.booking_id, message=f"Slot {booking.slot_id} booked", type="SUCCESS"))
+    db.add(ActivityLog(user_id=user_id, action=f"Booked Slot {booking.slot_id}", timestamp=now))
+    db.commit()
+
+def dashboard_read(db, i):
+    user_id = 1 + i % USERS
+    db.query(Booking).filter(Booking.user_id == user_id).order_by(Booking.entry_time.desc()).all()
+    db.query(Notification).filter(Notification.user_id == user_id).order_by(Notification.timestamp.desc()).limit(20).all()
+    db.query(ActivityLog).filter(ActivityLog.user_id == user_id).order_by(ActivityLog.timestamp.desc()).limit(50).all()
+    db.rollback()  # End the read transaction, as closing the request's session would
+
+def measure_writes(Session):
+    db = Session()
+    started = time.perf_counter()
+    for i in range(WRITES):
+        book(db, i)
+    elapsed = time.perf_counter() - started
+    db.close()
+    return WRITES / elapsed
+
+def measure_mixed(Session):
+    stop = threading.Event()
+    counts = {"reads": 0, "writes": 0, "errors": 0}
+    lock = threading.Lock()
+
+    def loop(fn, key):
+        db = Session()
+        i = 0
+        while not stop.is_set():
+            try:
+                fn(db, i)
+                with lock:
+                    counts[key] += 1
+            except OperationalError:  # "database is locked" after the busy timeout
+                db.rollback()
+                with lock:
+                    counts["errors"] += 1
+            i += 1
+        db.close()
+
+    threads = [threading.Thread(target=loop, args=(book, "writes"))]
+    threads += [threading.Thread(target=loop, args=(dashboard_read, "reads")) for _ in range(READERS)]
+    for thread in threads:
+        thread.start()
+    time.sleep(MIXED_SECONDS)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return {key: value / MIXED_SECONDS for key, value in counts.items()}
+
+def run():
+    workdir = tempfile.mkdtemp()
+    print("=" * 72)
+    print(f"🗄️ SQLITE STORAGE PROFILE - {WRITES:,} booking commits, then 1 writer + {READERS} readers "
+          f"for {MIXED_SECONDS}s")
+    print(f"   (database files in {workdir})")
+    print("=" * 72)
+    print(f"{'profile':>8} | {'commits/s':>9} | {'mixed writes/s':>14} | {'mixed reads/s':>13} | {'lock errors/s':>13}")
+    print("-" * 72)
+    for label, pragmas in (("default", None), ("tuned", SQLITE_PRAGMAS)):
+        engine, Session = make_session(os.path.join(workdir, f"{label}.db"), pragmas)
+        writes = measure_writes(Session)
+        mixed = measure_mixed(Session)
+        engine.dispose()
+        print(f"{label:>8} | {writes:>9,.0f} | {mixed['writes']:>14,.0f} | {mixed['reads']:>13,.0f} | "
+              f"{mixed['errors']:>13,.1f}")
+    print("-" * 72)
+    print("tuned: " + ", ".join(f"{name}={value}" for name, value in SQLITE_PRAGMAS.items()))
+    print("=" * 72)
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,77 @@
+"""
+📈 /api/status Throughput Benchmark for Smart Parking AI System
+Serves a 2,000-bay lot through the FastAPI app in-process (ASGI, 32
+concurrent clients) and compares requests per second for:
+  - the old handler: jsonable_encoder(get_status().to_dict()) per request
+  - the cached handler: one shared pre-encoded snapshot per state version
+with the lot unchanged, and with one slot write every 50 requests.
+
+Run from the project root:
+    python benchmarks/bench_status_rps.py
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("PARKING_TOTAL_SLOTS", "2000")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}")
+
+import httpx
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+import main
+from backend import snapshot
+
+REQUESTS = 400
+CLIENTS = 32
+WRITE_EVERY = 50
+
+@main.app.get("/bench/status-legacy")
+def legacy_status():
+    """The pre-cache /api/status handler"""
+    return JSONResponse(content=jsonable_encoder(main.parking.get_status().to_dict()))
+
+def fill_lot():
+    for i in range(len(main.parking.slots) // 2):
+        main.parking.process_vehicle(("VIP", "EV", "NORMAL")[i % 3], 1 + i % 4)
+
+async def measure(path, write_every=None):
+    transport = httpx.ASGITransport(app=main.app)
+    counter = {"sent": 0}
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def worker():
+            while counter["sent"] < REQUESTS:
+                counter["sent"] += 1
+                if write_every and counter["sent"] % write_every == 0:
+                    occupied = next(s for s in main.parking.slots if main.parking.slots.vehicle(s))
+                    main.parking.extend_slot(occupied, 0.5)
+                response = await client.get(path)
+                assert response.status_code == 200
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(CLIENTS)))
+        return REQUESTS / (time.perf_counter() - started)
+
+async def run():
+    fill_lot()
+    encoder = "orjson" if snapshot.orjson is not None else "json"
+    print("=" * 64)
+    print(f"📈 /api/status THROUGHPUT - {len(main.parking.slots):,} bays, {REQUESTS:,} requests, "
+          f"{CLIENTS} clients ({encoder})")
+    print("=" * 64)
+    print(f"{'lot state':>26} | {'legacy req/s':>12} | {'cached req/s':>12} | {'speedup':>7}")
+    print("-" * 64)
+    for label, write_every in (("unchanged", None), (f"1 write / {WRITE_EVERY} requests", WRITE_EVERY)):
+        legacy = await measure("/bench/status-legacy", write_every)
+        cached = await measure("/api/status", write_every)
+        print(f"{label:>26} | {legacy:>12,.0f} | {cached:>12,.0f} | {cached / legacy:>6.1f}x")
+    print("-" * 64)
+    print(f"Snapshot builds: {main.status_cache.builds:,}, shared reads: {main.status_cache.hits:,}")
+    print("=" * 64)
+
+if __name__ == "__main__":
+    asyncio.run(run())
@@ -26,6 +26,9 @@ def reset_database():
         if response.lower() == 'y':
             try:
                 os.remove(db_file)
+                for sidecar in (db_file + "-wal", db_file + "-shm"):  # WAL journal files
+                    if os.path.exists(sidecar):
+                        os.remove(sidecar)
                 print("   ✅ Old database deleted")
             except PermissionError:
                 print("\n❌ ERROR: Database is locked by another process")
@@ -1,23 +1,33 @@
-from fastapi import FastAPI, Request, Form, Depends, HTTPException, Header, status
+from fastapi import FastAPI, Request, Form, Depends, HTTPException, Header, Query, status
 from fastapi.templating import Jinja2Templates
-from fastapi.responses import HTMLResponse, JSONResponse, RedirectResponse
+from fastapi.responses import HTMLResponse, JSONResponse, RedirectResponse, StreamingResponse, Response
 from fastapi.encoders import jsonable_encoder
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, field_validator, EmailStr
 from typing import Literal, Optional
 from datetime import datetime, timedelta
 from contextlib import asynccontextmanager
 import uvicorn
+import asyncio
 import time
 import os
 import re
+import secrets
 from dotenv import load_dotenv
+from sqlalchemy import select
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from jose import jwt
 
 from backend.controller import ParkingLot, ids
-from backend.database import init_db, get_db, User, Booking, Notification, ActivityLog
-from backend.auth import get_password_hash, verify_password, create_access_token, get_current_user, ACCESS_TOKEN_EXPIRE_MINUTES, SECRET_KEY as JWT_SECRET, ALGORITHM
+from backend.layout import SlotLayout
+from backend.sim_pool import SimulationPool
+from backend.broadcast import SlotBroadcaster
+from backend.snapshot import StatusSnapshotCache, dumps
+from backend.single_flight import SingleFlight
+from backend.database import init_db, get_db, get_async_db, engine, async_engine, User, Booking, Notification, ActivityLog
+from backend.auth import get_password_hash, verify_password, create_access_token, get_session_user, ACCESS_TOKEN_EXPIRE_MINUTES, SECRET_KEY as JWT_SECRET, ALGORITHM
 from backend.scheduler import start_scheduler, stop_scheduler
 
 load_dotenv()
@@ -27,12 +37,18 @@ load_dotenv()
 async def lifespan(app: FastAPI):
     init_db()
     start_scheduler(parking)
+    broadcaster.attach(asyncio.get_running_loop())
+    parking.add_listener(broadcaster.publish)
     print("\n" + "="*60)
     print("⚠️  IMPORTANT: If you ran START.bat, the database was RESET.")
     print("👉  You MUST register a new account before logging in.")
     print("="*60 + "\n")
     yield
+    parking.remove_listener(broadcaster.publish)
+    broadcaster.close()
     stop_scheduler()
+    await async_engine.dispose()
+    engine.dispose()
 
 app = FastAPI(lifespan=lifespan)
 templates = Jinja2Templates(directory="templates")
@@ -57,7 +73,53 @@ async def global_security_middleware(request: Request, call_next):
     response.headers["X-Frame-Options"] = "SAMEORIGIN"
     return response
 
-parking = ParkingLot(total_slots=12)
+def load_layout():
+    """
+    Lot layout from PARKING_LAYOUT_FILE (JSON), or generated from the default
+    type mix with PARKING_TOTAL_SLOTS bays.
+    """
+    layout_file = os.getenv("PARKING_LAYOUT_FILE")
+    if layout_file:
+        return SlotLayout.from_file(layout_file)
+    return SlotLayout.generate(int(os.getenv("PARKING_TOTAL_SLOTS", "12")))
+
+# Robot travel speed in bays per tick (unset: robots reach any bay in one tick)
+_travel_speed = os.getenv("PARKING_TRAVEL_SPEED")
+parking = ParkingLot(layout=load_layout(), travel_speed=float(_travel_speed) if _travel_speed else None,
+                     history_capacity=int(os.getenv("HISTORY_LOG_CAPACITY", "10000")),
+                     sim_log_capacity=int(os.getenv("SIM_LOG_CAPACITY", "1000")))
+parking.set_dispatch_mode(os.getenv("PARKING_DISPATCH_MODE", "BOUND"))
+# Bounds for one /api/simulate/run call: the run holds a request thread for its whole length,
+# and its queue (capped at this many waiting vehicles per slot) lives in memory until it returns
+MAX_HEADLESS_TICKS = int(os.getenv("SIM_RUN_MAX_TICKS", "200000"))
+HEADLESS_QUEUE_PER_SLOT = int(os.getenv("SIM_RUN_QUEUE_PER_SLOT", "4"))
+MAX_LOG_PAGE = 500 # Upper bound for one history / sim-log page
+
+# Per-session simulations: each browser gets its own lot (same layout, empty),
+# so simulation runs never touch the live lot or each other
+sim_pool = SimulationPool(
+    lambda: parking.spawn_simulation("MANUAL"),
+    max_instances=int(os.getenv("SIM_POOL_MAX_SESSIONS", "200")),
+    max_bytes=int(os.getenv("SIM_POOL_MAX_MB", "64")) * 1024 * 1024,
+    idle_timeout=float(os.getenv("SIM_POOL_IDLE_SECONDS", "1800")),
+)
+# Live slot changes pushed to dashboards over SSE (/api/stream)
+broadcaster = SlotBroadcaster(
+    queue_size=int(os.getenv("STREAM_QUEUE_SIZE", "64")),
+    flush_interval=float(os.getenv("STREAM_FLUSH_MS", "50")) / 1000,
+)
+STREAM_KEEPALIVE_SECONDS = 15
+# Versions restart at 0 with the process; the epoch keeps ETags and ?since= cursors from colliding across restarts
+STATE_EPOCH = secrets.token_hex(4)
+# Live slot table as shared dicts + encoded JSON, rebuilt only when parking.version moves
+status_cache = StatusSnapshotCache(parking)
+# Concurrent identical reads share one computation; results are reused for COALESCE_TTL_MS
+_coalesce_ttl = float(os.getenv("COALESCE_TTL_MS", "1000")) / 1000
+predict_flight = SingleFlight(ttl=_coalesce_ttl)
+delta_flight = SingleFlight(ttl=_coalesce_ttl)
+page_flight = SingleFlight(ttl=_coalesce_ttl)
+SIM_SESSION_COOKIE = "sim_session"
+SIM_SESSION_PATTERN = re.compile(r"^[A-Za-z0-9_-]{16,64}$")
 SECRET_KEY = os.getenv("SECRET_KEY", "SECRET123") # Load from ENV with fallback
 
 # --- SECURITY & VALIDATION MODULES ---
@@ -73,6 +135,24 @@ async def verify_api_key(request: Request, x_api_key: str = Header(None)):
         raise HTTPException(status_code=403, detail="Unauthorized: Invalid API Key")
     return x_api_key
 
+def get_sim_session(request: Request) -> str:
+    """
+    Simulation session ID from the sim_session cookie (or X-Sim-Session header).
+    A new random ID is issued when none (or a malformed one) is sent.
+    """
+    session_id = request.cookies.get(SIM_SESSION_COOKIE) or request.headers.get("X-Sim-Session")
+    if session_id and SIM_SESSION_PATTERN.match(session_id):
+        return session_id
+    return secrets.token_urlsafe(24)
+
+def sim_response(request: Request, session_id: str, content: dict) -> JSONResponse:
+    """JSON response that (re)sets the session cookie when the client doesn't have it yet"""
+    response = JSONResponse(content=content)
+    if request.cookies.get(SIM_SESSION_COOKIE) != session_id:
+        response.set_cookie(SIM_SESSION_COOKIE, session_id, httponly=True, samesite="lax",
+                            max_age=int(sim_pool.idle_timeout or 86400))
+    return response
+
 def sanitize_string(text: str):
     """
     Feature 2: Input Sanitization Helper
@@ -83,7 +163,7 @@ def sanitize_string(text: str):
             raise ValueError(f"Invalid characters detected: {f}")
     return text
 
-def _get_authenticated_user(auth_header: Optional[str], db: Session) -> User:
+async def _get_authenticated_user(auth_header: Optional[str], db: AsyncSession) -> User:
     """Extract and validate user from Authorization header"""
     if not auth_header:
         print("❌ No Authorization header provided")
@@ -116,7 +196,7 @@ def _get_authenticated_user(auth_header: Optional[str], db: Session) -> User:
         print(f"❌ Invalid user_id format: {user_id_str}")
         raise HTTPException(status_code=401, detail="Invalid user ID format")
     
-    user = db.query(User).filter(User.user_id == user_id).first()
+    user = await db.get(User, user_id)
     if not user:
         print(f"❌ User {user_id} not found")
         raise HTTPException(status_code=401, detail="User not found")
@@ -159,12 +239,12 @@ class ExitModel(BaseModel):
     @field_validator("slot")
     @classmethod
     def validate_slot(cls, v):
-        if v < 1 or v > 12:
-            raise ValueError("Invalid slot ID: Must be between 1 and 12")
+        if not parking.layout.has_slot(v):
+            raise ValueError(f"Invalid slot ID: Must be between {parking.layout.min_id} and {parking.layout.max_id}")
         return v
 
 class SimVehicleModel(BaseModel):
-    type: str
+    type: Literal["AMBULANCE", "VIP", "EV", "SENIOR", "NORMAL"]
     duration: float
     
     @field_validator("type")
@@ -213,80 +293,259 @@ class ExtendBookingModel(BaseModel):
 
 # --- ROUTES ---
 
+def render_index(message):
+    """
+    index.html for the current lot state. Renders are shared by every
+    request that arrives for the same state and message while one is in flight.
+    """
+    snapshot = status_cache.get()
+    html = page_flight.do(("index.html", snapshot.version, message), lambda: templates.get_template("index.html").render(
+        status=snapshot.slots, message=message, api_key=SECRET_KEY))
+    return HTMLResponse(content=html)
+
 # Update root route to serve index.html directly (Bypassing broken unified_home)
 @app.get("/", response_class=HTMLResponse)
 def home(request: Request):
-    return templates.TemplateResponse("index.html", {
-        "request": request,
-        "status": parking.get_status(),
-        "message": "System Ready. Waiting for Input...",
-        "api_key": SECRET_KEY
-    })
+    return render_index("System Ready. Waiting for Input...")
 
 # Keep admin panel accessible via /admin
 @app.get("/admin", response_class=HTMLResponse)
 def admin_panel(request: Request):
-    return templates.TemplateResponse("index.html", {
-        "request": request,
-        "status": parking.get_status(),
-        "message": "System Ready. Waiting for Input...",
-        "api_key": SECRET_KEY
-    })
+    return render_index("System Ready. Waiting for Input...")
+
+def conditional_json(request: Request, etag: str, build, version=None):
+    """
+    JSON response tagged with an ETag. A client that already holds this
+    representation (If-None-Match) gets 304 and build() is never called.
+    build() returns data for JSONResponse, or bytes that are already encoded.
+    """
+    headers = {"ETag": etag, "Cache-Control": "no-cache",
+               "X-State-Version": str(parking.version if version is None else version), "X-State-Epoch": STATE_EPOCH}
+    if etag in (tag.strip() for tag in request.headers.get("if-none-match", "").split(",")):
+        return Response(status_code=304, headers=headers)
+    content = build()
+    if isinstance(content, bytes):
+        return Response(content=content, media_type="application/json", headers=headers)
+    return JSONResponse(content=content, headers=headers)
+
 
 @app.get("/api/predict")
-def get_prediction():
+def get_prediction(request: Request):
     """
     API Endpoint for AI Prediction Module
     Returns JSON data for the frontend dashboard.
     """
-    data = parking.get_ai_prediction()
-    return JSONResponse(content=data)
+    # Depends on the slots, the queue and the clock ("free in N min" is whole minutes)
+    etag = f'"{STATE_EPOCH}-{parking.version}-{len(parking.waiting_queue)}-{datetime.now():%Y%m%d%H%M}"'
+    return conditional_json(request, etag, lambda: predict_flight.do(etag, lambda: dumps(parking.get_ai_prediction())))
 
 
 @app.get("/api/status")
-def get_status_api():
+def get_status_api(
+    request: Request,
+    since: Optional[int] = Query(None, ge=0),
+    epoch: Optional[str] = None
+):
     """
     Returns the current status of all slots as JSON
     Used for dynamic frontend updates without page reload.
+    With ?since=<version> (from X-State-Version or a previous delta) only the
+    slots written after that version are returned, as {epoch, version, full, slots};
+    full=true means the version (or epoch) was unknown and every slot is included.
+    """
+    if since is None:
+        # Shared pre-encoded body; only the first read after a change serializes
+        snapshot = status_cache.get()
+        return conditional_json(request, f'"{STATE_EPOCH}-{snapshot.version}"', lambda: snapshot.body,
+                                version=snapshot.version)
+
+    version = parking.version
+    if epoch is not None and epoch != STATE_EPOCH:
+        since = version + 1  # Cursor from before a restart: resend everything
+    etag = f'"{STATE_EPOCH}-{version}-since-{since}"'
+    return conditional_json(request, etag, lambda: delta_flight.do(
+        etag, lambda: dumps({"epoch": STATE_EPOCH, **parking.status_since(since)})))
+
+
+@app.get("/api/stream")
+async def stream_status(request: Request):
     """
-    # jsonable_encoder converts datetime objects to ISO strings
-    return JSONResponse(content=jsonable_encoder(parking.get_status()))
+    Server-Sent Events feed of the live lot: one 'snapshot' event with every
+    slot, then a 'slots' event with the changed slots whenever the lot is
+    written to (both carry the state version). Replaces polling /api/status.
+    """
+    sub = broadcaster.subscribe()  # Before the snapshot, so no change falls in between
+
+    async def events():
+        try:
+            snapshot = await run_in_threadpool(status_cache.get)
+            yield (f'retry: 3000\nevent: snapshot\ndata: {{"epoch":"{STATE_EPOCH}","version":{snapshot.version},'
+                   f'"slots":{snapshot.body.decode()}}}\n\n')
+            while True:
+                try:
+                    frame = await asyncio.wait_for(sub.queue.get(), timeout=STREAM_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"  # Comment line keeps proxies from closing an idle stream
+                    continue
+                if frame is None:  # Dropped (too slow) or shutting down
+                    return
+                yield frame
+        finally:
+            broadcaster.unsubscribe(sub)
+
+    return StreamingResponse(events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+
+@app.get("/api/cache/metrics")
+def cache_metrics(api_key: str = Depends(verify_api_key)):
+    """
+    Hit/miss counters of the status snapshot cache and the coalesced reads (Protected)
+    """
+    return JSONResponse(content={
+        "status_snapshot": {"builds": status_cache.builds, "hits": status_cache.hits},
+        "predict": predict_flight.metrics(),
+        "status_since": delta_flight.metrics(),
+        "pages": page_flight.metrics(),
+    })
+
+
+@app.get("/api/stream/metrics")
+def stream_metrics(api_key: str = Depends(verify_api_key)):
+    """
+    SSE broadcaster metrics: open streams, events sent, dropped subscribers (Protected)
+    """
+    return JSONResponse(content=broadcaster.metrics())
+
+
+def query_log(log, since, until, action, offset, limit):
+    """One page of an EventLog, newest first; since/until are datetimes (until exclusive)"""
+    return log.query(
+        start=since.timestamp() if since else None,
+        end=until.timestamp() if until else None,
+        actions=[action] if action else None,
+        offset=offset,
+        limit=limit,
+    )
+
+
+@app.get("/api/history")
+def get_history(
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    action: Optional[Literal["ENTRY", "EXIT"]] = None,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=MAX_LOG_PAGE),
+    api_key: str = Depends(verify_api_key)
+):
+    """
+    Paginated entry/exit history of the live lot, newest first (Protected)
+    """
+    return JSONResponse(content=query_log(parking.history_log, since, until, action, offset, limit))
 
 
 # --- UPDATED API ENDPOINTS (With Security & Validation) ---
 
 @app.post("/api/simulate/add_vehicle")
-def add_sim_vehicle(data: SimVehicleModel, api_key: str = Depends(verify_api_key)):
+def add_sim_vehicle(data: SimVehicleModel, request: Request, session_id: str = Depends(get_sim_session),
+                    api_key: str = Depends(verify_api_key)):
     """
-    Adds a vehicle to the simulation queue (Protected)
+    Adds a vehicle to this session's simulation queue (Protected)
     """
-    msg = parking.add_vehicle_to_queue(data.type, data.duration)
-    return JSONResponse(content={"message": msg})
+    with sim_pool.session(session_id) as lot:
+        msg = lot.add_vehicle_to_queue(data.type, data.duration)
+    return sim_response(request, session_id, {"message": msg})
 
 
 @app.post("/api/simulate/pattern")
-def set_pattern(data: PatternModel, api_key: str = Depends(verify_api_key)):
+def set_pattern(data: PatternModel, request: Request, session_id: str = Depends(get_sim_session),
+                api_key: str = Depends(verify_api_key)):
     """
-    Sets the traffic generation pattern (Protected)
+    Sets this session's traffic generation pattern (Protected)
     """
-    msg = parking.set_traffic_mode(data.mode)
-    return JSONResponse(content={"message": msg})
+    with sim_pool.session(session_id) as lot:
+        msg = lot.set_traffic_mode(data.mode)
+    return sim_response(request, session_id, {"message": msg})
 
 
 @app.post("/api/simulate/undo")
-def undo_sim_vehicle(api_key: str = Depends(verify_api_key)):
+def undo_sim_vehicle(request: Request, session_id: str = Depends(get_sim_session),
+                     api_key: str = Depends(verify_api_key)):
     """
-    Removes the last added vehicle from the queue (Protected)
+    Removes the last added vehicle from this session's queue (Protected)
     """
-    msg = parking.remove_last_vehicle()
-    return JSONResponse(content={"message": msg})
+    with sim_pool.session(session_id) as lot:
+        msg = lot.remove_last_vehicle()
+    return sim_response(request, session_id, {"message": msg})
+
+
+@app.post("/api/simulate/reset")
+def reset_sim(request: Request, session_id: str = Depends(get_sim_session),
+              api_key: str = Depends(verify_api_key)):
+    """
+    Starts this session over with an empty lot (Protected)
+    """
+    sim_pool.discard(session_id)
+    with sim_pool.session(session_id) as lot:
+        msg = lot.reset_simulation()
+    return sim_response(request, session_id, {"message": msg})
+
+
+@app.get("/api/simulate/status")
+def sim_status(request: Request, session_id: str = Depends(get_sim_session),
+               api_key: str = Depends(verify_api_key)):
+    """
+    Slot status of this session's simulation lot (Protected)
+    """
+    with sim_pool.session(session_id) as lot:
+        slots = lot.get_status().to_dict()
+    return sim_response(request, session_id, jsonable_encoder(slots))
+
+
+@app.get("/api/simulate/log")
+def sim_log(
+    request: Request,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    action: Optional[Literal["QUEUE_ADD", "UNDO", "RESET"]] = None,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=MAX_LOG_PAGE),
+    session_id: str = Depends(get_sim_session),
+    api_key: str = Depends(verify_api_key)
+):
+    """
+    Paginated simulation log of this session's lot, newest first (Protected)
+    """
+    with sim_pool.session(session_id) as lot:
+        page = query_log(lot.sim_log, since, until, action, offset, limit)
+    return sim_response(request, session_id, page)
+
+
+@app.get("/api/simulate/robots")
+def sim_robot_metrics(request: Request, session_id: str = Depends(get_sim_session),
+                      api_key: str = Depends(verify_api_key)):
+    """
+    Per-robot throughput and utilisation of this session's simulation lot (Protected)
+    """
+    with sim_pool.session(session_id) as lot:
+        content = {"ticks": lot.sim_tick, "dispatch_mode": lot.dispatch_mode, "robots": lot.robot_stats()}
+    return sim_response(request, session_id, content)
+
+
+@app.get("/api/simulate/pool")
+def sim_pool_metrics(api_key: str = Depends(verify_api_key)):
+    """
+    Simulation pool metrics: instance count, memory estimate, evictions (Protected)
+    """
+    return JSONResponse(content=sim_pool.metrics())
 
 
 @app.post("/api/entry")
-def api_entry(data: VehicleEntryModel, request: Request, api_key: str = Depends(verify_api_key), db: Session = Depends(get_db)):
-    user = _get_authenticated_user(request.headers.get('Authorization'), db)
+async def api_entry(data: VehicleEntryModel, request: Request, api_key: str = Depends(verify_api_key), db: AsyncSession = Depends(get_async_db)):
+    user = await _get_authenticated_user(request.headers.get('Authorization'), db)
     try:
-        msg = parking.process_vehicle(data.type, data.duration)
+        # The lot lock is shared with the scheduler and sync routes: wait for it on a worker thread, not the event loop
+        msg = await run_in_threadpool(parking.process_vehicle, data.type, data.duration)
         slot_match = re.search(r'Slot (\d+)', msg)
         if slot_match:
             slot_id = int(slot_match.group(1))
@@ -302,7 +561,7 @@ def api_entry(data: VehicleEntryModel, request: Request, api_key: str = Depends(
                 status="ACTIVE"
             )
             db.add(booking)
-            db.flush()
+            await db.flush()
             
             db.add(Notification(
                 user_id=user.user_id,
@@ -317,18 +576,18 @@ def api_entry(data: VehicleEntryModel, request: Request, api_key: str = Depends(
                 timestamp=datetime.utcnow()
             ))
             
-            db.commit()
+            await db.commit()
         return JSONResponse(content={"message": msg})
     except ValueError as e:
-        db.rollback()
+        await db.rollback()
         ids.log_event(request.client.host, f"Validation Error: {str(e)}", "MEDIUM")
         raise HTTPException(status_code=400, detail=str(e))
 
 @app.post("/api/reserve")
-def api_reserve(data: ReserveModel, request: Request, api_key: str = Depends(verify_api_key), db: Session = Depends(get_db)):
-    user = _get_authenticated_user(request.headers.get('Authorization'), db)
+async def api_reserve(data: ReserveModel, request: Request, api_key: str = Depends(verify_api_key), db: AsyncSession = Depends(get_async_db)):
+    user = await _get_authenticated_user(request.headers.get('Authorization'), db)
     try:
-        msg = parking.reserve_slot(data.type, data.duration)
+        msg = await run_in_threadpool(parking.reserve_slot, data.type, data.duration)
         slot_match = re.search(r'Slot (\d+)', msg)
         if slot_match:
             slot_id = int(slot_match.group(1))
@@ -344,7 +603,7 @@ def api_reserve(data: ReserveModel, request: Request, api_key: str = Depends(ver
                 status="ACTIVE"
             )
             db.add(booking)
-            db.flush()
+            await db.flush()
             
             db.add(Notification(
                 user_id=user.user_id,
@@ -359,23 +618,23 @@ def api_reserve(data: ReserveModel, request: Request, api_key: str = Depends(ver
                 timestamp=datetime.utcnow()
             ))
             
-            db.commit()
+            await db.commit()
         return JSONResponse(content={"message": msg})
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         ids.log_event(request.client.host, "Reserve Error", "LOW")
         raise HTTPException(status_code=400, detail=str(e))
 
 @app.post("/api/exit")
-def api_exit(data: ExitModel, request: Request, api_key: str = Depends(verify_api_key), db: Session = Depends(get_db)):
-    user = _get_authenticated_user(request.headers.get('Authorization'), db)
-    msg = parking.exit_vehicle(data.slot)
+async def api_exit(data: ExitModel, request: Request, api_key: str = Depends(verify_api_key), db: AsyncSession = Depends(get_async_db)):
+    user = await _get_authenticated_user(request.headers.get('Authorization'), db)
+    msg = await run_in_threadpool(parking.exit_vehicle, data.slot)
     try:
-        booking = db.query(Booking).filter(
+        booking = await db.scalar(select(Booking).where(
             Booking.slot_id == data.slot,
             Booking.user_id == user.user_id,
             Booking.status == "ACTIVE"
-        ).first()
+        ).limit(1))
         if booking:
             booking.status = "COMPLETED"
             booking.exit_time = datetime.utcnow()
@@ -393,19 +652,48 @@ def api_exit(data: ExitModel, request: Request, api_key: str = Depends(verify_ap
                 timestamp=datetime.utcnow()
             ))
             
-            db.commit()
+            await db.commit()
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         print(f"Exit DB update error: {e}")
     return JSONResponse(content={"message": msg})
 
 
 @app.get("/api/simulate/step")
-def simulate_step(api_key: str = Depends(verify_api_key)):
+def simulate_step(request: Request, session_id: str = Depends(get_sim_session),
+                  api_key: str = Depends(verify_api_key)):
+    """
+    Executes one clock cycle of this session's robot simulation (Protected)
     """
-    Executes one clock cycle of the robot simulation (Protected)
+    with sim_pool.session(session_id) as lot:
+        result = lot.simulation_step()
+    return sim_response(request, session_id, result)
+
+
+@app.get("/api/simulate/run")
+def simulate_run(
+    ticks: int = Query(..., ge=1, le=MAX_HEADLESS_TICKS),
+    mode: Optional[Literal["MANUAL", "PEAK", "EVENT"]] = None,
+    queue_capacity: Optional[int] = Query(None, ge=1),
+    seed: Optional[int] = None,
+    dispatch: Optional[Literal["BOUND", "WORK_STEALING", "OPTIMAL"]] = None,
+    api_key: str = Depends(verify_api_key)
+):
     """
-    result = parking.simulation_step()
+    Headless simulation: runs N clock cycles in one call on a fresh copy of
+    the lot (live slots are untouched) and returns aggregate results only.
+    The queue holds at most HEADLESS_QUEUE_PER_SLOT vehicles per slot (the
+    default capacity). Runs with the same seed are repeatable (Protected)
+    """
+    max_queue = HEADLESS_QUEUE_PER_SLOT * parking.total_slots
+    if queue_capacity is not None and queue_capacity > max_queue:
+        raise HTTPException(status_code=400, detail=f"queue_capacity must be at most {max_queue}")
+    lot = parking.spawn_simulation(mode, seed=seed)
+    lot.queue_capacity = queue_capacity or max_queue
+    if dispatch:
+        lot.set_dispatch_mode(dispatch)
+    result = lot.run_simulation(ticks)
+    result["seed"] = seed
     return JSONResponse(content=result)
 
 
@@ -416,12 +704,7 @@ def reserve_entry(request: Request, type: str = Form(...), duration: float = For
     """
     msg = parking.reserve_slot(type, duration)
 
-    return templates.TemplateResponse("index.html", {
-        "request": request,
-        "status": parking.get_status(),
-        "message": msg,
-        "api_key": SECRET_KEY # Inject Key
-    })
+    return render_index(msg)
 
 
 @app.post("/entry", response_class=HTMLResponse)
@@ -431,24 +714,14 @@ def vehicle_entry(request: Request, type: str = Form(...), duration: float = For
     """
     msg = parking.process_vehicle(type, duration)
 
-    return templates.TemplateResponse("index.html", {
-        "request": request,
-        "status": parking.get_status(),
-        "message": msg,
-        "api_key": SECRET_KEY # Inject Key
-    })
+    return render_index(msg)
 
 
 @app.post("/exit", response_class=HTMLResponse)
 def vehicle_exit(request: Request, slot: int = Form(...)):
     msg = parking.exit_vehicle(slot)
 
-    return templates.TemplateResponse("index.html", {
-        "request": request,
-        "status": parking.get_status(),
-        "message": msg,
-        "api_key": SECRET_KEY # Inject Key
-    })
+    return render_index(msg)
 
 
 # --- AUTHENTICATION ENDPOINTS ---
@@ -532,68 +805,73 @@ def login_user(data: UserLoginModel, db: Session = Depends(get_db)):
 
 # --- USER DASHBOARD ENDPOINTS ---
 
-@app.get("/user/me")
-def get_current_user_info(current_user: User = Depends(get_current_user)):
+def user_payload(user: User):
     return {
-        "user_id": current_user.user_id,
-        "name": current_user.name,
-        "email": current_user.email,
-        "phone": current_user.phone,
-        "created_at": current_user.created_at
+        "user_id": user.user_id,
+        "name": user.name,
+        "email": user.email,
+        "phone": user.phone,
+        "created_at": user.created_at
     }
 
+def booking_payload(booking: Booking, now: datetime):
+    remaining = None
+    if booking.estimated_end_time:
+        remaining = int((booking.estimated_end_time - now).total_seconds())
+    return {
+        "booking_id": booking.booking_id,
+        "slot_id": booking.slot_id,
+        "vehicle_type": booking.vehicle_type,
+        "status": booking.status,
+        "entry_time": booking.entry_time,
+        "estimated_end_time": booking.estimated_end_time,
+        "billing_cost": booking.billing_cost,
+        "remaining_seconds": max(0, remaining) if remaining is not None else None
+    }
+
+@app.get("/user/me")
+async def get_current_user_info(current_user: User = Depends(get_session_user)):
+    return user_payload(current_user)
+
 @app.get("/user/bookings")
-def get_user_bookings(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    bookings = db.query(Booking).filter(Booking.user_id == current_user.user_id).order_by(Booking.entry_time.desc()).all()
+async def get_user_bookings(current_user: User = Depends(get_session_user), db: AsyncSession = Depends(get_async_db)):
+    bookings = (await db.scalars(
+        select(Booking).where(Booking.user_id == current_user.user_id).order_by(Booking.entry_time.desc())
+    )).all()
     now = datetime.utcnow()
-    payload = []
-    for booking in bookings:
-        remaining = None
-        if booking.estimated_end_time:
-            remaining = int((booking.estimated_end_time - now).total_seconds())
-        payload.append({
-            "booking_id": booking.booking_id,
-            "slot_id": booking.slot_id,
-            "vehicle_type": booking.vehicle_type,
-            "status": booking.status,
-            "entry_time": booking.entry_time,
-            "estimated_end_time": booking.estimated_end_time,
-            "billing_cost": booking.billing_cost,
-            "remaining_seconds": max(0, remaining) if remaining is not None else None
-        })
-    return jsonable_encoder(payload)
+    return jsonable_encoder([booking_payload(booking, now) for booking in bookings])
 
 @app.get("/user/notifications")
-def get_user_notifications(current_user: User = Depends(get_current_user), unread_only: bool = False, db: Session = Depends(get_db)):
-    query = db.query(Notification).filter(Notification.user_id == current_user.user_id)
+async def get_user_notifications(current_user: User = Depends(get_session_user), unread_only: bool = False, db: AsyncSession = Depends(get_async_db)):
+    query = select(Notification).where(Notification.user_id == current_user.user_id)
     if unread_only:
-        query = query.filter(Notification.is_read == False)
-    notifications = query.order_by(Notification.timestamp.desc()).limit(20).all()
+        query = query.where(Notification.is_read == False)
+    notifications = (await db.scalars(query.order_by(Notification.timestamp.desc()).limit(20))).all()
     if unread_only:
         for notif in notifications:
             notif.is_read = True
-        db.commit()
+        await db.commit()
     return jsonable_encoder(notifications)
 
 @app.get("/user/notifications/unread")
-def get_unread_notifications(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    notifications = db.query(Notification).filter(
+async def get_unread_notifications(current_user: User = Depends(get_session_user), db: AsyncSession = Depends(get_async_db)):
+    notifications = (await db.scalars(select(Notification).where(
         Notification.user_id == current_user.user_id,
         Notification.is_read == False
-    ).order_by(Notification.timestamp.asc()).all()
+    ).order_by(Notification.timestamp.asc()))).all()
     payload = jsonable_encoder(notifications)
     for notif in notifications:
         notif.is_read = True
-    db.commit()
+    await db.commit()
     return payload
 
 @app.post("/user/booking/extend")
-def extend_booking(data: ExtendBookingModel, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    booking = db.query(Booking).filter(
+async def extend_booking(data: ExtendBookingModel, current_user: User = Depends(get_session_user), db: AsyncSession = Depends(get_async_db)):
+    booking = await db.scalar(select(Booking).where(
         Booking.booking_id == data.booking_id,
         Booking.user_id == current_user.user_id,
         Booking.status == "ACTIVE"
-    ).first()
+    ).limit(1))
     if not booking:
         raise HTTPException(status_code=404, detail="Active booking not found")
     
@@ -601,7 +879,7 @@ def extend_booking(data: ExtendBookingModel, current_user: User = Depends(get_cu
     booking.estimated_end_time += timedelta(hours=data.additional_hours)
     additional_cost = parking.alu.calculate_upfront_cost(booking.vehicle_type, data.additional_hours)
     booking.billing_cost += additional_cost
-    parking.extend_slot(booking.slot_id, data.additional_hours)
+    await run_in_threadpool(parking.extend_slot, booking.slot_id, data.additional_hours)
     
     db.add(Notification(
         user_id=current_user.user_id,
@@ -616,17 +894,78 @@ def extend_booking(data: ExtendBookingModel, current_user: User = Depends(get_cu
         timestamp=datetime.utcnow()
     ))
     
-    db.commit()
+    await db.commit()
     return {"message": f"Booking extended. Additional cost: ${additional_cost}"}
 
 # Add Activity Log endpoint
 @app.get("/user/activity")
-def get_user_activity(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    logs = db.query(ActivityLog).filter(
+async def get_user_activity(current_user: User = Depends(get_session_user), db: AsyncSession = Depends(get_async_db)):
+    logs = (await db.scalars(select(ActivityLog).where(
         ActivityLog.user_id == current_user.user_id
-    ).order_by(ActivityLog.timestamp.desc()).limit(50).all()
+    ).order_by(ActivityLog.timestamp.desc()).limit(50))).all()
     return jsonable_encoder(logs)
 
+# Combined dashboard refresh (replaces /user/me + /user/bookings + /user/notifications + /user/activity)
+DASHBOARD_NOTIFICATIONS = 20
+DASHBOARD_ACTIVITY = 50
+
+@app.get("/user/dashboard")
+async def get_user_dashboard(
+    bookings_since: Optional[datetime] = None,
+    notifications_since: Optional[int] = Query(None, ge=0),
+    activity_since: Optional[int] = Query(None, ge=0),
+    current_user: User = Depends(get_session_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Everything the user dashboard shows, authenticated once and read in one
+    DB session (one query per section). Each section returns a cursor; send
+    it back as <section>_since to get only what changed:
+      bookings      - every ACTIVE booking plus those that ended after the cursor
+                      (cursor: server time of the previous read)
+      notifications - rows newer than the cursor (cursor: last notification_id)
+      activity      - rows newer than the cursor (cursor: last activity id)
+    'full' is true when a section was read without a cursor (replace, don't merge).
+    """
+    now = datetime.utcnow()
+    user_id = current_user.user_id
+
+    bookings = select(Booking).where(Booking.user_id == user_id)
+    if bookings_since is not None:
+        bookings = bookings.where((Booking.status == "ACTIVE") | (Booking.exit_time >= bookings_since))
+    bookings = (await db.scalars(bookings.order_by(Booking.entry_time.desc()))).all()
+
+    notifications = select(Notification).where(Notification.user_id == user_id)
+    if notifications_since is not None:
+        notifications = notifications.where(Notification.notification_id > notifications_since)
+    notifications = (await db.scalars(
+        notifications.order_by(Notification.notification_id.desc()).limit(DASHBOARD_NOTIFICATIONS)
+    )).all()
+
+    activity = select(ActivityLog).where(ActivityLog.user_id == user_id)
+    if activity_since is not None:
+        activity = activity.where(ActivityLog.id > activity_since)
+    activity = (await db.scalars(activity.order_by(ActivityLog.id.desc()).limit(DASHBOARD_ACTIVITY))).all()
+
+    return jsonable_encoder({
+        "user": user_payload(current_user),
+        "bookings": {
+            "items": [booking_payload(booking, now) for booking in bookings],
+            "cursor": now,
+            "full": bookings_since is None,
+        },
+        "notifications": {
+            "items": notifications,
+            "cursor": notifications[0].notification_id if notifications else notifications_since or 0,
+            "full": notifications_since is None,
+        },
+        "activity": {
+            "items": activity,
+            "cursor": activity[0].id if activity else activity_since or 0,
+            "full": activity_since is None,
+        },
+    })
+
 @app.get("/dashboard", response_class=HTMLResponse)
 def dashboard_page(request: Request):
     # Check if user is logged in by looking for token